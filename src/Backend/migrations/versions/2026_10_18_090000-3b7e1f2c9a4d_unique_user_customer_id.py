@@ -0,0 +1,37 @@
+"""unique user customer id
+
+Revision ID: 3b7e1f2c9a4d
+Revises: c0aacf06c865
+Create Date: 2026-10-18 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3b7e1f2c9a4d'
+down_revision = 'c0aacf06c865'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Duplicated customer ids must be merged by hand, the constraint can't guess
+    # which user keeps the results.
+    duplicated = op.get_bind().execute(
+        sa.text(
+            "SELECT customer_id, array_agg(id::text) FROM users "
+            "WHERE customer_id IS NOT NULL "
+            "GROUP BY customer_id HAVING count(*) > 1"
+        )
+    ).all()
+    if duplicated:
+        raise RuntimeError(
+            "Users with duplicated customer_id: "
+            + "; ".join(f"{cid}: {', '.join(ids)}" for cid, ids in duplicated)
+        )
+    op.create_unique_constraint('users_customer_id_key', 'users', ['customer_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('users_customer_id_key', 'users', type_='unique')
@@ -0,0 +1,46 @@
+"""add sync state
+
+Revision ID: 7c2d4e9f1a3b
+Revises: 3b7e1f2c9a4d
+Create Date: 2026-10-18 10:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '7c2d4e9f1a3b'
+down_revision = '3b7e1f2c9a4d'
+branch_labels = None
+depends_on = None
+
+sync_entities = postgresql.ENUM(
+    'ORGANIZATION', 'GROUP', 'STUDENT', 'PROFESSOR', name='sync_entities'
+)
+
+
+def upgrade() -> None:
+    sync_entities.create(op.get_bind())
+    op.create_table('sync_states',
+    sa.Column('entity', postgresql.ENUM(name='sync_entities', create_type=False), nullable=False),
+    sa.Column('customer_id', sa.String(length=100), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('entity', 'customer_id')
+    )
+    op.create_table('sync_runs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('phase', postgresql.ENUM(name='sync_entities', create_type=False), nullable=False),
+    sa.Column('page', sa.Integer(), nullable=False),
+    sa.Column('finished', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sync_runs')
+    op.drop_table('sync_states')
+    sync_entities.drop(op.get_bind())
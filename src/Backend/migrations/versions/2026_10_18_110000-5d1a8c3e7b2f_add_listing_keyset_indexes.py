@@ -0,0 +1,34 @@
+"""add listing keyset indexes
+
+Revision ID: 5d1a8c3e7b2f
+Revises: 7c2d4e9f1a3b
+Create Date: 2026-10-18 11:00:00.000000+00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5d1a8c3e7b2f'
+down_revision = '7c2d4e9f1a3b'
+branch_labels = None
+depends_on = None
+
+indexes = (
+    ('ix_users_updated_at_id', 'users', ['updated_at', 'id']),
+    ('ix_groups_updated_at_id', 'groups', ['updated_at', 'id']),
+    ('ix_organizations_updated_at_id', 'organizations', ['updated_at', 'id']),
+    ('ix_exams_start_date_id', 'exams', ['start_date', 'id']),
+)
+
+
+def upgrade() -> None:
+    # Built concurrently, the users table is too big to be locked meanwhile.
+    with op.get_context().autocommit_block():
+        for name, table, columns in indexes:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in indexes:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
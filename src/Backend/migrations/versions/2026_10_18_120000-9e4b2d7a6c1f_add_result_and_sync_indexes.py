@@ -0,0 +1,57 @@
+"""add result and sync indexes
+
+Revision ID: 9e4b2d7a6c1f
+Revises: 5d1a8c3e7b2f
+Create Date: 2026-10-18 12:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9e4b2d7a6c1f'
+down_revision = '5d1a8c3e7b2f'
+branch_labels = None
+depends_on = None
+
+indexes = (
+    (
+        'ix_euq_exam_id_user_id_status',
+        'exams_users_questions',
+        ['exam_id', 'user_id', 'status'],
+        None,
+    ),
+    ('ix_euq_group_id_exam_id', 'exams_users_questions', ['group_id', 'exam_id'], None),
+    (
+        'ix_euq_pending',
+        'exams_users_questions',
+        ['user_id', 'exam_id'],
+        "status <> 'FINISHED'",
+    ),
+    ('ix_groups_customer_id', 'groups', ['customer_id'], 'customer_id IS NOT NULL'),
+    (
+        'ix_organizations_customer_id',
+        'organizations',
+        ['customer_id'],
+        'customer_id IS NOT NULL',
+    ),
+)
+
+
+def upgrade() -> None:
+    # Built concurrently, the results table is written during the exams.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in indexes:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in indexes:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
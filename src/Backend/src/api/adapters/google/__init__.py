@@ -5,9 +5,11 @@ Module of google adapters.
 from .bigquery import BigQuery
 from .cloud_storage import CloudStorage
 from .firebase import FirebaseAuth
+from .id_token import IdTokenVerifier
 from .looker import LookerDashboard
 from .pubsub import MessagePublisher
 from .secret_manager import SecretManager
+from .speech_registry import SpeechRegistry
 from .speech_to_text import SpeechToText
 from .speech_to_text_v2 import SpeechToTextV2, SpeechToTextV2Chirp
 
@@ -15,9 +17,11 @@ __all__ = (
     "BigQuery",
     "CloudStorage",
     "FirebaseAuth",
+    "IdTokenVerifier",
     "LookerDashboard",
     "MessagePublisher",
     "SecretManager",
+    "SpeechRegistry",
     "SpeechToText",
     "SpeechToTextV2",
     "SpeechToTextV2Chirp",
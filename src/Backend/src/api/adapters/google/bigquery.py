@@ -6,7 +6,9 @@ import asyncio
 import dataclasses
 import functools
 import json
+import logging
 import typing
+import uuid
 from datetime import datetime
 
 from google.cloud import bigquery
@@ -15,13 +17,37 @@ from google.oauth2 import service_account
 from api import helpers, ports
 from api.helpers.schemas import AnalyticalResult as Result
 
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class _BufferedRow:
+    data: dict[str, typing.Any]
+    attempts: int = 0
+    # Stable insert id, so bigquery dedupes a retry of a row that landed
+    row_id: str = dataclasses.field(default_factory=lambda: uuid.uuid4().hex)
+
 
 class BigQuery(ports.AnalyticalResult):
     """
     Implementation of google's cloud bigquery.
+
+    Saved results are buffered and inserted in batches, when the buffer reaches
+    `max_batch_size` rows or every `flush_interval` seconds. Rows rejected by
+    bigquery are retried up to `max_retries` times.
     """
 
-    def __init__(self, project_id: str, dataset: str, table_name: str, creds_path: str):
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        project_id: str,
+        dataset: str,
+        table_name: str,
+        creds_path: str,
+        max_batch_size: int = 500,
+        flush_interval: float = 5.0,
+        max_retries: int = 3,
+    ):
         credentials = None
         if creds_path:
             credentials = service_account.Credentials.from_service_account_file(
@@ -31,24 +57,92 @@ class BigQuery(ports.AnalyticalResult):
         self.project_id = project_id
         self.dataset = dataset
         self.table_name = table_name
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._buffer: list[_BufferedRow] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task[None] | None = None
 
-    async def save(self, result: Result) -> typing.Sequence[dict[str, typing.Any]]:
+    async def save(self, result: Result) -> None:
         """
         Save result data to analytical database.
+
+        The row is buffered and inserted by the next flush.
         """
-        row = [
-            json.loads(
-                json.dumps(dataclasses.asdict(result), cls=helpers.CustomEncoder)
+        self._buffer.append(
+            _BufferedRow(
+                json.loads(
+                    json.dumps(dataclasses.asdict(result), cls=helpers.CustomEncoder)
+                )
             )
-        ]
-        table_ref = bigquery.Table(
-            f"{self.project_id}.{self.dataset}.{self.table_name}"
         )
-        table = self.client.get_table(table_ref)
-        response = await asyncio.to_thread(
-            functools.partial(self.client.insert_rows, table, row)
-        )
-        return response
+        if len(self._buffer) >= self.max_batch_size:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """
+        Insert the buffered rows.
+
+        Invalid rows are dropped, rows stopped because of them are retried
+        as they are, the others are retried up to `max_retries` times.
+        """
+        async with self._flush_lock:
+            rows, self._buffer = self._buffer, []
+            if not rows:
+                return
+            try:
+                errors = await asyncio.to_thread(
+                    functools.partial(
+                        self.client.insert_rows_json,
+                        f"{self.project_id}.{self.dataset}.{self.table_name}",
+                        [row.data for row in rows],
+                        row_ids=[row.row_id for row in rows],
+                    )
+                )
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                logger.warning("Could not insert rows.", extra={"error": str(err)})
+                errors = [
+                    {"index": index, "errors": [{"reason": "failed"}]}
+                    for index in range(len(rows))
+                ]
+            for error in errors:
+                row = rows[error["index"]]
+                reasons = {item.get("reason") for item in error["errors"]}
+                if reasons == {"stopped"}:
+                    self._buffer.append(row)
+                    continue
+                row.attempts += 1
+                if "invalid" in reasons or row.attempts > self.max_retries:
+                    logger.error(
+                        "Could not save to bigquery.",
+                        extra={
+                            "question_uuid": row.data.get("question_uuid"),
+                            "student_uuid": row.data.get("student_uuid"),
+                            "errors": error["errors"],
+                        },
+                    )
+                else:
+                    self._buffer.append(row)
+
+    async def close(self) -> None:
+        """
+        Stop the periodic flush and insert what is left in the buffer.
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for _ in range(self.max_retries + 1):
+            if not self._buffer:
+                break
+            await self.flush()
+
+    async def _flush_later(self) -> None:
+        while self._buffer:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
 
     async def get_student_results(
         self,
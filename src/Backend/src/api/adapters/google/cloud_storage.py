@@ -5,6 +5,7 @@ Module with the implementation of cloud storage
 import asyncio
 import datetime
 import functools
+import io
 import os
 
 from google.cloud import storage  # type: ignore[attr-defined]
@@ -46,12 +47,28 @@ class CloudStorage(ports.Storage):
         with open(audio_temp, "wb") as file:
             self.client.download_blob_to_file(gcs_path, file)
 
-    async def upload_by_text(self, path: str, text: bytes) -> str:
+    async def download_bytes(self, uri: str) -> bytes:
+        """
+        Download audio from GCS to memory.
+        """
+        buffer = io.BytesIO()
+        await asyncio.to_thread(
+            functools.partial(self.client.download_blob_to_file, uri, buffer)
+        )
+        # The buffer is released here, so getvalue hands over its memory
+        # instead of copying it.
+        return buffer.getvalue()
+
+    async def upload_by_text(
+        self, path: str, text: bytes, content_type: str = "text/plain"
+    ) -> str:
         """
         Upload audio to GCS by text.
         """
         blob = self.client.bucket(self.storage_path).blob(path)
-        await asyncio.to_thread(functools.partial(blob.upload_from_string, text))
+        await asyncio.to_thread(
+            functools.partial(blob.upload_from_string, text, content_type=content_type)
+        )
         return str(blob.id.rsplit("/", 1)[0])
 
     async def upload_by_file(self, path: str, audio_path: str) -> str:
@@ -0,0 +1,144 @@
+"""
+Module related to the verification of the Google ID tokens.
+"""
+
+import asyncio
+import collections
+import logging
+import re
+import time
+import typing
+
+import aiohttp
+import jwt
+
+from api import errors
+
+logger = logging.getLogger(__name__)
+
+CERTS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+ISSUERS = frozenset({"accounts.google.com", "https://accounts.google.com"})
+DEFAULT_MAX_AGE = 300.0
+MIN_FORCED_REFRESH = 30.0
+MAX_VERIFIED = 1024
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def _max_age(headers: typing.Mapping[str, str]) -> float:
+    """
+    Seconds the response may be cached for, from its Cache-Control and Age.
+    """
+    if not (match := _MAX_AGE.search(headers.get("Cache-Control", ""))):
+        return DEFAULT_MAX_AGE
+    age = headers.get("Age", "0")
+    return max(float(match.group(1)) - (float(age) if age.isdigit() else 0.0), 0.0)
+
+
+class IdTokenVerifier:
+    """
+    Verifies the ID tokens signed by Google, like the Cloud Scheduler ones.
+
+    The public keys are fetched with a shared session and cached for as long as
+    Google's Cache-Control allows. Verified tokens are kept until they expire,
+    so the retries of a scheduled call are not verified again.
+    """
+
+    def __init__(self, certs_url: str = CERTS_URL, timeout: float = 10.0) -> None:
+        self.certs_url = certs_url
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._lock = asyncio.Lock()
+        self._session: aiohttp.ClientSession | None = None
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._fetched_at = 0.0
+        self._expires_at = 0.0
+        self._verified: collections.OrderedDict[
+            str, tuple[float, dict[str, typing.Any]]
+        ] = collections.OrderedDict()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Shared session, created on first use so it is bound to the running loop.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300),
+                timeout=self.timeout,
+                raise_for_status=True,
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Close the shared session.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get_keys(self, kid: str) -> dict[str, jwt.PyJWK]:
+        """
+        Cached keys, fetched again when expired or when the kid is unknown.
+
+        When a fetch fails the cached keys are used until the next one.
+        """
+        now = time.monotonic()
+        if now < self._expires_at and kid in self._keys:
+            return self._keys
+        async with self._lock:
+            now = time.monotonic()
+            if now < self._expires_at and (
+                kid in self._keys or now - self._fetched_at < MIN_FORCED_REFRESH
+            ):
+                return self._keys
+            try:
+                async with self._get_session().get(self.certs_url) as response:
+                    data = await response.json()
+                    max_age = _max_age(response.headers)
+                self._keys = {
+                    key.key_id: key
+                    for key in jwt.PyJWKSet.from_dict(data).keys
+                    if key.key_id
+                }
+            except (aiohttp.ClientError, TimeoutError, jwt.PyJWTError):
+                if not self._keys:
+                    raise
+                logger.exception("Could not refresh the Google certs.")
+                max_age = MIN_FORCED_REFRESH
+            self._fetched_at = now
+            self._expires_at = now + max_age
+        return self._keys
+
+    def _remember(self, token: str, claims: dict[str, typing.Any]) -> None:
+        self._verified[token] = (float(claims["exp"]), claims)
+        self._verified.move_to_end(token)
+        while len(self._verified) > MAX_VERIFIED:
+            self._verified.popitem(last=False)
+
+    async def verify(self, token: str, audience: str | None) -> dict[str, typing.Any]:
+        """
+        Verify the token and return its claims.
+
+        :raises errors.TokenExpired: if the token is invalid or expired.
+        """
+        if entry := self._verified.get(token):
+            expires_at, claims = entry
+            if time.time() < expires_at and claims.get("aud") == audience:
+                return claims
+            del self._verified[token]
+        try:
+            kid = jwt.get_unverified_header(token).get("kid", "")
+            if not (key := (await self._get_keys(kid)).get(kid)):
+                raise errors.TokenExpired()
+            claims = jwt.decode(
+                token,
+                key=key.key,
+                algorithms=["RS256"],
+                audience=audience,
+                options={"require": ["exp", "iss"]},
+            )
+        except jwt.PyJWTError as exc:
+            raise errors.TokenExpired() from exc
+        if claims["iss"] not in ISSUERS:
+            raise errors.TokenExpired()
+        self._remember(token, claims)
+        return claims
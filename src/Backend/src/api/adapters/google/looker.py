@@ -16,9 +16,8 @@ import looker_sdk
 from looker_sdk.sdk.api40 import models as mdls
 from starlette import datastructures
 
-from api import ports
+from api import ports, typings
 from api.helpers import UUIDEncoder
-from api.models import User as UserModel
 
 
 # pylint: disable=too-many-instance-attributes
@@ -72,7 +71,7 @@ class LookerDashboard(ports.Dashboard):
 
     async def get_signed_url(
         self,
-        user: UserModel,
+        user: typings.Principal,
         query: datastructures.QueryParams,
     ) -> str:
         """
@@ -82,7 +81,7 @@ class LookerDashboard(ports.Dashboard):
         first_name = name[0]
         last_name = name[1] if len(name) > 1 else None
         self.user = User(
-            external_user_id=user.id,
+            external_user_id=user.user_id,
             first_name=first_name,
             last_name=last_name,
             permissions=[
@@ -98,11 +97,9 @@ class LookerDashboard(ports.Dashboard):
             ],
             group_ids=[2],
             user_attributes={
-                "group_ids": json.dumps(
-                    [group.id for group in user.groups], cls=UUIDEncoder
-                ),
+                "group_ids": json.dumps(user.group_ids, cls=UUIDEncoder),
                 "organization_ids": json.dumps(
-                    [org.id for org in user.organizations], cls=UUIDEncoder
+                    list(user.organization_ids), cls=UUIDEncoder
                 ),
                 "state": user.state,
                 "region": user.region,
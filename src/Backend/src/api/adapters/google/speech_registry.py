@@ -0,0 +1,113 @@
+"""
+Module with the process-wide registry of speech to text resources
+"""
+
+import asyncio
+import logging
+import uuid
+
+import google.cloud.speech_v2 as speech
+from google.api_core import client_options
+from google.cloud.speech_v2.types import cloud_speech
+from google.oauth2 import service_account
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_REGION = "global"
+
+
+class SpeechRegistry:
+    """
+    Registry of speech to text async clients and recognizer names.
+
+    Clients are created once per region and recognizers are resolved once per
+    (model, region, language), so processing an answer doesn't need to list or
+    create recognizers again.
+    """
+
+    def __init__(self, project_id: str, creds_path: str):
+        self.credentials = None
+        if creds_path:
+            self.credentials = service_account.Credentials.from_service_account_file(
+                creds_path
+            )
+        self.project_id = project_id
+        self._clients: dict[str, speech.SpeechAsyncClient] = {}
+        self._recognizers: dict[tuple[str, str, str], str] = {}
+        self._lock = asyncio.Lock()
+
+    def get_client(self, region: str = GLOBAL_REGION) -> speech.SpeechAsyncClient:
+        """
+        Get the async client for the region, creating it on first use.
+        """
+        if client := self._clients.get(region):
+            return client
+        options = None
+        if region != GLOBAL_REGION:
+            options = client_options.ClientOptions(  # type: ignore[no-untyped-call]
+                api_endpoint=f"{region}-speech.googleapis.com"
+            )
+        client = speech.SpeechAsyncClient(
+            credentials=self.credentials, client_options=options
+        )
+        self._clients[region] = client
+        return client
+
+    async def get_recognizer(
+        self,
+        model_type: str,
+        region: str,
+        language: str,
+        features: cloud_speech.RecognitionFeatures,
+    ) -> str:
+        """
+        Get the recognizer name for the model, resolving it on first use.
+        """
+        key = (model_type, region, language)
+        if recognizer_name := self._recognizers.get(key):
+            return recognizer_name
+        async with self._lock:
+            if recognizer_name := self._recognizers.get(key):
+                return recognizer_name
+            recognizer_name = await self._resolve_recognizer(
+                model_type, region, language, features
+            )
+            self._recognizers[key] = recognizer_name
+        return recognizer_name
+
+    async def _resolve_recognizer(
+        self,
+        model_type: str,
+        region: str,
+        language: str,
+        features: cloud_speech.RecognitionFeatures,
+    ) -> str:
+        client = self.get_client(region)
+        list_request = speech.ListRecognizersRequest(
+            parent=f"projects/{self.project_id}/locations/{region}"
+        )
+        recognizers = await client.list_recognizers(request=list_request)
+        recognizer: speech.Recognizer
+        async for recognizer in recognizers:
+            if recognizer.model == model_type:
+                return recognizer.name
+
+        logger.info(
+            "Creating recognizer.", extra={"model": model_type, "region": region}
+        )
+        recognizer_data = speech.Recognizer(
+            display_name="LIA Recognizer",
+            model=model_type,
+            language_codes=[language],
+            default_recognition_config=cloud_speech.RecognitionConfig(
+                features=features,
+            ),
+        )
+        create_request = speech.CreateRecognizerRequest(
+            parent=f"projects/{self.project_id}/locations/{region}",
+            recognizer=recognizer_data,
+            recognizer_id=f"a{uuid.uuid4()}",
+        )
+        operation = await client.create_recognizer(request=create_request)
+        created: speech.Recognizer = await operation.result()  # type: ignore[no-untyped-call]
+        return created.name
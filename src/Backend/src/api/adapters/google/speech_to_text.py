@@ -4,17 +4,15 @@ Module with the implementation of speech to text
 
 import datetime
 import logging
-import os
 import typing
 import uuid
 
-import ffmpeg
 import google.cloud.speech_v1p1beta1 as speech
 from google.cloud.speech_v1p1beta1.types import cloud_speech
 from google.oauth2 import service_account
 
 from api import ports
-from api.helpers import util
+from api.helpers import audio, util
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +27,7 @@ class SpeechToText(ports.SpeechToText):
         project_id: str,
         creds_path: str,
         storage: ports.Storage,
+        audio_processor: audio.AudioProcessor,
         language: str = "pt-BR",
     ):
         self.credentials = None
@@ -38,8 +37,8 @@ class SpeechToText(ports.SpeechToText):
             )
         self.client = speech.SpeechAsyncClient(credentials=self.credentials)
         self.storage: ports.Storage = storage
+        self.audio_processor = audio_processor
         self.project_id = project_id
-        self.audio_tmp = "/tmp"
         self.language = language
 
     async def process(
@@ -181,13 +180,15 @@ class SpeechToText(ports.SpeechToText):
         """
         Method to rerun portion of audio.
         """
-        temp_path = await self.storage.download(path, desired)
-        temp_path = await self._cut_audio(
-            temp_path, desired, start_time.total_seconds(), last_time.total_seconds()
+        audio_data = await self.storage.download_bytes(path)
+        audio_cutted = await self.audio_processor.cut(
+            audio_data, start_time.total_seconds(), last_time.total_seconds()
         )
         desired_name = f"{desired.replace('.wav', '')}-{i}.wav"
 
-        new_uri = await self.storage.upload_by_file(f"cutted/{desired_name}", temp_path)
+        new_uri = await self.storage.upload_by_text(
+            f"cutted/{desired_name}", audio_cutted, content_type="audio/wav"
+        )
         process_result = await self.process(
             phrases_id=phrases,
             path=f"gs://{new_uri}",
@@ -201,19 +202,6 @@ class SpeechToText(ports.SpeechToText):
         )
         return process_result
 
-    async def _cut_audio(
-        self, audio_path: str, file_name: str, start_time: float, end_time: float
-    ) -> str:
-        """
-        Cut portion of the audio.
-        """
-        audio_cutted = f"/{self.audio_tmp}/cutted_{file_name}"
-        ffmpeg.input(audio_path).output(
-            audio_cutted, **{"ss": start_time, "to": end_time}
-        ).run(overwrite_output=True, quiet=True)
-        os.remove(audio_path)
-        return audio_cutted
-
     async def delete_phrase_set(self, phrase_set_id: str) -> None:
         parent = (
             f"projects/{self.project_id}/locations/global/phraseSets/{phrase_set_id}"
@@ -69,6 +69,7 @@ class ListExams(ports.ListExams):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.Exam], typings.PaginationMetadata]:
         """
         Method to list all exams.
@@ -230,6 +231,7 @@ class ListPendingExams(ports.ListPendingExams):
         group_id: uuid.UUID,
         page_size: int = 10,
         page: int = 1,
+        cursor: str | None = None,
     ) -> tuple[
         list[tuple[models.Exam, models.ExamStatus | None]], typings.PaginationMetadata
     ]:
@@ -268,3 +270,22 @@ class ListExamsWithResults(ports.ListExamsWithResults):
         """
         items = self._items
         return items
+
+
+class ActiveExamCatalog(ports.ActiveExamCatalog):
+    """
+    Catalog of the running exams, by group.
+    """
+
+    def __init__(
+        self, exams: dict[uuid.UUID, list[typings.ActiveExam]] | None = None
+    ) -> None:
+        self._items = exams if exams else {}
+        self.invalidated = 0
+
+    async def running(self, group_id: uuid.UUID) -> list[typings.ActiveExam]:
+        now = time_now()
+        return [exam for exam in self._items.get(group_id, []) if exam.is_running(now)]
+
+    def invalidate(self) -> None:
+        self.invalidated += 1
@@ -69,7 +69,7 @@ class GroupRepository(ports.GroupRepository):
         sync_group: typings.CreateOrUpdateGroup,
         org_customer_id: str,
         updated_orgs: dict[str, models.Organization],
-        cached_groups: list[models.Group],
+        cached_groups: dict[str, models.Group],
     ) -> models.Group:
         """
         Method to create or update a list of group filtering by customer id.
@@ -135,6 +135,7 @@ class ListGroups(ports.ListGroups):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.Group], typings.PaginationMetadata]:
         """
         Method to list all groups.
@@ -59,7 +59,7 @@ class OrganizationRepository(ports.OrganizationRepository):
     async def create_or_update(
         self,
         sync_org: typings.CreateOrUpdateOrganization,
-        cached_orgs: list[models.Organization],
+        cached_orgs: dict[str, models.Organization],
     ) -> models.Organization:
         raise NotImplementedError()
 
@@ -118,6 +118,7 @@ class ListOrganizations(ports.ListOrganizations):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.Organization], typings.PaginationMetadata]:
         """
         Method to list all orgs.
@@ -4,7 +4,7 @@ Module for all result related sqlalchemy memory implementation queries.
 
 import uuid
 
-from api import errors, models, ports
+from api import errors, models, ports, typings
 from api.helpers import time_now
 
 
@@ -13,8 +13,15 @@ class ResultRepository(ports.ResultRepository):
     Result repository memory implementation that returns result data.
     """
 
-    def __init__(self, items: list[models.ExamUserQuestion] | None = None) -> None:
+    def __init__(
+        self,
+        items: list[models.ExamUserQuestion] | None = None,
+        questions: list[models.Question] | None = None,
+        exam_users: list[models.ExamUser] | None = None,
+    ) -> None:
         self._items = items if items else []
+        self._questions = questions if questions else []
+        self._exam_users = exam_users if exam_users else []
 
     async def get(
         self,
@@ -32,6 +39,56 @@ class ResultRepository(ports.ResultRepository):
                 return items[0]
         raise errors.NotFound
 
+    async def get_scoring_context(self, result_id: uuid.UUID) -> typings.ScoringContext:
+        """
+        Get the answer with what scoring it needs from its relationships.
+
+        :param result_id: result id on database.
+        """
+        answer = await self.get(result_id)
+        question = next(
+            (item for item in self._questions if item.id == answer.question_id), None
+        )
+        if not question:
+            raise errors.NotFound("question")
+        finished = {
+            item.question_id
+            for item in self._items
+            if item.user_id == answer.user_id
+            and item.exam_id == answer.exam_id
+            and item.status == models.ExamStatus.FINISHED
+        }
+        exam_user = next(
+            (
+                item
+                for item in self._exam_users
+                if item.exam_id == answer.exam_id and item.user_id == answer.user_id
+            ),
+            None,
+        )
+        return typings.ScoringContext(
+            answer=answer,
+            exam_user=exam_user,
+            question_type=question.type,
+            pending_count=sum(
+                1
+                for item in self._questions
+                if item.exam_id == answer.exam_id and item.id not in finished
+            ),
+            group_name=answer.group.name,
+            group_grade=answer.group.grade,
+            exam_name=answer.exam.name,
+            exam_start_date=answer.exam.start_date,
+            exam_end_date=answer.exam.end_date,
+            organization_name=answer.organization.name,
+            organization_city=answer.organization.city,
+            organization_state=answer.organization.state,
+            organization_region=answer.organization.region,
+            organization_county=answer.organization.county,
+            user_name=answer.user.name,
+            user_customer_id=answer.user.customer_id,
+        )
+
     async def create(
         self, result_model: models.ExamUserQuestion
     ) -> models.ExamUserQuestion:
@@ -4,7 +4,7 @@ Module for all session related sqlalchemy memory implementation queries.
 
 import uuid
 
-from api import errors, models, ports
+from api import errors, models, ports, typings
 
 
 class SessionRepository(ports.SessionRepository):
@@ -51,3 +51,27 @@ class SessionRepository(ports.SessionRepository):
         :param session_model: the session model parameter.
         """
         self._items.remove(session_model)
+
+
+class GetPrincipal(ports.GetPrincipal):
+    """
+    Get principal memory implementation, built from the sessions.
+    """
+
+    def __init__(self, items: list[models.Session] | None = None) -> None:
+        self._items = items if items else []
+
+    async def __call__(self, session_id: uuid.UUID) -> typings.Principal | None:
+        """
+        Get the principal of the session.
+
+        :param session_id: session id on database.
+        """
+        return next(
+            (
+                typings.Principal.from_session(item)
+                for item in self._items
+                if item.id == session_id
+            ),
+            None,
+        )
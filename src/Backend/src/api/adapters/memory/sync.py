@@ -0,0 +1,45 @@
+"""
+Memory implementation of the sync state repository.
+"""
+
+import datetime
+
+from api import models, ports
+
+
+class SyncRepository(ports.SyncRepository):
+    """
+    Repository of the content hashes and checkpoints of the SERE sync.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: dict[tuple[models.SyncEntity, str], str] = {}
+        self._runs: list[models.SyncRun] = []
+
+    async def list_hashes(
+        self, entity: models.SyncEntity, customer_ids: list[str]
+    ) -> dict[str, str]:
+        return {
+            customer_id: self._hashes[(entity, customer_id)]
+            for customer_id in customer_ids
+            if (entity, customer_id) in self._hashes
+        }
+
+    async def save_hashes(
+        self, entity: models.SyncEntity, hashes: dict[str, str]
+    ) -> None:
+        for customer_id, content_hash in hashes.items():
+            self._hashes[(entity, customer_id)] = content_hash
+
+    async def get_unfinished_run(
+        self, since: datetime.datetime
+    ) -> models.SyncRun | None:
+        runs = [
+            run for run in self._runs if not run.finished and run.created_at >= since
+        ]
+        return runs[-1] if runs else None
+
+    async def create_run(self) -> models.SyncRun:
+        run = models.SyncRun(phase=models.SyncEntity.ORGANIZATION, page=0)
+        self._runs.append(run)
+        return run
@@ -8,7 +8,7 @@ import typing
 
 from api import db, ports
 
-from . import exam, group, organization, result, role, session_query, user
+from . import exam, group, organization, result, role, session_query, sync, user
 
 
 # pylint: disable=too-many-instance-attributes
@@ -27,6 +27,7 @@ class UnitOfWorkBuilder(ports.UnitOfWorkBuilder):
         exam_repository: ports.ExamRepository | None = None,
         question_repository: ports.QuestionRepository | None = None,
         result_repository: ports.ResultRepository | None = None,
+        sync_repository: ports.SyncRepository | None = None,
     ) -> None:
         self.call_count = 0
         self.user_repository = user_repository or user.UserRepository()
@@ -41,6 +42,7 @@ class UnitOfWorkBuilder(ports.UnitOfWorkBuilder):
         self.exam_repository = exam_repository or exam.ExamRepository()
         self.question_repository = question_repository or exam.QuestionRepository()
         self.result_repository = result_repository or result.ResultRepository()
+        self.sync_repository = sync_repository or sync.SyncRepository()
 
     async def _create(self) -> ports.UnitOfWork:
         self.call_count += 1
@@ -53,6 +55,7 @@ class UnitOfWorkBuilder(ports.UnitOfWorkBuilder):
             exam_repository=self.exam_repository,
             question_repository=self.question_repository,
             result_repository=self.result_repository,
+            sync_repository=self.sync_repository,
         )
 
 
@@ -71,6 +74,7 @@ class UnitOfWork(ports.UnitOfWork):
         exam_repository: ports.ExamRepository,
         question_repository: ports.QuestionRepository,
         result_repository: ports.ResultRepository,
+        sync_repository: ports.SyncRepository,
     ) -> None:
         self.user_repository = user_repository
         self.session_repository = session_repository
@@ -80,6 +84,7 @@ class UnitOfWork(ports.UnitOfWork):
         self.exam_repository = exam_repository
         self.question_repository = question_repository
         self.result_repository = result_repository
+        self.sync_repository = sync_repository
         self.closed = False
         self.committed = False
 
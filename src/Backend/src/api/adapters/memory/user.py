@@ -71,13 +71,11 @@ class UserRepository(ports.UserRepository):
         """
         self._items = [item for item in self._items if item.id != user_model.id]
 
-    async def create_or_update_student(
+    async def bulk_create_or_update_students(
         self,
-        student: typings.CreateOrUpdateUser,
-        group_customer_id: str,
+        students: list[tuple[typings.CreateOrUpdateUser, str]],
         updated_groups: dict[str, models.Group],
-        cached_users: list[models.User],
-    ) -> models.User:
+    ) -> int:
         raise NotImplementedError()
 
     async def create_or_update_professor(
@@ -87,7 +85,7 @@ class UserRepository(ports.UserRepository):
         organizations_customer_id: list[str],
         updated_organizations: dict[str, models.Organization],
         updated_groups: dict[str, models.Group],
-        cached_profs: list[models.User],
+        cached_profs: dict[str, models.User],
     ) -> models.User | None:
         raise NotImplementedError()
 
@@ -127,6 +125,7 @@ class ListUsers(ports.ListUsers):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.User], typings.PaginationMetadata]:
         """
         Method to list all users.
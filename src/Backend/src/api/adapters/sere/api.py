@@ -1,57 +1,174 @@
+"""
+SERE api implementation.
+"""
+
+import asyncio
+import collections
+import itertools
+import logging
+import random
 import typing
 
 import aiohttp
 
 from api import ports
 
+from . import stream
+
+logger = logging.getLogger(__name__)
+
+NRE_COUNT = 32
+CHUNK_SIZE = 64 * 1024
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
 
 class SereApi(ports.DataSyncApi):
-    def __init__(self, api_key: str) -> None:
-        self.base_url = "https://api.seed.pr.gov.br/lia"
+    """
+    Implementation of the SERE data sync api.
+
+    A single session is shared by every call, at most `concurrency` requests run
+    at once and failed requests are retried with a jittered exponential backoff.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        api_key: str,
+        base_url: str = "https://api.seed.pr.gov.br/lia",
+        concurrency: int = 4,
+        timeout: float = 300.0,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+    ) -> None:
+        self.base_url = base_url
         self.headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
             "ApiKey": f"{api_key}",
         }
+        self.concurrency = concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=10)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Shared session, created on first use so it is bound to the running loop.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.concurrency, ttl_dns_cache=300, keepalive_timeout=60
+                ),
+                timeout=self.timeout,
+                headers=self.headers,
+                raise_for_status=True,
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
-    async def get_list(
-        self, session: aiohttp.ClientSession, endpoint: str, nre: int
-    ) -> typing.Any:
-        async with session.get(
-            f"{self.base_url}/{endpoint}/{nre}",
-            headers=self.headers,
-        ) as response:
-            response.raise_for_status()
-            return await response.json()
+    async def get_list(self, endpoint: str, nre: int) -> typing.Any:
+        """
+        Fetch the records of the endpoint for a NRE, retrying transient errors.
+
+        The body is parsed as it is received, the whole JSON text is never held.
+        """
+        url = f"{self.base_url}/{endpoint}/{nre}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore, self._get_session().get(url) as response:
+                    return [
+                        record
+                        async for record in stream.iter_array(
+                            response.content.iter_chunked(CHUNK_SIZE)
+                        )
+                    ]
+            except aiohttp.ClientResponseError as error:
+                if error.status not in RETRY_STATUSES or attempt == self.max_retries:
+                    raise
+            except (aiohttp.ClientError, TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+            delay = random.uniform(0, self.backoff * 2**attempt)  # noqa: S311
+            logger.warning(
+                "Retrying SERE request.",
+                extra={"endpoint": endpoint, "nre": nre, "attempt": attempt + 1},
+            )
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def iter_pages(
+        self, endpoint: str, start: int = 1
+    ) -> typing.AsyncIterator[tuple[int, list[dict[str, typing.Any]]]]:
+        """
+        Yield the records of every NRE from `start`, in NRE order.
+
+        The NREs are fetched concurrently, at most `concurrency` pages are
+        fetched ahead of the consumer.
+        """
+        pending: collections.deque[
+            tuple[int, asyncio.Task[list[dict[str, typing.Any]]]]
+        ] = collections.deque()
+        nres = iter(range(start, NRE_COUNT + 1))
+        try:
+            for nre in itertools.islice(nres, self.concurrency):
+                pending.append((nre, asyncio.create_task(self.get_list(endpoint, nre))))
+            while pending:
+                nre, task = pending.popleft()
+                page = await task
+                for next_nre in itertools.islice(nres, 1):
+                    pending.append(
+                        (
+                            next_nre,
+                            asyncio.create_task(self.get_list(endpoint, next_nre)),
+                        )
+                    )
+                yield nre, page
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _list_all(self, endpoint: str) -> list[dict[str, typing.Any]]:
+        return [
+            record async for _, page in self.iter_pages(endpoint) for record in page
+        ]
+
+    def iter_organization_pages(
+        self, start: int = 1
+    ) -> typing.AsyncIterator[tuple[int, list[dict[str, typing.Any]]]]:
+        return self.iter_pages("escola", start)
+
+    def iter_group_pages(
+        self, start: int = 1
+    ) -> typing.AsyncIterator[tuple[int, list[dict[str, typing.Any]]]]:
+        return self.iter_pages("turma", start)
+
+    def iter_professor_pages(
+        self, start: int = 1
+    ) -> typing.AsyncIterator[tuple[int, list[dict[str, typing.Any]]]]:
+        return self.iter_pages("professor", start)
 
     async def list_group(self) -> list[dict[str, typing.Any]]:
-        groups: list[typing.Any] = []
-        async with aiohttp.ClientSession() as session:
-            for nre in range(1, 33):
-                groups.extend(await self.get_list(session, "turma", nre))
-        return groups
+        return await self._list_all("turma")
 
     async def list_organization(self) -> list[dict[str, typing.Any]]:
-        organizations: list[typing.Any] = []
-        async with aiohttp.ClientSession() as session:
-            for nre in range(1, 33):
-                organizations.extend(await self.get_list(session, "escola", nre))
-        return organizations
+        return await self._list_all("escola")
 
     async def list_student(self) -> list[dict[str, typing.Any]]:
-        students: list[typing.Any] = []
-        async with aiohttp.ClientSession() as session:
-            for nre in range(1, 33):
-                students.extend(await self.get_list(session, "matricula", nre))
-        return students
+        return await self._list_all("matricula")
 
     async def list_student_paginated(self, index: int) -> typing.Any:
-        async with aiohttp.ClientSession() as session:
-            return await self.get_list(session, "matricula", index)
+        return await self.get_list("matricula", index)
+
+    def iter_student_pages(
+        self, start: int = 1
+    ) -> typing.AsyncIterator[tuple[int, typing.Any]]:
+        return self.iter_pages("matricula", start)
 
     async def list_professor(self) -> list[dict[str, typing.Any]]:
-        professors: list[typing.Any] = []
-        async with aiohttp.ClientSession() as session:
-            for nre in range(1, 33):
-                professors.extend(await self.get_list(session, "professor", nre))
-        return professors
+        return await self._list_all("professor")
@@ -0,0 +1,97 @@
+"""
+Incremental parsing of the JSON arrays answered by the SERE api.
+"""
+
+import codecs
+import json
+import typing
+
+_WHITESPACE = " \t\n\r"
+
+
+class ArrayParser:
+    """
+    Parser of a JSON array fed by chunks of text, returning the items as soon as
+    they are complete.
+
+    Only the text of the item being received is kept between chunks.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = "start"
+
+    def feed(self, text: str, final: bool = False) -> list[typing.Any]:
+        """
+        Parse the next chunk of text.
+
+        :param text: the chunk of text.
+        :param final: whether it is the last chunk.
+        :returns: the items completed by the chunk.
+        """
+        buffer = self._buffer + text
+        position = 0
+        items: list[typing.Any] = []
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if self._state == "start":
+                if char != "[":
+                    raise ValueError("Expected a JSON array.")
+                self._state = "first"
+                position += 1
+            elif self._state == "first" and char == "]":
+                self._state = "end"
+                position += 1
+            elif self._state in ("first", "item"):
+                decoded = self._decode(buffer, position, final)
+                if decoded is None:
+                    break
+                items.append(decoded[0])
+                self._state = "separator"
+                position = decoded[1]
+            elif self._state == "separator" and char in ",]":
+                self._state = "item" if char == "," else "end"
+                position += 1
+            else:
+                raise ValueError(f"Unexpected {char!r} in the JSON array.")
+        self._buffer = buffer[position:]
+        if final and self._state != "end":
+            raise ValueError("Truncated JSON array.")
+        return items
+
+    def _decode(
+        self, buffer: str, position: int, final: bool
+    ) -> tuple[typing.Any, int] | None:
+        """
+        Decode the item at the position, None when it is not complete yet.
+        """
+        try:
+            item, end = self._decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        if end == len(buffer) and not final:
+            # A number could still go on in the next chunk.
+            return None
+        return item, end
+
+
+async def iter_array(
+    chunks: typing.AsyncIterable[bytes],
+) -> typing.AsyncIterator[typing.Any]:
+    """
+    Yield the items of a UTF-8 JSON array one at a time, as the chunks arrive.
+    """
+    parser = ArrayParser()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        for item in parser.feed(decoder.decode(chunk)):
+            yield item
+    for item in parser.feed(decoder.decode(b"", final=True), final=True):
+        yield item
@@ -2,21 +2,27 @@
 Module for all exam related sqlalchemy queries.
 """
 
+import asyncio
 import logging
+import time
 import typing
 import uuid
 
 import sqlalchemy as sa
 from fastapi_pagination import Params
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import exc
+from sqlalchemy import exc, orm
 from sqlalchemy.engine.row import Row
 from sqlalchemy.ext import asyncio as sqlalchemy_aio
 
 from api import errors, helpers, models, ports, typings
 
+from . import keyset
+
 logger = logging.getLogger(__name__)
 
+MAX_CATALOG_GROUPS = 10000
+
 
 class ExamRepository(ports.ExamRepository):
     """
@@ -35,12 +41,12 @@ class ExamRepository(ports.ExamRepository):
 
         :raises errors.NotFound: if the entity was not found.
         """
-        stmt = sa.select(models.Exam)
+        stmt = sa.select(models.Exam).options(orm.selectinload(models.Exam.questions))
         if exam_id:
             stmt = stmt.where(models.Exam.id == exam_id)
 
         result = await self._session.execute(stmt)
-        if not (exam := result.unique().scalars().one_or_none()):
+        if not (exam := result.scalars().one_or_none()):
             raise errors.NotFound("exam")
         return exam
 
@@ -88,7 +94,11 @@ class GetExam(ports.GetExam):
 
         :param exam_id: the exam identifier.
         """
-        stmt = sa.select(models.Exam).where(models.Exam.id == exam_id)
+        stmt = (
+            sa.select(models.Exam)
+            .options(orm.selectinload(models.Exam.questions))
+            .where(models.Exam.id == exam_id)
+        )
         if groups is not None:
             stmt = stmt.join(
                 models.Group,
@@ -99,7 +109,7 @@ class GetExam(ports.GetExam):
         async with self._session_factory() as session:
             result = await session.execute(stmt)
 
-        if not (exam := result.scalars().unique().one_or_none()):
+        if not (exam := result.scalars().one_or_none()):
             raise errors.NotFound("exam")
 
         return exam
@@ -182,7 +192,7 @@ class GetUsersExamDetails(ports.GetUsersExamDetails):
 
         async with self._session_factory() as session:
             result = await session.execute(exam_stmt)
-        exam_result = list(result.unique().all())
+        exam_result = list(result.all())
 
         return exam_result
 
@@ -201,31 +211,38 @@ class ListExams(ports.ListExams):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.Exam], typings.PaginationMetadata]:
         """
         Method to list all exams.
         """
-        stmt = sa.select(models.Exam).order_by(models.Exam.start_date.desc())
+        exam = models.Exam
+        stmt = sa.select(exam).order_by(exam.start_date.desc())
 
         if groups is not None:
-            stmt = stmt.join(
-                models.Group,
-                sa.and_(
-                    models.Group.id.in_(groups),
-                    models.Group.grade == models.Exam.grade,
-                ),
+            stmt = stmt.where(
+                exam.grade.in_(
+                    sa.select(models.Group.grade).where(models.Group.id.in_(groups))
+                )
             )
         if query:
             stmt = stmt.where(
                 sa.or_(
-                    models.Exam.name.ilike(f"%{query}%"),
+                    exam.name.ilike(f"%{query}%"),
                 )
             )
         params = Params(page=page, size=page_size)
         async with self._session_factory() as session:
-            result: typings.Paginated = await paginate(
-                session, stmt, params=params, unique=True
-            )
+            if cursor is not None and page_size > 0:
+                return await keyset.paginate(
+                    session,
+                    stmt,
+                    (exam.start_date, exam.id),
+                    lambda item: (item.start_date, item.id),
+                    cursor,
+                    page_size,
+                )
+            result: typings.Paginated = await paginate(session, stmt, params=params)
         return result.items, typings.PaginationMetadata(
             current_page=result.page,
             total_pages=result.pages,
@@ -234,13 +251,97 @@ class ListExams(ports.ListExams):
         )
 
 
+class ActiveExamCatalog(ports.ActiveExamCatalog):
+    """
+    Exams not ended yet by grade, and the grade of the groups, cached.
+
+    Both are read again after `ttl` seconds or an `invalidate`. Whether an
+    exam is running is checked against the current time on every call.
+    """
+
+    def __init__(self, session_factory: typings.SessionFactory, ttl: float = 30.0):
+        self._session_factory = session_factory
+        self.ttl = ttl
+        self._lock = asyncio.Lock()
+        self._generation = 0
+        self._loaded_at: float | None = None
+        self._exams: dict[models.Grades, list[typings.ActiveExam]] = {}
+        self._grades: dict[uuid.UUID, tuple[float, models.Grades | None]] = {}
+
+    async def running(self, group_id: uuid.UUID) -> list[typings.ActiveExam]:
+        if not (grade := await self._grade(group_id)):
+            return []
+        exams = await self._load()
+        now = helpers.time_now()
+        return [exam for exam in exams.get(grade, []) if exam.is_running(now)]
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._loaded_at = None
+        self._grades.clear()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    async def _load(self) -> dict[models.Grades, list[typings.ActiveExam]]:
+        if self._is_fresh():
+            return self._exams
+        async with self._lock:
+            if self._is_fresh():
+                return self._exams
+            generation = self._generation
+            exam = models.Exam
+            stmt = sa.select(exam.id, exam.grade, exam.start_date, exam.end_date).where(
+                exam.end_date > helpers.time_now()
+            )
+            async with self._session_factory() as session:
+                result = await session.execute(stmt)
+            exams: dict[models.Grades, list[typings.ActiveExam]] = {}
+            for row in result:
+                exams.setdefault(row.grade, []).append(
+                    typings.ActiveExam(
+                        id=row.id,
+                        grade=row.grade,
+                        start_date=row.start_date,
+                        end_date=row.end_date,
+                    )
+                )
+            self._exams = exams
+            if generation == self._generation:
+                self._loaded_at = time.monotonic()
+        return exams
+
+    async def _grade(self, group_id: uuid.UUID) -> models.Grades | None:
+        if (cached := self._grades.get(group_id)) and (
+            time.monotonic() - cached[0] < self.ttl
+        ):
+            return cached[1]
+        async with self._session_factory() as session:
+            grade = await session.scalar(
+                sa.select(models.Group.grade).where(models.Group.id == group_id)
+            )
+        self._grades.pop(group_id, None)
+        self._grades[group_id] = (time.monotonic(), grade)
+        while len(self._grades) > MAX_CATALOG_GROUPS:
+            del self._grades[next(iter(self._grades))]
+        return grade
+
+
 class ListPendingExams(ports.ListPendingExams):
     """
     Query to get all exams.
     """
 
-    def __init__(self, session_factory: typings.SessionFactory):
+    def __init__(
+        self,
+        session_factory: typings.SessionFactory,
+        catalog: ports.ActiveExamCatalog,
+    ):
         self._session_factory = session_factory
+        self._catalog = catalog
 
     async def __call__(
         self,
@@ -248,30 +349,20 @@ class ListPendingExams(ports.ListPendingExams):
         group_id: uuid.UUID,
         page_size: int = 10,
         page: int = 1,
+        cursor: str | None = None,
     ) -> tuple[
         list[tuple[models.Exam, models.ExamStatus | None]], typings.PaginationMetadata
     ]:
         exam_user = models.ExamUser
-        current_date = helpers.time_now()
-        group = models.Group
         exam = models.Exam
+        running = [item.id for item in await self._catalog.running(group_id)]
         stmt = (
             sa.select(exam, exam_user.status)
-            .join(
-                group,
-                sa.and_(
-                    group.grade == exam.grade,
-                    group.id == group_id,
-                ),
-            )
             .outerjoin(
                 exam_user,
                 sa.and_(exam_user.exam_id == exam.id, exam_user.user_id == user_id),
             )
-            .where(
-                exam.start_date <= current_date,
-            )
-            .where(exam.end_date > current_date)
+            .where(exam.id.in_(running))
             .where(
                 sa.or_(
                     exam_user.status != models.ExamStatus.FINISHED,
@@ -281,6 +372,16 @@ class ListPendingExams(ports.ListPendingExams):
         )
 
         async with self._session_factory() as session:
+            if cursor is not None and page_size > 0:
+                return await keyset.paginate(
+                    session,
+                    stmt,
+                    (exam.start_date, exam.id),
+                    lambda item: (item[0].start_date, item[0].id),
+                    cursor,
+                    page_size,
+                    scalars=False,
+                )
             if page_size >= 0:
                 params = Params(page=page, size=page_size)
                 result: typings.Paginated = await paginate(session, stmt, params=params)
@@ -291,7 +392,7 @@ class ListPendingExams(ports.ListPendingExams):
                 page_size = result.size
             else:
                 result_all = await session.execute(stmt)
-                result_items = list(result_all.scalars().unique())
+                result_items = [(row[0], row[1]) for row in result_all]
                 current_page = 1
                 total_pages = 1
                 total_items = len(result_items)
@@ -347,7 +448,7 @@ class ListExamsWithResults(ports.ListExamsWithResults):
         async with self._session_factory() as session:
             result_all = await session.execute(stmt)
 
-        return list(result_all.scalars().unique())
+        return list(result_all.scalars())
 
 
 class ListPendingQuestions(ports.ListPendingQuestions):
@@ -355,8 +456,13 @@ class ListPendingQuestions(ports.ListPendingQuestions):
     Query to get all questions pending.
     """
 
-    def __init__(self, session_factory: typings.SessionFactory):
+    def __init__(
+        self,
+        session_factory: typings.SessionFactory,
+        catalog: ports.ActiveExamCatalog,
+    ):
         self._session_factory = session_factory
+        self._catalog = catalog
 
     async def __call__(
         self,
@@ -364,13 +470,12 @@ class ListPendingQuestions(ports.ListPendingQuestions):
         group_id: uuid.UUID,
         exam_id: uuid.UUID,
     ) -> list[models.Question]:
+        if not await self._catalog.is_running(group_id, exam_id):
+            return []
         Question = models.Question
         Euq = models.ExamUserQuestion
-        current_date = helpers.time_now()
         stmt = (
             sa.select(Question)
-            .join(models.Exam, models.Exam.id == Question.exam_id)
-            .join(models.Group, models.Group.grade == models.Exam.grade)
             .outerjoin(
                 Euq,
                 sa.and_(
@@ -383,16 +488,11 @@ class ListPendingQuestions(ports.ListPendingQuestions):
                 sa.or_(Euq.user_id.is_(None), Euq.status != models.ExamStatus.FINISHED)
             )
             .where(Question.exam_id == exam_id)
-            .where(models.Group.id == group_id)
-            .where(
-                models.Exam.start_date <= current_date,
-            )
-            .where(models.Exam.end_date > current_date)
         )
 
         async with self._session_factory() as session:
             result = await session.execute(stmt)
-        questions = list(result.scalars().unique())
+        questions = list(result.scalars())
         return questions
 
 
@@ -401,8 +501,13 @@ class GetPendingQuestion(ports.GetPendingQuestion):
     Query to get a pending question.
     """
 
-    def __init__(self, session_factory: typings.SessionFactory):
+    def __init__(
+        self,
+        session_factory: typings.SessionFactory,
+        catalog: ports.ActiveExamCatalog,
+    ):
         self._session_factory = session_factory
+        self._catalog = catalog
 
     async def __call__(
         self,
@@ -411,12 +516,12 @@ class GetPendingQuestion(ports.GetPendingQuestion):
         exam_id: uuid.UUID,
         question_id: uuid.UUID,
     ) -> models.Question:
+        if not await self._catalog.is_running(group_id, exam_id):
+            raise errors.NotPending
         Question = models.Question
         ExamUQ = models.ExamUserQuestion
-        current_date = helpers.time_now()
         stmt = (
             sa.select(Question)
-            .join(models.Exam, models.Exam.id == Question.exam_id)
             .outerjoin(
                 ExamUQ,
                 sa.and_(
@@ -427,16 +532,13 @@ class GetPendingQuestion(ports.GetPendingQuestion):
                 ),
             )
             .where(Question.id == question_id)
+            .where(Question.exam_id == exam_id)
             .where(ExamUQ.question_id.is_(None))
-            .where(
-                models.Exam.start_date <= current_date,
-            )
-            .where(models.Exam.end_date > current_date)
         )
         async with self._session_factory() as session:
             result = await session.execute(stmt)
 
-        if not (question := result.scalars().unique().one_or_none()):
+        if not (question := result.scalars().one_or_none()):
             raise errors.NotPending
 
         return question
@@ -447,8 +549,13 @@ class ListQuestionsWithStatus(ports.ListQuestionsWithStatus):
     Query to get all questions pending.
     """
 
-    def __init__(self, session_factory: typings.SessionFactory):
+    def __init__(
+        self,
+        session_factory: typings.SessionFactory,
+        catalog: ports.ActiveExamCatalog,
+    ):
         self._session_factory = session_factory
+        self._catalog = catalog
 
     async def __call__(
         self,
@@ -456,13 +563,12 @@ class ListQuestionsWithStatus(ports.ListQuestionsWithStatus):
         group_id: uuid.UUID,
         exam_id: uuid.UUID,
     ) -> list[tuple[models.Question, models.ExamUserQuestion | None]]:
+        if not await self._catalog.is_running(group_id, exam_id):
+            return []
         Question = models.Question
         Euq = models.ExamUserQuestion
-        current_date = helpers.time_now()
         stmt = (
             sa.select(Question, models.ExamUserQuestion)
-            .join(models.Exam, models.Exam.id == Question.exam_id)
-            .join(models.Group, models.Group.grade == models.Exam.grade)
             .outerjoin(
                 Euq,
                 sa.and_(
@@ -472,17 +578,12 @@ class ListQuestionsWithStatus(ports.ListQuestionsWithStatus):
                 ),
             )
             .where(Question.exam_id == exam_id)
-            .where(models.Group.id == group_id)
-            .where(
-                models.Exam.start_date <= current_date,
-            )
-            .where(models.Exam.end_date > current_date)
             .order_by(Question.order.asc())
         )
 
         async with self._session_factory() as session:
             result = await session.execute(stmt)
-        response = [(res[0], res[1]) for res in result.unique()]
+        response = [(res[0], res[1]) for res in result]
         return response
 
 
@@ -545,8 +646,13 @@ class GetExamUserStatus(ports.GetExamUserStatus):
     Get table exam_user.
     """
 
-    def __init__(self, session_factory: typings.SessionFactory):
+    def __init__(
+        self,
+        session_factory: typings.SessionFactory,
+        catalog: ports.ActiveExamCatalog,
+    ):
         self._session_factory = session_factory
+        self._catalog = catalog
 
     async def __call__(
         self,
@@ -561,21 +667,23 @@ class GetExamUserStatus(ports.GetExamUserStatus):
         """
         stmt = (
             sa.select(models.ExamUser)
-            .join(models.Exam, models.Exam.id == models.ExamUser.exam_id)
-            .join(
+            .where(models.ExamUser.exam_id == exam_id)
+            .where(models.ExamUser.user_id == user_id)
+        )
+        if not await self._catalog.is_running(group_id, exam_id):
+            # Ended exams aren't in the catalog, their grade is checked here.
+            stmt = stmt.join(
+                models.Exam, models.Exam.id == models.ExamUser.exam_id
+            ).join(
                 models.Group,
                 sa.and_(
                     models.Group.grade == models.Exam.grade, models.Group.id == group_id
                 ),
             )
-            .where(models.ExamUser.exam_id == exam_id)
-            .where(models.ExamUser.user_id == user_id)
-            .where()
-        )
         async with self._session_factory() as session:
             result = await session.execute(stmt)
 
-        if not (exam_user := result.scalars().unique().one_or_none()):
+        if not (exam_user := result.scalars().one_or_none()):
             return None
 
         return exam_user
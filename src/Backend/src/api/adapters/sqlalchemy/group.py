@@ -13,6 +13,8 @@ from sqlalchemy.ext import asyncio as sqlalchemy_aio
 
 from api import errors, models, ports, typings
 
+from . import keyset
+
 logger = logging.getLogger(__name__)
 
 
@@ -76,22 +78,13 @@ class GroupRepository(ports.GroupRepository):
         sync_group: typings.CreateOrUpdateGroup,
         org_customer_id: str,
         updated_orgs: dict[str, models.Organization],
-        cached_groups: list[models.Group],
+        cached_groups: dict[str, models.Group],
     ) -> models.Group | None:
         organization = updated_orgs.get(org_customer_id)
         if not organization:
-            org_stmt = sa.select(models.Organization).where(
-                models.Organization.customer_id == org_customer_id
-            )
-            org_result = await self._session.execute(org_stmt)
-
-            organization = org_result.scalars().one_or_none()
-            if not organization:
-                return None
+            return None
         org_id = organization.id
-        group = next(
-            (g for g in cached_groups if g.customer_id == sync_group.customer_id), None
-        )
+        group = cached_groups.get(str(sync_group.customer_id))
         if group:
             group.name = sync_group.name
             group.grade = sync_group.grade
@@ -107,6 +100,7 @@ class GroupRepository(ports.GroupRepository):
             )
             group.organization = organization
             self._session.add(group)
+            cached_groups[str(sync_group.customer_id)] = group
 
         return group
 
@@ -147,6 +141,7 @@ class ListGroups(ports.ListGroups):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.Group], typings.PaginationMetadata]:
         """
         Method to list all groups.
@@ -178,6 +173,15 @@ class ListGroups(ports.ListGroups):
             )
 
         async with self._session_factory() as session:
+            if cursor is not None and page_size > 0:
+                return await keyset.paginate(
+                    session,
+                    stmt,
+                    (group.updated_at, group.id),
+                    lambda item: (item.updated_at, item.id),
+                    cursor,
+                    page_size,
+                )
             if page_size >= 0:
                 params = Params(page=page, size=page_size)
                 result: typings.Paginated = await paginate(
@@ -0,0 +1,63 @@
+"""
+Module with the keyset pagination of the sqlalchemy listings.
+"""
+
+import datetime
+import typing
+import uuid
+
+import sqlalchemy as sa
+from sqlalchemy.ext import asyncio as sqlalchemy_aio
+from sqlalchemy.orm import InstrumentedAttribute
+
+from api import typings
+from api.helpers import cursor as cursor_helper
+
+
+async def paginate(
+    session: sqlalchemy_aio.AsyncSession,
+    stmt: sa.Select[typing.Any],
+    columns: tuple[
+        InstrumentedAttribute[datetime.datetime], InstrumentedAttribute[uuid.UUID]
+    ],
+    key: typing.Callable[[typing.Any], tuple[datetime.datetime, uuid.UUID]],
+    cursor: str,
+    page_size: int,
+    scalars: bool = True,
+) -> tuple[list[typing.Any], typings.PaginationMetadata]:
+    """
+    Page of the statement after the cursor, newest first.
+
+    The rows are sorted by `columns` and filtered with a row comparison, so a
+    composite index on them serves any page without an OFFSET. No COUNT runs,
+    the page only tells whether there's a next one.
+
+    :param columns: the sort column and the id column.
+    :param key: values of `columns` for a returned item.
+    :param cursor: token of the previous page, empty for the first one.
+    :param scalars: whether the items are the first entity of the rows.
+    """
+    sort_column, id_column = columns
+    stmt = stmt.order_by(None).order_by(sort_column.desc(), id_column.desc())
+    if position := cursor_helper.decode(cursor):
+        sort_value, item_id = position
+        stmt = stmt.where(
+            sa.tuple_(sort_column, id_column)
+            < sa.tuple_(
+                sa.literal(sort_value, sort_column.type),
+                sa.literal(item_id, id_column.type),
+            )
+        )
+    result = await session.execute(stmt.limit(page_size + 1))
+    items = list(result.unique().scalars().all() if scalars else result.unique().all())
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = cursor_helper.encode(*key(items[-1]))
+    return items, typings.PaginationMetadata(
+        current_page=None,
+        total_pages=None,
+        total_items=None,
+        page_size=page_size,
+        next_cursor=next_cursor,
+    )
@@ -15,6 +15,8 @@ from sqlalchemy.ext import asyncio as sqlalchemy_aio
 
 from api import errors, models, ports, typings
 
+from . import keyset
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,17 +76,15 @@ class OrganizationRepository(ports.OrganizationRepository):
     async def create_or_update(
         self,
         sync_org: typings.CreateOrUpdateOrganization,
-        cached_orgs: list[models.Organization],
+        cached_orgs: dict[str, models.Organization],
     ) -> models.Organization:
         """
         Method to create or update a list of organization filtering by customer id.
 
         :param sync_org: sync_org to insert or update.
+        :param cached_orgs: organizations indexed by customer id, new ones are added.
         """
-        organization = next(
-            (org for org in cached_orgs if org.customer_id == sync_org.customer_id),
-            None,
-        )
+        organization = cached_orgs.get(str(sync_org.customer_id))
 
         if organization:
             organization.name = sync_org.name
@@ -102,6 +102,7 @@ class OrganizationRepository(ports.OrganizationRepository):
                 county=sync_org.county,
             )
             self._session.add(organization)
+            cached_orgs[str(sync_org.customer_id)] = organization
 
         return organization
 
@@ -140,6 +141,7 @@ class ListOrganizations(ports.ListOrganizations):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.Organization], typings.PaginationMetadata]:
         """
         Method to list all orgs.
@@ -163,6 +165,15 @@ class ListOrganizations(ports.ListOrganizations):
             )
 
         async with self._session_factory() as session:
+            if cursor is not None and page_size > 0:
+                return await keyset.paginate(
+                    session,
+                    stmt,
+                    (org.updated_at, org.id),
+                    lambda item: (item.updated_at, item.id),
+                    cursor,
+                    page_size,
+                )
             if page_size >= 0:
                 params = Params(page=page, size=page_size)
                 result: typings.Paginated = await paginate(
@@ -9,7 +9,7 @@ import sqlalchemy as sa
 from sqlalchemy import exc, orm
 from sqlalchemy.ext import asyncio as sqlalchemy_aio
 
-from api import errors, models, ports
+from api import errors, models, ports, typings
 
 logger = logging.getLogger(__name__)
 
@@ -46,10 +46,114 @@ class ResultRepository(ports.ResultRepository):
         )
 
         result = await self._session.execute(stmt)
-        if not (resp := result.scalars().unique().one_or_none()):
+        if not (resp := result.scalars().one_or_none()):
             raise errors.NotFound("result")
         return resp
 
+    async def get_scoring_context(self, result_id: uuid.UUID) -> typings.ScoringContext:
+        """
+        Get the answer with what scoring it needs in a single query.
+
+        Only the columns of the related rows are read, the pending questions
+        are counted in a subquery and the exam user is outer joined, so the
+        answer is scored in the same round trip and session it's updated in.
+
+        :param result_id: result id on database.
+        """
+        Euq = models.ExamUserQuestion
+        Question = models.Question
+        finished = orm.aliased(Euq)
+        pending_count = (
+            sa.select(sa.func.count(Question.id))
+            .outerjoin(
+                finished,
+                sa.and_(
+                    finished.question_id == Question.id,
+                    finished.user_id == Euq.user_id,
+                    finished.exam_id == Euq.exam_id,
+                    finished.status == models.ExamStatus.FINISHED,
+                ),
+            )
+            .where(Question.exam_id == Euq.exam_id)
+            .where(finished.id.is_(None))
+            .correlate(Euq)
+            .scalar_subquery()
+        )
+        stmt = (
+            sa.select(
+                Euq,
+                models.ExamUser,
+                Question.type,
+                pending_count,
+                models.Group.name,
+                models.Group.grade,
+                models.Exam.name,
+                models.Exam.start_date,
+                models.Exam.end_date,
+                models.Organization.name,
+                models.Organization.city,
+                models.Organization.state,
+                models.Organization.region,
+                models.Organization.county,
+                models.User.name,
+                models.User.customer_id,
+            )
+            .join(Question, Question.id == Euq.question_id)
+            .join(models.Group, models.Group.id == Euq.group_id)
+            .join(models.Exam, models.Exam.id == Euq.exam_id)
+            .join(models.Organization, models.Organization.id == Euq.organization_id)
+            .join(models.User, models.User.id == Euq.user_id)
+            .outerjoin(
+                models.ExamUser,
+                sa.and_(
+                    models.ExamUser.exam_id == Euq.exam_id,
+                    models.ExamUser.user_id == Euq.user_id,
+                ),
+            )
+            .options(orm.raiseload("*"))
+            .where(Euq.id == result_id)
+        )
+
+        result = await self._session.execute(stmt)
+        if not (row := result.one_or_none()):
+            raise errors.NotFound("result")
+        (
+            answer,
+            exam_user,
+            question_type,
+            pending,
+            group_name,
+            group_grade,
+            exam_name,
+            exam_start_date,
+            exam_end_date,
+            organization_name,
+            organization_city,
+            organization_state,
+            organization_region,
+            organization_county,
+            user_name,
+            user_customer_id,
+        ) = row
+        return typings.ScoringContext(
+            answer=answer,
+            exam_user=exam_user,
+            question_type=question_type,
+            pending_count=pending,
+            group_name=group_name,
+            group_grade=group_grade,
+            exam_name=exam_name,
+            exam_start_date=exam_start_date,
+            exam_end_date=exam_end_date,
+            organization_name=organization_name,
+            organization_city=organization_city,
+            organization_state=organization_state,
+            organization_region=organization_region,
+            organization_county=organization_county,
+            user_name=user_name,
+            user_customer_id=user_customer_id,
+        )
+
     async def create(
         self, result_model: models.ExamUserQuestion
     ) -> models.ExamUserQuestion:
@@ -5,11 +5,13 @@ Module related to the adapter of the session repository.
 from __future__ import annotations
 
 import logging
+import typing
 import uuid
 
 import sqlalchemy as sa
 import sqlalchemy.orm as sa_orm
 from sqlalchemy import exc
+from sqlalchemy.dialects import postgresql as psql
 from sqlalchemy.ext import asyncio as sqlalchemy_aio
 
 from api import errors, models, ports, typings
@@ -108,3 +110,106 @@ class GetSession(ports.GetSession):
             return None
 
         return session_model
+
+
+def _aggregate(
+    column: sa_orm.InstrumentedAttribute[uuid.UUID],
+    *where: sa.ColumnElement[bool],
+    order_by: tuple[sa_orm.InstrumentedAttribute[typing.Any], ...],
+) -> sa.ScalarSelect[typing.Any]:
+    """
+    Array of the column for the user of the session, in a stable order.
+    """
+    ordered = psql.aggregate_order_by(column, *order_by)  # type: ignore[no-untyped-call]
+    return sa.select(sa.func.array_agg(ordered)).where(*where).scalar_subquery()
+
+
+class GetPrincipal(ports.GetPrincipal):
+    """
+    Get the authorization data of a session in a single query.
+
+    The groups and organizations of the user are aggregated into arrays, so
+    the whole graph comes back as one row, without ORM instances to lazy load.
+    """
+
+    def __init__(self, session_factory: typings.SessionFactory):
+        self._session_factory = session_factory
+
+    async def __call__(self, session_id: uuid.UUID) -> typings.Principal | None:
+        """
+        Method to get the principal of the session.
+
+        :param session_id: the id for the session.
+
+        :returns: the principal, None when there's no such session.
+        """
+        in_groups = (
+            models.UserGroup.user_id == models.Session.user_id,
+            models.Group.id == models.UserGroup.group_id,
+        )
+        group_order = (models.UserGroup.created_at, models.Group.id)
+        stmt = (
+            sa.select(
+                models.Session.user_id,
+                models.Session.expires_at,
+                models.Session.generation,
+                models.User.name,
+                models.User.state,
+                models.User.region,
+                models.User.county,
+                models.Role.scopes,
+                _aggregate(models.Group.id, *in_groups, order_by=group_order),
+                _aggregate(
+                    models.Group.organization_id, *in_groups, order_by=group_order
+                ),
+                _aggregate(
+                    models.UserOrganization.organization_id,
+                    models.UserOrganization.user_id == models.Session.user_id,
+                    order_by=(
+                        models.UserOrganization.created_at,
+                        models.UserOrganization.organization_id,
+                    ),
+                ),
+            )
+            .join(models.User, models.User.id == models.Session.user_id)
+            .join(models.Role, models.Role.id == models.User.role_id)
+            .where(models.Session.id == session_id)
+        )
+        session: sqlalchemy_aio.AsyncSession
+        async with self._session_factory() as session:
+            result = await session.execute(stmt)
+
+        if not (row := result.one_or_none()):
+            return None
+
+        (
+            user_id,
+            expires_at,
+            generation,
+            name,
+            state,
+            region,
+            county,
+            scopes,
+            group_ids,
+            group_organization_ids,
+            organization_ids,
+        ) = row
+        return typings.Principal(
+            session_id=session_id,
+            user_id=user_id,
+            name=name,
+            scopes=tuple(scopes),
+            groups=tuple(
+                typings.PrincipalGroup(id=group_id, organization_id=organization_id)
+                for group_id, organization_id in zip(
+                    group_ids or [], group_organization_ids or [], strict=True
+                )
+            ),
+            organization_ids=tuple(organization_ids or []),
+            state=state,
+            region=region,
+            county=county,
+            expires_at=expires_at,
+            generation=generation,
+        )
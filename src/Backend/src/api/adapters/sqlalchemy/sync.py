@@ -0,0 +1,89 @@
+"""
+Module for the sync state sqlalchemy queries.
+"""
+
+import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext import asyncio as sqlalchemy_aio
+
+from api import models, ports
+from api.helpers import time_now
+
+CHUNK_SIZE = 1000
+
+
+class SyncRepository(ports.SyncRepository):
+    """
+    Repository of the content hashes and checkpoints of the SERE sync.
+    """
+
+    def __init__(self, session: sqlalchemy_aio.AsyncSession) -> None:
+        self._session = session
+
+    async def list_hashes(
+        self, entity: models.SyncEntity, customer_ids: list[str]
+    ) -> dict[str, str]:
+        hashes: dict[str, str] = {}
+        for start in range(0, len(customer_ids), CHUNK_SIZE):
+            chunk = customer_ids[start : start + CHUNK_SIZE]
+            result = await self._session.execute(
+                sa.select(
+                    models.SyncState.customer_id, models.SyncState.content_hash
+                ).where(
+                    models.SyncState.entity == entity,
+                    models.SyncState.customer_id.in_(chunk),
+                )
+            )
+            hashes.update(result.tuples().all())
+        return hashes
+
+    async def save_hashes(
+        self, entity: models.SyncEntity, hashes: dict[str, str]
+    ) -> None:
+        items = list(hashes.items())
+        for start in range(0, len(items), CHUNK_SIZE):
+            chunk = items[start : start + CHUNK_SIZE]
+            stmt = postgresql.insert(models.SyncState).values(
+                [
+                    {
+                        "entity": entity,
+                        "customer_id": customer_id,
+                        "content_hash": content_hash,
+                        "updated_at": time_now(),
+                    }
+                    for customer_id, content_hash in chunk
+                ]
+            )
+            await self._session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[
+                        models.SyncState.entity,
+                        models.SyncState.customer_id,
+                    ],
+                    set_={
+                        "content_hash": stmt.excluded.content_hash,
+                        "updated_at": stmt.excluded.updated_at,
+                    },
+                )
+            )
+
+    async def get_unfinished_run(
+        self, since: datetime.datetime
+    ) -> models.SyncRun | None:
+        result = await self._session.execute(
+            sa.select(models.SyncRun)
+            .where(
+                models.SyncRun.finished.is_(False),
+                models.SyncRun.created_at >= since,
+            )
+            .order_by(models.SyncRun.created_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def create_run(self) -> models.SyncRun:
+        run = models.SyncRun(phase=models.SyncEntity.ORGANIZATION, page=0)
+        self._session.add(run)
+        return run
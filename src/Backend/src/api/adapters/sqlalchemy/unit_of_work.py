@@ -11,7 +11,7 @@ from sqlalchemy.ext import asyncio as sqlalchemy_aio
 from api import db, ports
 from api.typings import SessionFactory
 
-from . import exam, group, organization, result, role, session_query, user
+from . import exam, group, organization, result, role, session_query, sync, user
 
 
 class UnitOfWorkBuilder(ports.UnitOfWorkBuilder):
@@ -66,6 +66,9 @@ class UnitOfWork(ports.UnitOfWork):
         self.result_repository = result.ResultRepository(
             session=session,
         )
+        self.sync_repository = sync.SyncRepository(
+            session=session,
+        )
 
     async def close(self) -> None:
         if not self.closed:
@@ -2,20 +2,26 @@
 Module for all user related sqlalchemy queries.
 """
 
-import json
 import logging
+import typing
 import uuid
 
 import sqlalchemy as sa
 from fastapi_pagination import Params
 from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlalchemy import exc, func, orm
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext import asyncio as sqlalchemy_aio
 
 from api import errors, helpers, models, ports, typings
 
+from . import keyset
+
 logger = logging.getLogger(__name__)
 
+# Rows per statement, keeps the bind parameters under the postgres limit.
+BULK_CHUNK_SIZE = 1000
+
 
 class UserRepository(ports.UserRepository):
     """
@@ -92,48 +98,157 @@ class UserRepository(ports.UserRepository):
         """
         await self._session.delete(user_model)
 
-    async def create_or_update_student(
+    async def bulk_create_or_update_students(
         self,
-        student: typings.CreateOrUpdateUser,
-        group_customer_id: str,
+        students: list[tuple[typings.CreateOrUpdateUser, str]],
         updated_groups: dict[str, models.Group],
-        cached_users: list[models.User],
-    ) -> models.User | None:
-        group = updated_groups.get(group_customer_id)
-        if not group:
+    ) -> int:
+        """
+        Method to create or update students in bulk, by customer id.
+        The groups and organizations of each student are replaced.
+
+        :param students: students to insert or update and their group customer id.
+        :param updated_groups: groups indexed by customer id.
+
+        :returns: amount of students written.
+        """
+        await self._session.flush()
+        missing = {
+            group_customer_id
+            for _, group_customer_id in students
+            if group_customer_id not in updated_groups
+        }
+        groups = dict(updated_groups)
+        if missing:
             group_stmt = sa.select(models.Group).where(
-                models.Group.customer_id == group_customer_id
+                models.Group.customer_id.in_(missing)
             )
             group_result = await self._session.execute(group_stmt)
-            group = group_result.unique().scalar_one_or_none()
-            if not group:
-                return None
-        user = next(
-            (u for u in cached_users if u.customer_id == student.customer_id), None
+            for group in group_result.unique().scalars():
+                if group.customer_id:
+                    groups[group.customer_id] = group
+
+        written = 0
+        for start in range(0, len(students), BULK_CHUNK_SIZE):
+            chunk = [
+                (student, groups[group_customer_id])
+                for student, group_customer_id in students[
+                    start : start + BULK_CHUNK_SIZE
+                ]
+                if group_customer_id in groups
+            ]
+            if chunk:
+                written += await self._upsert_students(chunk)
+        return written
+
+    async def _upsert_students(
+        self, students: list[tuple[typings.CreateOrUpdateUser, models.Group]]
+    ) -> int:
+        now = helpers.time_now()
+        insert_stmt = postgresql.insert(models.User).values(
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "created_at": now,
+                    "updated_at": now,
+                    "external_id": None,
+                    "name": student.name,
+                    "email_address": student.email_address,
+                    "customer_id": student.customer_id,
+                    "type": student.type,
+                    "role_id": student.role_id,
+                    "county": student.county,
+                    "region": student.region,
+                    "state": student.state,
+                }
+                for student, _ in students
+            ]
         )
-
-        if user:
-            user.name = student.name
-            user.type = student.type
-            user.role_id = student.role_id
-            user.groups = [group]
-            user.organizations = [group.organization]
-        else:
-            user = models.User(
-                external_id=None,
-                name=student.name,
-                email_address=student.email_address,
-                customer_id=student.customer_id,
-                type=student.type,
-                role_id=student.role_id,
-                groups=[group],
-                organizations=[group.organization],
-                county=student.county,
-                region=student.region,
-                state=student.state,
+        excluded = insert_stmt.excluded
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[models.User.customer_id],
+            set_={
+                "name": excluded.name,
+                "type": excluded.type,
+                "role_id": excluded.role_id,
+                "updated_at": now,
+            },
+            where=sa.or_(
+                models.User.name.is_distinct_from(excluded.name),
+                models.User.type.is_distinct_from(excluded.type),
+                models.User.role_id.is_distinct_from(excluded.role_id),
+            ),
+        ).returning(models.User.customer_id)
+        result = await self._session.execute(upsert_stmt)
+        written = set(result.scalars())
+
+        # Links are only replaced for students whose group or organization moved
+        links_stmt = (
+            sa.select(
+                models.User.customer_id,
+                models.User.id,
+                models.UserGroup.group_id,
+                models.UserOrganization.organization_id,
             )
-            self._session.add(user)
-        return user
+            .outerjoin(models.UserGroup, models.UserGroup.user_id == models.User.id)
+            .outerjoin(
+                models.UserOrganization,
+                models.UserOrganization.user_id == models.User.id,
+            )
+            .where(models.User.customer_id.in_([s.customer_id for s, _ in students]))
+        )
+        user_ids: dict[str | None, uuid.UUID] = {}
+        current_links: dict[uuid.UUID, tuple[set[uuid.UUID], set[uuid.UUID]]] = {}
+        for customer_id, user_id, group_id, organization_id in (
+            await self._session.execute(links_stmt)
+        ).tuples():
+            user_ids[customer_id] = user_id
+            group_ids, organization_ids = current_links.setdefault(
+                user_id, (set(), set())
+            )
+            if group_id:
+                group_ids.add(group_id)
+            if organization_id:
+                organization_ids.add(organization_id)
+
+        moved = [
+            (user_ids[student.customer_id], group)
+            for student, group in students
+            if current_links[user_ids[student.customer_id]]
+            != ({group.id}, {group.organization_id})
+        ]
+        if moved:
+            moved_ids = [user_id for user_id, _ in moved]
+            await self._session.execute(
+                sa.delete(models.UserGroup).where(
+                    models.UserGroup.user_id.in_(moved_ids)
+                )
+            )
+            await self._session.execute(
+                sa.delete(models.UserOrganization).where(
+                    models.UserOrganization.user_id.in_(moved_ids)
+                )
+            )
+            await self._session.execute(
+                sa.insert(models.UserGroup),
+                [
+                    {"user_id": user_id, "group_id": group.id}
+                    for user_id, group in moved
+                ],
+            )
+            await self._session.execute(
+                sa.insert(models.UserOrganization),
+                [
+                    {"user_id": user_id, "organization_id": group.organization_id}
+                    for user_id, group in moved
+                ],
+            )
+            written.update(
+                customer_id
+                for customer_id, user_id in user_ids.items()
+                if user_id in moved_ids
+            )
+        return len(written)
 
     async def create_or_update_professor(
         self,
@@ -142,42 +257,23 @@ class UserRepository(ports.UserRepository):
         organizations_customer_id: list[str],
         updated_organizations: dict[str, models.Organization],
         updated_groups: dict[str, models.Group],
-        cached_profs: list[models.User],
+        cached_profs: dict[str, models.User],
     ) -> models.User | None:
-        groups: list[models.Group] = []
-        for group_customer_id in groups_customer_id:
-            group = updated_groups.get(group_customer_id)
-            if not group:
-                group_stmt = sa.select(models.Group).where(
-                    models.Group.customer_id == group_customer_id
-                )
-                group_result = await self._session.execute(group_stmt)
-                group = group_result.unique().scalar_one_or_none()
-                if group and group.customer_id:
-                    updated_groups[group.customer_id] = group
-            if group:
-                groups.append(group)
+        groups = [
+            updated_groups[customer_id]
+            for customer_id in groups_customer_id
+            if customer_id in updated_groups
+        ]
         if not groups:
             return None
-
-        organizations: list[models.Organization] = []
-        for organization_customer_id in organizations_customer_id:
-            organization = updated_organizations.get(organization_customer_id)
-            if not organization:
-                organization_stmt = sa.select(models.Organization).where(
-                    models.Organization.customer_id == organization_customer_id
-                )
-                organization_result = await self._session.execute(organization_stmt)
-                organization = organization_result.unique().scalar_one_or_none()
-                if organization and organization.customer_id:
-                    updated_organizations[organization.customer_id] = organization
-            if organization:
-                organizations.append(organization)
+        organizations = [
+            updated_organizations[customer_id]
+            for customer_id in organizations_customer_id
+            if customer_id in updated_organizations
+        ]
         if not organizations:
             return None
-        user = next(
-            (u for u in cached_profs if u.customer_id == professor.customer_id), None
-        )
+        user = cached_profs.get(str(professor.customer_id))
         if user:
             user.name = professor.name
             user.type = models.UserType.PASSWORD
@@ -221,6 +317,7 @@ class UserRepository(ports.UserRepository):
                 state=professor.state,
             )
             self._session.add(user)
+            cached_profs[str(professor.customer_id)] = user
         return user
 
     async def list(
@@ -271,6 +368,7 @@ class ListUsers(ports.ListUsers):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.User], typings.PaginationMetadata]:
         """
         Method to list all users.
@@ -279,22 +377,29 @@ class ListUsers(ports.ListUsers):
         org = models.Organization
         group = models.Group
         stmt = sa.select(user).order_by(user.updated_at.desc())
-        if organizations or query:
-            stmt = stmt.outerjoin(models.UserOrganization)
-
-        if groups or query:
-            stmt = stmt.outerjoin(models.UserGroup)
         if roles:
             stmt = stmt.where(user.role_id.in_(roles))
         if groups:
-            stmt = stmt.where(models.UserGroup.group_id.in_(groups))
+            stmt = stmt.where(
+                user.id.in_(
+                    sa.select(models.UserGroup.user_id).where(
+                        models.UserGroup.group_id.in_(groups)
+                    )
+                )
+            )
         if organizations:
             stmt = stmt.where(
-                models.UserOrganization.organization_id.in_(organizations)
+                user.id.in_(
+                    sa.select(models.UserOrganization.user_id).where(
+                        models.UserOrganization.organization_id.in_(organizations)
+                    )
+                )
             )
         if query:
             stmt = (
-                stmt.outerjoin(org)
+                stmt.outerjoin(models.UserOrganization)
+                .outerjoin(models.UserGroup)
+                .outerjoin(org)
                 .outerjoin(group)
                 .where(
                     sa.or_(
@@ -308,6 +413,15 @@ class ListUsers(ports.ListUsers):
             )
 
         async with self._session_factory() as session:
+            if cursor is not None and page_size > 0:
+                return await keyset.paginate(
+                    session,
+                    stmt,
+                    (user.updated_at, user.id),
+                    lambda item: (item.updated_at, item.id),
+                    cursor,
+                    page_size,
+                )
             if page_size > 0:
                 params = Params(page=page, size=page_size)
                 result: typings.Paginated = await paginate(
@@ -332,6 +446,9 @@ class ListUsers(ports.ListUsers):
 class ListUsersWithExams(ports.ListUsersWithExams):
     """
     Query to get all users with exams.
+
+    The page of users is fetched first and the exams of its users in a second
+    query, batched by user id, so no row is repeated per exam.
     """
 
     def __init__(self, session_factory: typings.SessionFactory):
@@ -346,82 +463,40 @@ class ListUsersWithExams(ports.ListUsersWithExams):
         show_finished: bool = True,
         page_size: int = 10,
         page: int = 1,
-    ) -> tuple[list[dict], typings.PaginationMetadata]:  # type:ignore[type-arg]
+        cursor: str | None = None,
+    ) -> tuple[list[typings.UserWithExams], typings.PaginationMetadata]:
         user = models.User
-        org = models.Organization
-        group = models.Group
-        exam = models.Exam
-        exam_user = models.ExamUser
-        current_date = helpers.time_now()
         stmt = (
             sa.select(
-                user,
-                sa.cast(
-                    sa.func.json_agg(
-                        sa.func.json_build_object(
-                            "id",
-                            exam.id,
-                            "name",
-                            exam.name,
-                            "start_date",
-                            exam.start_date,
-                            "end_date",
-                            exam.end_date,
-                            "status",
-                            exam_user.status,
-                        )
-                    ),
-                    type_=sa.String,
-                ).label("exams"),
+                user.id, user.name, user.email_address, user.role_id, user.updated_at
             )
-            .join(models.UserGroup, models.UserGroup.user_id == user.id)
-            .join(
-                group,
-                sa.and_(group.id.in_(groups), group.id == models.UserGroup.group_id),
+            .where(
+                user.id.in_(
+                    sa.select(models.UserGroup.user_id).where(
+                        models.UserGroup.group_id.in_(groups)
+                    )
+                )
             )
-            .join(models.UserOrganization, models.UserOrganization.user_id == user.id)
-            .join(
-                org,
-                sa.and_(
-                    org.id.in_(organizations),
-                    org.id == models.UserOrganization.organization_id,
-                ),
+            .where(
+                user.id.in_(
+                    sa.select(models.UserOrganization.user_id).where(
+                        models.UserOrganization.organization_id.in_(organizations)
+                    )
+                )
             )
+            .order_by(user.updated_at.desc())
         )
         stmt = stmt.where(user.role_id.in_(role_ids)) if role_ids else stmt
 
         if not show_finished:
-            stmt = (
-                stmt.join(
-                    exam,
-                    sa.and_(
-                        group.grade == exam.grade,
-                        exam.start_date <= current_date,
-                        exam.end_date > current_date,
-                    ),
-                )
-                .outerjoin(
-                    exam_user,
-                    sa.and_(exam_user.user_id == user.id, exam.id == exam_user.exam_id),
-                )
-                .where(
-                    sa.or_(
-                        exam_user.status != models.ExamStatus.FINISHED,
-                        exam_user.exam_id.is_(None),
-                    )
+            stmt = stmt.where(
+                sa.exists(
+                    self._exams_stmt(groups, show_finished)
+                    .with_only_columns(sa.literal(1))
+                    .order_by(None)
+                    .where(models.UserGroup.user_id == user.id)
                 )
             )
-        else:
-            stmt = stmt.outerjoin(
-                exam,
-                sa.and_(
-                    group.grade == exam.grade,
-                    exam.start_date <= current_date,
-                ),
-            ).outerjoin(
-                exam_user,
-                sa.and_(exam_user.user_id == user.id, exam.id == exam_user.exam_id),
-            )
 
         if query:
             stmt = stmt.where(
@@ -431,44 +506,115 @@ class ListUsersWithExams(ports.ListUsersWithExams):
                 )
             )
 
-        stmt = stmt.group_by(user.id)
-
         async with self._session_factory() as session:
-            if page_size >= 0:
+            if cursor is not None and page_size > 0:
+                user_rows, metadata = await keyset.paginate(
+                    session,
+                    stmt,
+                    (user.updated_at, user.id),
+                    lambda item: (item.updated_at, item.id),
+                    cursor,
+                    page_size,
+                    scalars=False,
+                )
+            elif page_size >= 0:
                 params = Params(page=page, size=page_size)
                 result: typings.Paginated = await paginate(session, stmt, params=params)
-                result_items = result.items
-                current_page = result.page
-                total_pages = result.pages
-                total_items = result.total
-                page_size = result.size
+                user_rows = result.items
+                metadata = typings.PaginationMetadata(
+                    current_page=result.page,
+                    total_pages=result.pages,
+                    total_items=result.total,
+                    page_size=result.size,
+                )
             else:
-                result_all = await session.execute(stmt)
-                result_items = list(result_all.unique().all())
-                current_page = 1
-                total_pages = 1
-                total_items = len(result_items)
-                page_size = len(result_items)
-
-        items_result = []
-        for item in result_items:
-            user_dict = {
-                col.name: getattr(item.User, col.name)
-                for col in item.User.__table__.columns
-            }
-            exams_dict_list = json.loads(item.exams)
-            items_result.append(
-                {
-                    **user_dict,
-                    "exams": [ex for ex in exams_dict_list if ex["id"] is not None],
-                }
+                user_rows = list((await session.execute(stmt)).all())
+                metadata = typings.PaginationMetadata(
+                    current_page=1,
+                    total_pages=1,
+                    total_items=len(user_rows),
+                    page_size=len(user_rows),
+                )
+
+            exams: dict[uuid.UUID, list[typings.ExamWithStatus]] = {}
+            if user_rows:
+                exam_rows = await session.execute(
+                    self._exams_stmt(groups, show_finished).where(
+                        models.UserGroup.user_id.in_([row.id for row in user_rows])
+                    )
+                )
+                for row in exam_rows:
+                    exams.setdefault(row.user_id, []).append(
+                        typings.ExamWithStatus(
+                            id=row.id,
+                            name=row.name,
+                            start_date=row.start_date,
+                            end_date=row.end_date,
+                            status=row.status,
+                        )
+                    )
+
+        return [
+            typings.UserWithExams(
+                id=row.id,
+                name=row.name,
+                email_address=row.email_address,
+                role_id=row.role_id,
+                exams=tuple(exams.get(row.id, ())),
             )
-        return items_result, typings.PaginationMetadata(
-            current_page=current_page,
-            total_pages=total_pages,
-            total_items=total_items,
-            page_size=page_size,
+            for row in user_rows
+        ], metadata
+
+    @staticmethod
+    def _exams_stmt(
+        groups: list[uuid.UUID], show_finished: bool
+    ) -> sa.Select[typing.Any]:
+        """
+        Started exams of the listed groups of the users, with their status.
+
+        Without the finished ones, only the running exams not finished yet.
+        """
+        group = models.Group
+        exam = models.Exam
+        exam_user = models.ExamUser
+        user_group = models.UserGroup
+        current_date = helpers.time_now()
+        exam_filter = exam.start_date <= current_date
+        if not show_finished:
+            exam_filter = sa.and_(exam_filter, exam.end_date > current_date)
+        stmt = (
+            sa.select(
+                user_group.user_id,
+                exam.id,
+                exam.name,
+                exam.start_date,
+                exam.end_date,
+                exam_user.status,
+            )
+            .distinct()
+            .select_from(user_group)
+            .join(
+                group,
+                sa.and_(group.id == user_group.group_id, group.id.in_(groups)),
+            )
+            .join(exam, sa.and_(group.grade == exam.grade, exam_filter))
+            .outerjoin(
+                exam_user,
+                sa.and_(
+                    exam_user.user_id == user_group.user_id,
+                    exam_user.exam_id == exam.id,
+                ),
+            )
+            .order_by(user_group.user_id, exam.start_date, exam.id)
         )
+        if not show_finished:
+            stmt = stmt.where(
+                sa.or_(
+                    exam_user.status != models.ExamStatus.FINISHED,
+                    exam_user.exam_id.is_(None),
+                )
+            )
+        return stmt
 
 
 class GetUser(ports.GetUser):
@@ -22,7 +22,16 @@ from .adapters.sqlalchemy import (
     unit_of_work,
     user,
 )
-from .helpers import auth, schemas, session_manager
+from .domain.service import process_result
+from .helpers import (
+    audio,
+    auth,
+    key_material,
+    passwords,
+    schemas,
+    session_cache,
+    session_manager,
+)
 from .typings import SessionFactory, Settings
 
 logger = logging.getLogger(__name__)
@@ -55,6 +64,54 @@ class SettingsModule(injector.Module):
 
         return ctx
 
+    @injector.provider
+    @injector.singleton
+    def provide_password_hasher(
+        self, settings: Settings, hash_ctx: context.CryptContext
+    ) -> passwords.PasswordHasher:
+        """
+        Provides the executors for the password hashing.
+        """
+        return passwords.PasswordHasher(
+            hash_ctx=hash_ctx,
+            max_workers=int_setting(settings, "password_workers", 4),
+            bulk_workers=int_setting(
+                settings, "password_bulk_workers", os.cpu_count() or 1
+            ),
+        )
+
+    @injector.provider
+    @injector.singleton
+    def provide_key_material(
+        self, settings: Settings, secrets: ports.SecretManager
+    ) -> key_material.KeyMaterial:
+        """
+        Provides the parsed keys of the app tokens.
+        """
+        return key_material.KeyMaterial(
+            secrets=secrets,
+            refresh_interval=int_setting(settings, "token_key_refresh", 3600),
+        )
+
+
+class AudioModule(injector.Module):
+    """
+    Module for the audio processing executor.
+    """
+
+    @injector.provider
+    @injector.singleton
+    def provide_audio_processor(self, settings: Settings) -> audio.AudioProcessor:
+        """
+        Provide the executor for audio processing.
+        """
+        max_workers = int_setting(settings, "audio_workers", 4)
+        return audio.AudioProcessor(
+            max_workers=max_workers,
+            max_concurrency=int_setting(settings, "audio_concurrency", max_workers),
+            use_processes=settings.get("audio_pool", "thread") == "process",
+        )
+
 
 class EngineSQLAlchemy(injector.Module):
     """
@@ -126,6 +183,41 @@ class SQLAlchemyModule(injector.Module):  # pylint: disable=too-many-public-meth
             session_factory=session_factory,
         )
 
+    @injector.provider
+    @injector.singleton
+    def provide_get_principal_query(
+        self, session_factory: SessionFactory
+    ) -> ports.GetPrincipal:
+        """
+        Provides the single query principal loader.
+        """
+        return session_query.GetPrincipal(
+            session_factory=session_factory,
+        )
+
+    @injector.provider
+    @injector.singleton
+    def provide_session_cache(self, settings: Settings) -> session_cache.SessionCache:
+        """
+        Provides the process cache of the sessions checked by the tokens.
+        """
+        return session_cache.SessionCache(
+            ttl=int_setting(settings, "session_cache_ttl", 60)
+        )
+
+    @injector.provider
+    @injector.singleton
+    def provide_active_exam_catalog(
+        self, session_factory: SessionFactory, settings: Settings
+    ) -> ports.ActiveExamCatalog:
+        """
+        Provides the process cache of the running exams by grade.
+        """
+        return exam.ActiveExamCatalog(
+            session_factory=session_factory,
+            ttl=int_setting(settings, "active_exams_ttl", 30),
+        )
+
     @injector.provider
     @injector.singleton
     def provide_list_orgs(
@@ -255,13 +347,16 @@ class SQLAlchemyModule(injector.Module):  # pylint: disable=too-many-public-meth
     @injector.provider
     @injector.singleton
     def provide_list_pending_exams(
-        self, session_factory: SessionFactory
+        self,
+        session_factory: SessionFactory,
+        catalog: ports.ActiveExamCatalog,
     ) -> ports.ListPendingExams:
         """
         Provides sqlalchemy get user.
         """
         return exam.ListPendingExams(
             session_factory=session_factory,
+            catalog=catalog,
         )
 
     @injector.provider
@@ -279,37 +374,46 @@ class SQLAlchemyModule(injector.Module):  # pylint: disable=too-many-public-meth
     @injector.provider
     @injector.singleton
     def provide_list_pending_questions(
-        self, session_factory: SessionFactory
+        self,
+        session_factory: SessionFactory,
+        catalog: ports.ActiveExamCatalog,
     ) -> ports.ListPendingQuestions:
         """
         Provides sqlalchemy list pending questions.
         """
         return exam.ListPendingQuestions(
             session_factory=session_factory,
+            catalog=catalog,
         )
 
     @injector.provider
     @injector.singleton
     def provide_get_pending_question(
-        self, session_factory: SessionFactory
+        self,
+        session_factory: SessionFactory,
+        catalog: ports.ActiveExamCatalog,
     ) -> ports.GetPendingQuestion:
         """
         Provides sqlalchemy get pending question.
         """
         return exam.GetPendingQuestion(
             session_factory=session_factory,
+            catalog=catalog,
         )
 
     @injector.provider
     @injector.singleton
     def provide_get_exam_user_question_status(
-        self, session_factory: SessionFactory
+        self,
+        session_factory: SessionFactory,
+        catalog: ports.ActiveExamCatalog,
     ) -> ports.GetExamUserStatus:
         """
         Provides sqlalchemy get exam user.
         """
         return exam.GetExamUserStatus(
             session_factory=session_factory,
+            catalog=catalog,
         )
 
     @injector.provider
@@ -351,13 +455,16 @@ class SQLAlchemyModule(injector.Module):  # pylint: disable=too-many-public-meth
     @injector.provider
     @injector.singleton
     def provide_list_question_with_status(
-        self, session_factory: SessionFactory
+        self,
+        session_factory: SessionFactory,
+        catalog: ports.ActiveExamCatalog,
     ) -> ports.ListQuestionsWithStatus:
         """
         Provides sqlalchemy ListQuestionsWithStatus.
         """
         return exam.ListQuestionsWithStatus(
             session_factory=session_factory,
+            catalog=catalog,
         )
 
     @injector.provider
@@ -394,9 +501,14 @@ class SyncModule(injector.Module):
     @injector.singleton
     def provide_sere_connector(self, settings: Settings) -> sere.SereApi:
         """
-        Provides sqlalchemy ListSereProfessors.
+        Provides the SERE api client.
         """
-        return sere.SereApi(settings.get("sere_api_key", ""))
+        return sere.SereApi(
+            settings.get("sere_api_key", ""),
+            concurrency=int_setting(settings, "sync_concurrency", 4),
+            timeout=int_setting(settings, "sere_timeout", 300),
+            max_retries=int_setting(settings, "sere_max_retries", 3),
+        )
 
 
 class MemoryModule(injector.Module):
@@ -458,6 +570,8 @@ class GoogleModule(injector.Module):
         return google.FirebaseAuth(
             project_id=settings.get("project_id", ""),
             creds_path=settings.get("gcp_fb_credentials", ""),
+            max_workers=int_setting(settings, "firebase_workers", 4),
+            revocation_ttl=int_setting(settings, "firebase_revocation_ttl", 60),
         )
 
     @injector.provider
@@ -483,6 +597,8 @@ class GoogleModule(injector.Module):
             dataset=settings.get("bq_dataset", ""),
             table_name=settings.get("bq_table_name", ""),
             creds_path=settings.get("gcp_bigquery_credentials", ""),
+            max_batch_size=int_setting(settings, "bq_batch_size", 500),
+            flush_interval=int_setting(settings, "bq_flush_interval", 5),
         )
 
     @injector.provider
@@ -496,6 +612,17 @@ class GoogleModule(injector.Module):
             looker_host=settings.get("looker_host", ""),
         )
 
+    @injector.provider
+    @injector.singleton
+    def provide_speech_registry(self, settings: Settings) -> google.SpeechRegistry:
+        """
+        Provide the GCP's Speech to Text registry.
+        """
+        return google.SpeechRegistry(
+            project_id=settings.get("project_id", ""),
+            creds_path=settings.get("gcp_stt_credentials", ""),
+        )
+
 
 class UtilModule(injector.Module):
     """
@@ -513,6 +640,29 @@ class UtilModule(injector.Module):
             sender_email=settings.get("sender_email", ""),
         )
 
+    @injector.provider
+    @injector.singleton
+    def provide_id_token_verifier(self) -> google.IdTokenVerifier:
+        """
+        Provides the verifier of the Google ID tokens, with its cached certs.
+        """
+        return google.IdTokenVerifier()
+
+    @injector.provider
+    @injector.singleton
+    def provide_match_mode(self, settings: Settings) -> process_result.MatchMode:
+        """
+        Provides how answers are matched with the expected words.
+        """
+        value = settings.get("match_mode", process_result.MatchMode.GREEDY.value)
+        try:
+            return process_result.MatchMode(value)
+        except ValueError:
+            logger.warning(
+                "Invalid match mode, using greedy.", extra={"match_mode": value}
+            )
+            return process_result.MatchMode.GREEDY
+
 
 class InternetlessModule(injector.Module):
     """
@@ -536,6 +686,8 @@ class InternetlessModule(injector.Module):
         return google.FirebaseAuth(
             project_id=settings.get("project_id", ""),
             creds_path=settings.get("gcp_fb_credentials", ""),
+            max_workers=int_setting(settings, "firebase_workers", 4),
+            revocation_ttl=int_setting(settings, "firebase_revocation_ttl", 60),
         )
 
     @injector.provider
@@ -561,6 +713,8 @@ class InternetlessModule(injector.Module):
             dataset=settings.get("bq_dataset", ""),
             table_name=settings.get("bq_table_name", ""),
             creds_path=settings.get("gcp_bigquery_credentials", ""),
+            max_batch_size=int_setting(settings, "bq_batch_size", 500),
+            flush_interval=int_setting(settings, "bq_flush_interval", 5),
         )
 
     @injector.provider
@@ -614,6 +768,26 @@ class TracingModule(injector.Module):
         return logging_config.StructLogLogContext()
 
 
+def int_setting(settings: Settings, name: str, default: int) -> int:
+    """
+    Read a positive integer setting, falling back to the default when invalid.
+    """
+    value = settings.get(name)
+    if value is None:
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        parsed = 0
+    if parsed <= 0:
+        logger.warning(
+            "Invalid setting, using the default.",
+            extra={"setting": name, "value": value, "default": default},
+        )
+        return default
+    return parsed
+
+
 def create_container(mods: tuple[injector.Module] | None = None) -> injector.Injector:
     """
     Create the dependency injection container.
@@ -622,6 +796,7 @@ def create_container(mods: tuple[injector.Module] | None = None) -> injector.Inj
     """
     modules = mods or (
         SettingsModule(),
+        AudioModule(),
         EngineSQLAlchemy(),
         SQLAlchemyModule(),
         SyncModule(),
@@ -634,14 +809,23 @@ def create_container(mods: tuple[injector.Module] | None = None) -> injector.Inj
 
 
 def get_session_manager(
+    request: fastapi.Request,
     get_session_query: ports.GetSession = fastapi_injector.Injected(ports.GetSession),
+    get_principal_query: ports.GetPrincipal = fastapi_injector.Injected(
+        ports.GetPrincipal
+    ),
     token_data: schemas.TokenData = fastapi.Security(auth.get_token),
 ) -> session_manager.SessionManager:
     """
     Get the session_manager.
+
+    It reuses the principal checked by get_token for the same request, if any.
     """
     return session_manager.SessionManager(
-        token_data=token_data, get_session_query=get_session_query
+        token_data=token_data,
+        get_session_query=get_session_query,
+        get_principal_query=get_principal_query,
+        principal=getattr(request.state, "principal", None),
     )
 
 
@@ -649,28 +833,29 @@ def get_speech_to_text(
     version: str,
     settings: Settings,
     storage: ports.Storage,
+    audio_processor: audio.AudioProcessor,
+    registry: google.SpeechRegistry,
 ) -> ports.SpeechToText:
     """
     Get the speech to text.
+
+    The v2 adapters share the recognizers and clients of the registry.
     """
     match version:
         case "v2":
             return google.SpeechToTextV2(
-                project_id=settings.get("project_id", ""),
-                creds_path=settings.get("gcp_stt_credentials", ""),
-                storage=storage,
+                registry=registry, storage=storage, audio_processor=audio_processor
             )
         case "v1":
             return google.SpeechToText(
                 project_id=settings.get("project_id", ""),
                 creds_path=settings.get("gcp_stt_credentials", ""),
                 storage=storage,
+                audio_processor=audio_processor,
             )
         case "v2chirp":
             return google.SpeechToTextV2Chirp(
-                project_id=settings.get("project_id", ""),
-                creds_path=settings.get("gcp_stt_credentials", ""),
-                storage=storage,
+                registry=registry, storage=storage, audio_processor=audio_processor
             )
         case _:
             raise ValueError("Invalid version")
@@ -1,3 +1,3 @@
-from . import phonemes, process_result
+from . import distance, phonemes, process_result
 
-__all__ = ("phonemes", "process_result")
+__all__ = ("distance", "phonemes", "process_result")
@@ -0,0 +1,107 @@
+"""
+Module containing the edit distance between strings or lists of words
+"""
+
+import typing
+
+# Sequences at least this long use the bit-parallel algorithm.
+BIT_PARALLEL_MIN_LENGTH = 32
+
+
+def levenshtein(
+    first: typing.Sequence[typing.Hashable],
+    second: typing.Sequence[typing.Hashable],
+    max_distance: int | None = None,
+) -> int:
+    """
+    Checks the levenshtein distance between two strings or lists of words
+    For every insertion, deletion or substitution it adds 1 point
+    0 points means both sequences are the same
+
+    When max_distance is given, the computation stops as soon as the distance
+    is known to be bigger than it and max_distance + 1 is returned.
+    """
+    if len(first) < len(second):
+        first, second = second, first
+    limit = len(first) if max_distance is None else max_distance
+    if len(first) - len(second) > limit:
+        return limit + 1
+    if not second:
+        return len(first)
+    if len(second) >= BIT_PARALLEL_MIN_LENGTH and 2 * limit + 1 >= len(second):
+        return min(_bit_parallel(first, second), limit + 1)
+    return _banded(first, second, limit)
+
+
+def _banded(
+    first: typing.Sequence[typing.Hashable],
+    second: typing.Sequence[typing.Hashable],
+    limit: int,
+) -> int:
+    """
+    Two rows dynamic programming, only filling the cells within the limit.
+
+    Cells outside the band are never read as less than limit + 1.
+    """
+    cap = limit + 1
+    previous_row = [min(j, cap) for j in range(len(second) + 1)]
+    current_row = [cap] * (len(second) + 1)
+    for i, item_one in enumerate(first, 1):
+        start = max(1, i - limit)
+        end = min(len(second), i + limit)
+        current_row[start - 1] = min(i, cap) if start == 1 else cap
+        row_min = current_row[start - 1]
+        for j in range(start, end + 1):
+            value = min(
+                previous_row[j] + 1,
+                current_row[j - 1] + 1,
+                previous_row[j - 1] + (item_one != second[j - 1]),
+                cap,
+            )
+            current_row[j] = value
+            row_min = min(row_min, value)
+        if end < len(second):
+            current_row[end + 1] = cap
+        if row_min >= cap:
+            return cap
+        previous_row, current_row = current_row, previous_row
+    return previous_row[-1]
+
+
+def _bit_parallel(
+    first: typing.Sequence[typing.Hashable],
+    second: typing.Sequence[typing.Hashable],
+) -> int:
+    """
+    Myers' bit-vector algorithm, a whole column of the table is computed at once
+    using the bits of an integer.
+    """
+    positions: dict[typing.Hashable, int] = {}
+    for i, item in enumerate(second):
+        positions[item] = positions.get(item, 0) | (1 << i)
+    mask = (1 << len(second)) - 1
+    last_bit = 1 << (len(second) - 1)
+    positive_vertical = mask
+    negative_vertical = 0
+    score = len(second)
+    for item in first:
+        equal = positions.get(item, 0)
+        vertical = equal | negative_vertical
+        horizontal = (
+            ((equal & positive_vertical) + positive_vertical) ^ positive_vertical
+        ) | equal
+        positive_horizontal = (
+            negative_vertical | ~(horizontal | positive_vertical)
+        ) & mask
+        negative_horizontal = positive_vertical & horizontal
+        if positive_horizontal & last_bit:
+            score += 1
+        elif negative_horizontal & last_bit:
+            score -= 1
+        positive_horizontal = (positive_horizontal << 1) | 1
+        negative_horizontal <<= 1
+        positive_vertical = (
+            negative_horizontal | ~(vertical | positive_horizontal)
+        ) & mask
+        negative_vertical = positive_horizontal & vertical & mask
+    return score
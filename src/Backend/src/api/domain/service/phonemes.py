@@ -2,15 +2,59 @@
 Module containing all phonemize library stuff
 """
 
-from phonemizer import phonemize, separator  # type: ignore[import-untyped]
+import collections
+import threading
+
+from phonemizer import separator  # type: ignore[import-untyped]
+from phonemizer.backend import EspeakBackend  # type: ignore[import-untyped]
+
+CACHE_SIZE = 20000
+
+_SEPARATOR = separator.Separator(phone=None, word=" ", syllable="|")
+
+_lock = threading.Lock()
+_backends: dict[str, EspeakBackend] = {}
+_cache: collections.OrderedDict[tuple[str, str], str] = collections.OrderedDict()
 
 
 def phonemize_data_list(data: list[str], language: str = "pt-br") -> list[str]:
-    return phonemize(  # type: ignore[no-any-return]
-        data,
-        language=language,
-        backend="espeak",
-        separator=separator.Separator(phone=None, word=" ", syllable="|"),
-        strip=True,
-        preserve_punctuation=True,
-    )
+    """
+    Phonemize each item of the list.
+
+    The phonemes are cached by word and language, only the words missing from
+    the cache are sent to espeak, in a single call.
+    """
+    with _lock:
+        missing = [
+            word for word in dict.fromkeys(data) if (word, language) not in _cache
+        ]
+        if missing:
+            phonemized = _get_backend(language).phonemize(
+                missing, separator=_SEPARATOR, strip=True
+            )
+            for word, phonemes in zip(missing, phonemized, strict=True):
+                _cache[(word, language)] = phonemes
+        result = []
+        for word in data:
+            _cache.move_to_end((word, language))
+            result.append(_cache[(word, language)])
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def clear_cache() -> None:
+    """
+    Remove every cached phoneme.
+    """
+    with _lock:
+        _cache.clear()
+
+
+def _get_backend(language: str) -> EspeakBackend:
+    """
+    Espeak backend of the language, it is started only once per process.
+    """
+    if language not in _backends:
+        _backends[language] = EspeakBackend(language, preserve_punctuation=True)
+    return _backends[language]
@@ -1,10 +1,34 @@
+import bisect
+import collections
+import dataclasses
+import enum
+
 from api import models
 from api.domain.service import phonemes
 from api.helpers import util
 
 
+class MatchMode(enum.StrEnum):
+    """
+    How the expected words are matched with the transcript.
+    """
+
+    GREEDY = "greedy"
+    ALIGNED = "aligned"
+
+
+@dataclasses.dataclass(frozen=True)
+class _Match:
+    word: int
+    transcript: int
+    previous: "_Match | None"
+
+
 def get_right_count_user_result(
-    words: list[str], tts_words: str, question_type: str | None
+    words: list[str],
+    tts_words: str,
+    question_type: str | None,
+    mode: MatchMode = MatchMode.GREEDY,
 ) -> tuple[int, list[str]]:
     transcripts = (
         tts_words.replace(".", " ")
@@ -19,13 +43,13 @@ def get_right_count_user_result(
             data_words = phonemes.phonemize_data_list(words)
             data_transcript = phonemes.phonemize_data_list(transcripts)
             right_words, clean_transcripts = _compare_list_string(
-                data_words, data_transcript, words, transcripts
+                data_words, data_transcript, words, transcripts, mode
             )
         case _:
             data_words = words.copy()
             data_transcript = transcripts.copy()
             right_words, clean_transcripts = _compare_list_string(
-                data_words, data_transcript, words, transcripts
+                data_words, data_transcript, words, transcripts, mode
             )
             right_words = util.clear_spelling_words(right_words)
     return len(right_words), clean_transcripts
@@ -36,14 +60,77 @@ def _compare_list_string(
     data_transcripts: list[str],
     words: list[str],
     transcripts: list[str],
+    mode: MatchMode = MatchMode.GREEDY,
 ) -> tuple[list[str], list[str]]:
-    right_words = []
-    for i, data_word in enumerate(data_words):
-        for k, data_transcript in enumerate(data_transcripts):
-            if data_transcript.lower() == data_word.lower():
-                right_words.append(words[i])
-                transcripts[k] = words[i]
-                data_transcripts[k] = ""
-                break
+    """
+    Match the expected words with the transcript, the matched transcript words
+    are replaced by the expected ones.
 
+    The greedy mode matches each word with its first unused occurrence in the
+    transcript, the aligned mode keeps the order of both lists (LCS).
+    """
+    word_keys = [data_word.lower() for data_word in data_words]
+    index: dict[str, collections.deque[int]] = collections.defaultdict(
+        collections.deque
+    )
+    for k, data_transcript in enumerate(data_transcripts):
+        index[data_transcript.lower()].append(k)
+
+    if mode == MatchMode.ALIGNED:
+        matches = _align(word_keys, index)
+    else:
+        matches = _match_greedy(word_keys, index)
+
+    right_words = []
+    for i, k in matches:
+        right_words.append(words[i])
+        transcripts[k] = words[i]
     return right_words, transcripts
+
+
+def _match_greedy(
+    word_keys: list[str], index: dict[str, collections.deque[int]]
+) -> list[tuple[int, int]]:
+    # Matched transcript words are blanked, so an empty word matches the first
+    # empty or already matched transcript word.
+    first_empty = index[""][0] if index[""] else None
+    matches = []
+    for i, key in enumerate(word_keys):
+        if key:
+            if not index[key]:
+                continue
+            k = index[key].popleft()
+        elif first_empty is None:
+            continue
+        else:
+            k = first_empty
+        matches.append((i, k))
+        if first_empty is None or k < first_empty:
+            first_empty = k
+    return matches
+
+
+def _align(
+    word_keys: list[str], index: dict[str, collections.deque[int]]
+) -> list[tuple[int, int]]:
+    # Hunt-Szymanski: thresholds[n] is the smallest transcript position ending a
+    # common subsequence of length n + 1.
+    thresholds: list[int] = []
+    last_matches: list[_Match] = []
+    for i, key in enumerate(word_keys):
+        for k in reversed(index.get(key, ())):
+            length = bisect.bisect_left(thresholds, k)
+            match = _Match(i, k, last_matches[length - 1] if length else None)
+            if length == len(thresholds):
+                thresholds.append(k)
+                last_matches.append(match)
+            else:
+                thresholds[length] = k
+                last_matches[length] = match
+
+    matches = []
+    node = last_matches[-1] if last_matches else None
+    while node:
+        matches.append((node.word, node.transcript))
+        node = node.previous
+    return matches[::-1]
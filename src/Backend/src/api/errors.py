@@ -291,3 +291,16 @@ class CantEditExam(BaseError):
             "message": "Can't edit exam after start date.",
             "code": "cant_edit_after_start_date",
         }
+
+
+class EmptyAudio(BaseError):
+    """
+    Error raised when no audio could be decoded from a file.
+    """
+
+    def __init__(self) -> None:
+        self.output = {
+            "status_code": 422,
+            "message": "The audio file has no decodable audio.",
+            "code": "empty_audio",
+        }
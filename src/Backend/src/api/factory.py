@@ -11,7 +11,9 @@ import injector
 from fastapi.middleware.cors import CORSMiddleware
 from firebase_admin import exceptions
 
-from api import errors, routers, sentry, tracing, typings
+from api import errors, ports, routers, sentry, tracing, typings
+from api.adapters import google, sere
+from api.helpers import audio, passwords
 
 from . import logging_config
 from .middleware import (
@@ -68,6 +70,24 @@ def create_app(container: injector.Injector) -> fastapi.FastAPI:
     app.add_exception_handler(exceptions.FirebaseError, handler=firebase_handler)
     app.add_exception_handler(Exception, handler=default_error_handler)
 
+    app.add_event_handler("shutdown", container.get(audio.AudioProcessor).shutdown)
+    app.add_event_handler("shutdown", container.get(passwords.PasswordHasher).shutdown)
+
+    async def close_analytical() -> None:
+        await container.get(ports.AnalyticalResult).close()
+
+    app.add_event_handler("shutdown", close_analytical)
+
+    async def close_sere() -> None:
+        await container.get(sere.SereApi).close()
+
+    app.add_event_handler("shutdown", close_sere)
+
+    async def close_id_token_verifier() -> None:
+        await container.get(google.IdTokenVerifier).close()
+
+    app.add_event_handler("shutdown", close_id_token_verifier)
+
     fastapi_pagination.add_pagination(app)
 
     fastapi_injector.attach_injector(app, container)
@@ -0,0 +1,113 @@
+"""
+Module with the executor where the audio processing runs.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import time
+import typing
+
+from opentelemetry import metrics
+
+from . import util
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+_queue_depth = meter.create_up_down_counter(
+    "audio.queue_depth",
+    description="Audio tasks waiting for a free slot.",
+)
+_wait_time = meter.create_histogram(
+    "audio.wait_time",
+    unit="s",
+    description="Time audio tasks waited for a free slot.",
+)
+_run_time = meter.create_histogram(
+    "audio.run_time",
+    unit="s",
+    description="Time audio tasks took to run.",
+)
+
+T = typing.TypeVar("T")
+
+
+class AudioProcessor:
+    """
+    Runs the ffmpeg work in a bounded pool, away from the event loop.
+
+    At most `max_concurrency` tasks are submitted to the pool at once, the
+    other ones wait on a semaphore and are reported as the queue depth.
+    """
+
+    def __init__(
+        self, max_workers: int, max_concurrency: int, use_processes: bool = False
+    ):
+        self._executor: concurrent.futures.Executor
+        if use_processes:
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers)
+        else:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers, thread_name_prefix="audio"
+            )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queued = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Amount of tasks waiting for a free slot.
+        """
+        return self._queued
+
+    async def convert(self, data: bytes, is_prod: bool) -> bytes:
+        """
+        Convert an audio to wav.
+        """
+        return await self._run(util.convert_audio, data, is_prod)
+
+    async def cut(self, data: bytes, start_time: float, end_time: float) -> bytes:
+        """
+        Cut portion of a wav audio.
+        """
+        return await self._run(util.cut_audio, data, start_time, end_time)
+
+    def shutdown(self) -> None:
+        """
+        Wait for the running tasks and release the pool.
+        """
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: typing.Callable[..., T], *args: typing.Any) -> T:
+        attributes = {"function": func.__name__}
+        queued_at = time.perf_counter()
+        self._queued += 1
+        _queue_depth.add(1, attributes)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+            _queue_depth.add(-1, attributes)
+        try:
+            started_at = time.perf_counter()
+            _wait_time.record(started_at - queued_at, attributes)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._executor, functools.partial(func, *args)
+            )
+            run_time = time.perf_counter() - started_at
+            _run_time.record(run_time, attributes)
+            logger.debug(
+                "Audio task finished.",
+                extra={
+                    **attributes,
+                    "wait_time": started_at - queued_at,
+                    "run_time": run_time,
+                    "queue_depth": self._queued,
+                },
+            )
+            return result
+        finally:
+            self._semaphore.release()
@@ -6,60 +6,36 @@ import datetime
 import logging
 import uuid
 
-import aiocache
 import fastapi
 import fastapi.security
 import fastapi_injector
 import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
 from fastapi.security import http as http_sec
-from google.auth.transport import requests
-from google.oauth2 import id_token
 
-from api import errors, ports
+from api import ports
+from api.adapters import google
 from api.typings import Settings
 
+from .key_material import ALGORITHM, KeyMaterial
 from .schemas import TokenData
+from .session_cache import SessionCache
 
 logger = logging.getLogger(__name__)
 
 
-@aiocache.cached(  # type: ignore[misc]
-    ttl=None,
-    namespace="public-key",
-)
-async def get_public_key(
-    secrets: ports.SecretManager,
-) -> ports.Secrets | None:
-    """
-    Returns the public key cached
-    """
-    return await secrets.read("public-key")
-
-
-@aiocache.cached(  # type: ignore[misc]
-    ttl=None,
-    namespace="private-key",
-)
-async def get_private_key(
-    secrets: ports.SecretManager,
-) -> ports.Secrets | None:
-    """
-    Returns the private key cached
-    """
-    return await secrets.read("private-key")
-
-
 auth_scheme = http_sec.HTTPBearer()
 
 
 def create_token(
     issued_at: datetime.datetime,
-    certificate: str,
+    certificate: rsa.RSAPrivateKey | str,
     subject: str,
     audience: str,
     scopes: set[str],
     duration: datetime.timedelta,
     generation: int = 0,
+    key_id: str | None = None,
 ) -> str:
     """
     Generates the token used by the app.
@@ -75,59 +51,57 @@ def create_token(
     return jwt.encode(
         payload=claims,
         key=certificate,
-        algorithm="RS512",
+        algorithm=ALGORITHM,
+        headers={"kid": key_id} if key_id else None,
     )
 
 
 async def validate_scheduler_token(
     token: http_sec.HTTPAuthorizationCredentials = fastapi.Depends(auth_scheme),
     settings: Settings = fastapi_injector.Injected(Settings),
+    verifier: google.IdTokenVerifier = fastapi_injector.Injected(
+        google.IdTokenVerifier
+    ),
 ) -> None:
     """
     Validate the cloud scheduler token.
     """
-    request = requests.Request()
-    try:
-        id_token.verify_oauth2_token(
-            id_token=token.credentials,
-            request=request,
-            audience=settings.get("project_id"),
-        )
-    except ValueError as exc:
-        raise errors.TokenExpired() from exc
+    await verifier.verify(token.credentials, audience=settings.get("project_id"))
 
 
-async def get_token(
+async def get_token(  # noqa: PLR0913
+    request: fastapi.Request,
     scopes: fastapi.security.SecurityScopes,
     token: http_sec.HTTPAuthorizationCredentials = fastapi.Depends(auth_scheme),
-    get_session_query: ports.GetSession = fastapi_injector.Injected(ports.GetSession),
+    get_principal: ports.GetPrincipal = fastapi_injector.Injected(ports.GetPrincipal),
+    session_cache: SessionCache = fastapi_injector.Injected(SessionCache),
     settings: Settings = fastapi_injector.Injected(Settings),
-    secrets: ports.SecretManager = fastapi_injector.Injected(ports.SecretManager),
+    keys: KeyMaterial = fastapi_injector.Injected(KeyMaterial),
 ) -> TokenData:
     """
     Get token data based on the token received.
+
+    The principal of the session is checked in the process cache first, then
+    kept in the request state for the session manager of the same request.
     """
     invalid_creds = fastapi.HTTPException(
         status_code=fastapi.status.HTTP_401_UNAUTHORIZED,
         detail="You don't have enough permission to do it.",
     )
-    public_key = await get_public_key(secrets)
-    creds = token.credentials
-    try:
-        decoded_token = jwt.decode(
-            creds,
-            key=public_key,
-            algorithms=["RS512"],
-            audience=settings.get("project_id"),
-        )
-    except jwt.PyJWTError as exc:
-        raise errors.TokenExpired() from exc
+    decoded_token = await keys.verify(token.credentials, settings.get("project_id"))
     token_data = TokenData.parse_obj(decoded_token)
     if scopes.scopes and not any(
         True for scope in scopes.scopes if scope in token_data.scopes
     ):
         raise invalid_creds
-    session_id = token_data.sub.split(":")[0]
-    if not await get_session_query(uuid.UUID(session_id)):
-        raise invalid_creds
+    session_id, _, generation = token_data.sub.partition(":")
+    session_uuid = uuid.UUID(session_id)
+    principal = session_cache.get(
+        session_uuid, int(generation) if generation.isdigit() else 0
+    )
+    if not principal:
+        if not (principal := await get_principal(session_uuid)):
+            raise invalid_creds
+        session_cache.set(principal)
+    request.state.principal = principal
     return token_data
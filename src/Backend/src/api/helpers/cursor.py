@@ -0,0 +1,35 @@
+"""
+Module with the continuation tokens of the keyset listings.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+import uuid
+
+from api import errors
+
+
+def encode(sort_value: datetime.datetime, item_id: uuid.UUID) -> str:
+    """
+    Opaque token pointing right after the item with these sort keys.
+    """
+    data = json.dumps([sort_value.isoformat(), str(item_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode(token: str) -> tuple[datetime.datetime, uuid.UUID] | None:
+    """
+    Sort keys of the token, None for an empty one, which starts the listing.
+
+    :raises errors.InvalidField: if the token wasn't made by `encode`.
+    """
+    if not token:
+        return None
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        sort_value, item_id = json.loads(data)
+        return datetime.datetime.fromisoformat(sort_value), uuid.UUID(item_id)
+    except (binascii.Error, ValueError, TypeError, AttributeError) as exc:
+        raise errors.InvalidField("cursor") from exc
@@ -0,0 +1,138 @@
+"""
+Module containing the parsed keys of the app tokens.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import typing
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from api import errors, ports
+
+logger = logging.getLogger(__name__)
+
+ALGORITHM = "RS512"
+MAX_KEYS = 3
+MIN_FORCED_REFRESH = 60.0
+
+
+def key_id(public_key: rsa.RSAPublicKey) -> str:
+    """
+    Id of the key, from the sha256 of its DER encoding.
+    """
+    der = public_key.public_bytes(
+        serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return hashlib.sha256(der).hexdigest()[:16]
+
+
+def _load_keys(
+    public_pem: ports.Secrets | None, private_pem: ports.Secrets | None
+) -> tuple[rsa.RSAPublicKey, rsa.RSAPrivateKey]:
+    """
+    Parse the PEM keys read from the secret manager.
+    """
+    if not public_pem or not private_pem:
+        raise ValueError("The token keys are missing.")
+    public_key = serialization.load_pem_public_key(public_pem.encode())
+    private_key = serialization.load_pem_private_key(private_pem.encode(), None)
+    if not isinstance(public_key, rsa.RSAPublicKey) or not isinstance(
+        private_key, rsa.RSAPrivateKey
+    ):
+        raise ValueError("The token keys must be RSA keys.")
+    return public_key, private_key
+
+
+class KeyMaterial:
+    """
+    Signing and verification keys of the app tokens, parsed once.
+
+    The keys are read again every `refresh_interval` seconds, or when a token
+    signed by an unknown key id is checked. The verification keys replaced by
+    a rotation are kept, so the tokens signed before it stay valid.
+    """
+
+    def __init__(
+        self, secrets: ports.SecretManager, refresh_interval: float = 3600.0
+    ) -> None:
+        self._secrets = secrets
+        self.refresh_interval = refresh_interval
+        self._lock = asyncio.Lock()
+        self._loaded_at: float | None = None
+        self._kid = ""
+        self._private_key: rsa.RSAPrivateKey | None = None
+        self._public_keys: dict[str, rsa.RSAPublicKey] = {}
+
+    def _is_fresh(self, max_age: float) -> bool:
+        return (
+            self._loaded_at is not None and time.monotonic() - self._loaded_at < max_age
+        )
+
+    async def _refresh(self, max_age: float) -> None:
+        """
+        Read and parse the keys when they are older than `max_age` seconds.
+
+        When a refresh fails the current keys are kept until the next one.
+        """
+        if self._is_fresh(max_age):
+            return
+        async with self._lock:
+            if self._is_fresh(max_age):
+                return
+            try:
+                public_key, private_key = _load_keys(
+                    await self._secrets.read("public-key"),
+                    await self._secrets.read("private-key"),
+                )
+            except ValueError:
+                if not self._private_key:
+                    raise
+                logger.exception("Could not refresh the token keys.")
+            else:
+                self._kid = key_id(public_key)
+                self._private_key = private_key
+                self._public_keys.pop(self._kid, None)
+                self._public_keys[self._kid] = public_key
+                while len(self._public_keys) > MAX_KEYS:
+                    del self._public_keys[next(iter(self._public_keys))]
+            self._loaded_at = time.monotonic()
+
+    async def signing_key(self) -> tuple[str, rsa.RSAPrivateKey]:
+        """
+        Get the id and the private key to sign the tokens with.
+        """
+        await self._refresh(self.refresh_interval)
+        if not self._private_key:
+            raise ValueError("The token keys are missing.")
+        return self._kid, self._private_key
+
+    async def verify(self, token: str, audience: str | None) -> dict[str, typing.Any]:
+        """
+        Verify the token and return its claims.
+
+        Tokens without a key id were signed before the ids were added, so they
+        are checked with the current key.
+
+        :raises errors.TokenExpired: if the token is invalid or expired.
+        """
+        await self._refresh(self.refresh_interval)
+        try:
+            kid = jwt.get_unverified_header(token).get("kid") or self._kid
+        except jwt.PyJWTError as exc:
+            raise errors.TokenExpired() from exc
+        if kid not in self._public_keys:
+            await self._refresh(MIN_FORCED_REFRESH)
+        if not (public_key := self._public_keys.get(kid)):
+            raise errors.TokenExpired()
+        try:
+            claims: dict[str, typing.Any] = jwt.decode(
+                token, key=public_key, algorithms=[ALGORITHM], audience=audience
+            )
+        except jwt.PyJWTError as exc:
+            raise errors.TokenExpired() from exc
+        return claims
@@ -0,0 +1,137 @@
+"""
+Module with the executors where the password hashing runs.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import time
+import typing
+
+from opentelemetry import metrics
+from passlib import context
+
+from api import models
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+_run_time = meter.create_histogram(
+    "password.run_time",
+    unit="s",
+    description="Time password hashing tasks took, waiting included.",
+)
+
+BULK_CHUNK_SIZE = 32
+
+T = typing.TypeVar("T")
+
+
+@functools.cache
+def _context(config: str) -> context.CryptContext:
+    """
+    Context of a pool process, built once from its serialized config.
+    """
+    return context.CryptContext.from_string(config)
+
+
+def _hash_chunk(config: str, passwords: list[str]) -> list[str]:
+    """
+    Hash the passwords in a pool process.
+    """
+    hash_ctx = _context(config)
+    return [hash_ctx.hash(password) for password in passwords]
+
+
+class PasswordHasher:
+    """
+    Runs the bcrypt work away from the event loop.
+
+    Single checks and hashes run in a bounded thread pool. Bulk imports hash
+    in a process pool, created on first use, so they don't take the threads
+    the logins need.
+    """
+
+    def __init__(
+        self,
+        hash_ctx: context.CryptContext,
+        max_workers: int = 4,
+        bulk_workers: int | None = None,
+    ):
+        self._hash_ctx = hash_ctx
+        self._config = hash_ctx.to_string()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers, thread_name_prefix="password"
+        )
+        self._bulk_workers = bulk_workers
+        self._bulk_executor: concurrent.futures.ProcessPoolExecutor | None = None
+
+    async def check(self, user: models.User, password: str) -> bool:
+        """
+        Check the password of the user, upgrading a deprecated hash.
+
+        :param user: user with the stored hash.
+        :param password: password to be checked.
+        :return: True if the password is valid, False otherwise.
+        """
+        if not user.password:
+            return False
+        valid, new_hash = await self._run(
+            "check", self._hash_ctx.verify_and_update, password, user.password
+        )
+        if valid and new_hash:
+            user.set_password_hash(new_hash)
+        return bool(valid)
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash the password.
+        """
+        return await self._run("hash", self._hash_ctx.hash, password)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """
+        Hash the passwords in parallel processes, keeping their order.
+        """
+        if not passwords:
+            return []
+        if not self._bulk_executor:
+            self._bulk_executor = concurrent.futures.ProcessPoolExecutor(
+                self._bulk_workers
+            )
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._bulk_executor,
+                    _hash_chunk,
+                    self._config,
+                    passwords[start : start + BULK_CHUNK_SIZE],
+                )
+                for start in range(0, len(passwords), BULK_CHUNK_SIZE)
+            )
+        )
+        _run_time.record(time.perf_counter() - started_at, {"function": "hash_many"})
+        return [password_hash for chunk in chunks for password_hash in chunk]
+
+    def shutdown(self) -> None:
+        """
+        Wait for the running tasks and release the pools.
+        """
+        self._executor.shutdown(wait=True)
+        if self._bulk_executor:
+            self._bulk_executor.shutdown(wait=True)
+
+    async def _run(
+        self, name: str, func: typing.Callable[..., T], *args: typing.Any
+    ) -> T:
+        started_at = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args)
+            )
+        finally:
+            _run_time.record(time.perf_counter() - started_at, {"function": name})
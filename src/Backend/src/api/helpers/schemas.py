@@ -43,6 +43,13 @@ class ListSchema(pydantic.BaseModel):
     page_size: int = pydantic.Field(10, ge=-1, le=100)
     page: int = pydantic.Field(1, ge=1, le=1000)
     q: str | None = None
+    cursor: str | None = pydantic.Field(
+        None,
+        description=(
+            "Continuation token of a cursor listing, send it empty to start one. "
+            "Cursor pages aren't counted and ignore the page."
+        ),
+    )
 
     @pydantic.validator("q")
     @classmethod
@@ -0,0 +1,75 @@
+"""
+Module containing the process cache of the principals checked by the tokens.
+"""
+
+import collections
+import threading
+import time
+import uuid
+
+from api import typings
+
+from .util import time_now
+
+
+class SessionCache:
+    """
+    Principals by session id, kept for `ttl` seconds.
+
+    An entry is dropped when the session expires, when it is invalidated and
+    when a token of a newer generation than the cached one is checked.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_size: int = 10000) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[
+            uuid.UUID, tuple[float, typings.Principal]
+        ] = collections.OrderedDict()
+
+    def get(
+        self, session_id: uuid.UUID, generation: int = 0
+    ) -> typings.Principal | None:
+        """
+        Get the cached principal, None when missing or stale.
+        """
+        with self._lock:
+            if not (entry := self._entries.get(session_id)):
+                return None
+            cached_at, principal = entry
+            if (
+                time.monotonic() - cached_at > self.ttl
+                or principal.expires_at <= time_now()
+                or generation > principal.generation
+            ):
+                del self._entries[session_id]
+                return None
+            self._entries.move_to_end(session_id)
+            return principal
+
+    def set(self, principal: typings.Principal) -> None:
+        """
+        Cache the principal.
+        """
+        with self._lock:
+            self._entries[principal.session_id] = (time.monotonic(), principal)
+            self._entries.move_to_end(principal.session_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, session_id: uuid.UUID) -> None:
+        """
+        Drop the session, after a refresh or a logout.
+        """
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """
+        Drop every session of the user, after it is deleted.
+        """
+        with self._lock:
+            for session_id, (_, principal) in list(self._entries.items()):
+                if principal.user_id == user_id:
+                    del self._entries[session_id]
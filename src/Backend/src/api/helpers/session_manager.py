@@ -4,7 +4,7 @@ Module containing the session manager.
 
 import uuid
 
-from api import errors, models, ports
+from api import errors, models, ports, typings
 
 from . import schemas
 
@@ -16,26 +16,46 @@ class SessionManager:
 
     token_data: schemas.TokenData
     get_session_query: ports.GetSession
+    get_principal_query: ports.GetPrincipal
     session: models.Session | None
+    principal: typings.Principal | None
 
     def __init__(
         self,
         token_data: schemas.TokenData,
         get_session_query: ports.GetSession,
-        session: models.Session | None = None,
+        get_principal_query: ports.GetPrincipal,
+        principal: typings.Principal | None = None,
     ) -> None:
         self.token_data = token_data
         self.get_session_query = get_session_query
-        self.session = session
+        self.get_principal_query = get_principal_query
+        self.session = None
+        self.principal = principal
+
+    @property
+    def session_id(self) -> uuid.UUID:
+        """
+        Id of the session of the token.
+        """
+        return uuid.UUID(self.token_data.sub.split(":")[0])
 
     async def get_current_session(self) -> models.Session:
         """
         Get session from database.
         """
         if not self.session:
-            session_id = self.token_data.sub.split(":")[0]
-            session_uuid = uuid.UUID(session_id)
-            self.session = await self.get_session_query(session_uuid)
+            self.session = await self.get_session_query(self.session_id)
             if not self.session:
                 raise errors.TokenExpired()
         return self.session
+
+    async def get_principal(self) -> typings.Principal:
+        """
+        Get the authorization data of the session, loaded in a single query.
+        """
+        if not self.principal:
+            self.principal = await self.get_principal_query(self.session_id)
+            if not self.principal:
+                raise errors.TokenExpired()
+        return self.principal
@@ -2,14 +2,22 @@
 Module for utility functions.
 """
 
+import contextlib
 import datetime
 import json
 import math
+import struct
+import tempfile
 import typing
 import uuid
 
 import ffmpeg
 
+from api import errors
+
+# Sizes ffmpeg writes in the wav header when the output is a pipe.
+_UNKNOWN_SIZES = {0, 0xFFFFFFFF}
+
 
 def time_now() -> datetime.datetime:
     """
@@ -25,22 +33,91 @@ def time_now_as_ts() -> int:
     return int(time_now().timestamp() * 1000)
 
 
-def convert_audio(path: str, output_name: str, is_prod: bool) -> None:
+def convert_audio(data: bytes, is_prod: bool) -> bytes:
     """
-    Convert the type from one audio to another.
+    Convert an audio to wav with ffmpeg.
+
+    MP4 containers can keep their index at the end of the file, so they are
+    read from a seekable temporary file, the other formats are piped.
+
+    :raises errors.EmptyAudio: if no audio could be decoded.
     """
-    ffmpeg.input(path).output(output_name).run(overwrite_output=True, quiet=is_prod)
+    with contextlib.ExitStack() as stack:
+        source: str = "pipe:"
+        stdin: bytes | None = data
+        if data[4:8] == b"ftyp":
+            file = stack.enter_context(tempfile.NamedTemporaryFile(suffix=".mp4"))
+            file.write(data)
+            file.flush()
+            source, stdin = file.name, None
+        output, _ = (
+            ffmpeg.input(source)
+            .output("pipe:", format="wav")
+            .run(input=stdin, capture_stdout=True, capture_stderr=is_prod)
+        )
+    audio = fix_wav_header(bytearray(output))
+    if not get_file_metadata(audio).get("duration"):
+        raise errors.EmptyAudio()
+    return audio
 
 
-def get_file_metadata(path: str) -> dict[str, typing.Any]:
+def cut_audio(data: bytes, start_time: float, end_time: float) -> bytes:
     """
-    Function to get file metadata.
+    Cut portion of a wav audio, piping it through ffmpeg.
     """
-    response = ffmpeg.probe(path)
-    metadata: dict[str, typing.Any] = response.get("streams", [{}])[0]
-    metadata["duration"] = int(
-        math.ceil(float(response.get("format").get("duration", 61)))
+    output, _ = (
+        ffmpeg.input("pipe:")
+        .output("pipe:", format="wav", ss=start_time, to=end_time)
+        .run(input=data, capture_stdout=True, capture_stderr=True)
     )
+    return fix_wav_header(bytearray(output))
+
+
+def _wav_chunks(data: bytes) -> typing.Iterator[tuple[bytes, int, int]]:
+    """
+    Iterate over the chunks of a wav file as (id, offset, size).
+    """
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id, size = struct.unpack_from("<4sI", data, offset)
+        yield chunk_id, offset, size
+        offset += 8 + size + size % 2
+
+
+def fix_wav_header(audio: bytearray) -> bytearray:
+    """
+    Fill in, in place, the sizes ffmpeg can't write when the wav output is a pipe.
+    """
+    for chunk_id, offset, _ in _wav_chunks(audio):
+        if chunk_id == b"data":
+            struct.pack_into("<I", audio, 4, len(audio) - 8)
+            struct.pack_into("<I", audio, offset + 4, len(audio) - offset - 8)
+            break
+    return audio
+
+
+def get_file_metadata(data: bytes) -> dict[str, typing.Any]:
+    """
+    Function to get the metadata from the header of a wav file.
+    """
+    metadata: dict[str, typing.Any] = {}
+    byte_rate = 0
+    for chunk_id, offset, size in _wav_chunks(data):
+        if chunk_id == b"fmt ":
+            _, channels, sample_rate, byte_rate = struct.unpack_from(
+                "<HHII", data, offset + 8
+            )
+            metadata["channels"] = channels
+            metadata["sample_rate"] = str(sample_rate)
+        elif chunk_id == b"data":
+            if byte_rate:
+                data_size = len(data) - offset - 8
+                if size not in _UNKNOWN_SIZES:
+                    data_size = min(size, data_size)
+                metadata["duration"] = int(math.ceil(data_size / byte_rate))
+            break
     return metadata
 
 
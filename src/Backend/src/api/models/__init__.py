@@ -15,6 +15,7 @@ from .groups import Grades, Group, Shifts
 from .organizations import Organization
 from .roles import Role
 from .sessions import Session
+from .sync import SyncEntity, SyncRun, SyncState
 from .users import User, UserGroup, UserOrganization, UserType
 
 __all__ = (
@@ -29,6 +30,9 @@ __all__ = (
     "Role",
     "Session",
     "Shifts",
+    "SyncEntity",
+    "SyncRun",
+    "SyncState",
     "User",
     "ExamUserQuestion",
     "UserGroup",
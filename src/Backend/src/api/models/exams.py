@@ -124,6 +124,8 @@ class Exam(db.Base, db.DefaultColumns):
 
     __tablename__ = "exams"
 
+    __table_args__ = (sa.Index("ix_exams_start_date_id", "start_date", "id"),)
+
     name: Mapped[db.Str50]
 
     start_date: Mapped[db.DateTime]
@@ -134,8 +136,9 @@ class Exam(db.Base, db.DefaultColumns):
 
     questions: Mapped[list[Question]] = relationship(
         Question,
-        lazy="joined",
+        lazy="raise",
         cascade="all, delete-orphan, save-update",
+        passive_deletes=True,
         order_by=Question.order.asc(),
     )
 
@@ -149,6 +152,14 @@ class ExamUserQuestion(db.Base, db.DefaultColumns):
 
     __table_args__ = (
         sa.UniqueConstraint("user_id", "exam_id", "question_id", name="ueq_uc"),
+        sa.Index("ix_euq_exam_id_user_id_status", "exam_id", "user_id", "status"),
+        sa.Index("ix_euq_group_id_exam_id", "group_id", "exam_id"),
+        sa.Index(
+            "ix_euq_pending",
+            "user_id",
+            "exam_id",
+            postgresql_where=sa.text("status <> 'FINISHED'"),
+        ),
     )
 
     user_id: Mapped[db.UuidDefault]
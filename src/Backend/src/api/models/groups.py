@@ -51,6 +51,15 @@ class Group(db.Base, db.DefaultColumns):
 
     __tablename__ = "groups"
 
+    __table_args__ = (
+        sa.Index("ix_groups_updated_at_id", "updated_at", "id"),
+        sa.Index(
+            "ix_groups_customer_id",
+            "customer_id",
+            postgresql_where=sa.text("customer_id IS NOT NULL"),
+        ),
+    )
+
     name: Mapped[db.Str50]
 
     customer_id: Mapped[str | None] = mapped_column(sa.String(100), nullable=True)
@@ -15,6 +15,15 @@ class Organization(db.Base, db.DefaultColumns):
 
     __tablename__ = "organizations"
 
+    __table_args__ = (
+        sa.Index("ix_organizations_updated_at_id", "updated_at", "id"),
+        sa.Index(
+            "ix_organizations_customer_id",
+            "customer_id",
+            postgresql_where=sa.text("customer_id IS NOT NULL"),
+        ),
+    )
+
     customer_id: Mapped[str | None] = mapped_column(sa.String(100), nullable=True)
 
     name: Mapped[db.Str50]
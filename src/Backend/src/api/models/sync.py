@@ -0,0 +1,54 @@
+"""
+Module for the models of the SERE sync state.
+"""
+
+import enum
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as psql
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api import db
+from api.helpers import time_now
+
+
+class SyncEntity(enum.StrEnum):
+    """
+    Synced entities, in the order they are synced.
+    """
+
+    ORGANIZATION = "organization"
+    GROUP = "group"
+    STUDENT = "student"
+    PROFESSOR = "professor"
+
+
+class SyncState(db.Base):
+    """
+    Hash of the content last synced for an entity.
+    """
+
+    __tablename__ = "sync_states"
+
+    entity: Mapped[SyncEntity] = mapped_column(
+        psql.ENUM(SyncEntity, name="sync_entities"), primary_key=True
+    )
+    customer_id: Mapped[str] = mapped_column(sa.String(100), primary_key=True)
+    content_hash: Mapped[str] = mapped_column(sa.String(64))
+    updated_at: Mapped[db.DateTime] = mapped_column(
+        init=False, default_factory=time_now, onupdate=time_now
+    )
+
+
+class SyncRun(db.Base, db.DefaultColumns):
+    """
+    Checkpoint of a sync run, the last page committed for the phase.
+    """
+
+    __tablename__ = "sync_runs"
+
+    phase: Mapped[SyncEntity] = mapped_column(
+        psql.ENUM(SyncEntity, name="sync_entities")
+    )
+    page: Mapped[int] = mapped_column(sa.Integer, default=0)
+    finished: Mapped[bool] = mapped_column(sa.Boolean, default=False)
@@ -8,7 +8,6 @@ import datetime
 import enum
 
 import sqlalchemy as sa
-from passlib import context
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from api import db
@@ -83,11 +82,15 @@ class User(db.Base, db.DefaultColumns):
 
     __tablename__ = "users"
 
+    __table_args__ = (sa.Index("ix_users_updated_at_id", "updated_at", "id"),)
+
     external_id: Mapped[db.Str100 | None] = mapped_column(
         sa.String(100), unique=True, nullable=True
     )
 
-    customer_id: Mapped[str | None] = mapped_column(sa.String(100), nullable=True)
+    customer_id: Mapped[str | None] = mapped_column(
+        sa.String(100), nullable=True, unique=True
+    )
 
     type: Mapped[UserType]
 
@@ -142,20 +145,8 @@ class User(db.Base, db.DefaultColumns):
         """
         return self._password
 
-    def check_password(self, password: str, hash_ctx: context.CryptContext) -> bool:
-        """
-        Check if the password is valid.
-
-        :param password: Password to be checked.
-        :return: True if the password is valid, False otherwise.
-        """
-        valid, new_password = hash_ctx.verify_and_update(password, self.password)
-        if valid and new_password:
-            self._password = new_password
-        return valid
-
-    def set_password(self, password: str, hash_ctx: context.CryptContext) -> None:
+    def set_password_hash(self, password_hash: str) -> None:
         """
-        Set the password through hashing.
+        Set the password hash, computed by the password hasher.
         """
-        self._password = hash_ctx.hash(password)
+        self._password = password_hash
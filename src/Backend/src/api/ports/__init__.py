@@ -7,6 +7,7 @@ from .auth import ExternalAuth
 from .dashboard import Dashboard
 from .data_sync import DataSyncApi
 from .exam import (
+    ActiveExamCatalog,
     ExamRepository,
     GetExam,
     GetExamUserStatus,
@@ -37,9 +38,10 @@ from .organization import (
 from .result import ResultRepository
 from .role import GetRole, GetRoleByName, ListRoles, RoleRepository
 from .secret_manager import SecretManager, Secrets
-from .session_query import GetSession, SessionRepository
+from .session_query import GetPrincipal, GetSession, SessionRepository
 from .speech import SpeechToText
 from .storage import Storage
+from .sync import SyncRepository
 from .unit_of_work import UnitOfWork, UnitOfWorkBuilder
 from .user import (
     CheckUserOnGroup,
@@ -51,6 +53,7 @@ from .user import (
 )
 
 __all__ = (
+    "ActiveExamCatalog",
     "AnalyticalResult",
     "CheckGroupOnOrg",
     "CheckUserOnGroup",
@@ -66,6 +69,7 @@ __all__ = (
     "GetPendingQuestion",
     "GetRoleByName",
     "GetRole",
+    "GetPrincipal",
     "GetSession",
     "GetUser",
     "GroupRepository",
@@ -89,6 +93,7 @@ __all__ = (
     "RoleRepository",
     "SpeechToText",
     "Storage",
+    "SyncRepository",
     "SecretManager",
     "Secrets",
     "UnitOfWork",
@@ -15,11 +15,17 @@ class AnalyticalResult(abc.ABC):
     """
 
     @abc.abstractmethod
-    async def save(self, result: Result) -> typing.Sequence[dict[str, typing.Any]]:
+    async def save(self, result: Result) -> None:
         """
         Save result data to analytical database.
         """
 
+    @abc.abstractmethod
+    async def close(self) -> None:
+        """
+        Save everything still pending before shutting down.
+        """
+
     @abc.abstractmethod
     async def get_student_results(
         self,
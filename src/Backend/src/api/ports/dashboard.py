@@ -7,7 +7,7 @@ import typing
 
 from starlette import datastructures
 
-from api import models
+from api import typings
 
 
 class Dashboard(abc.ABC):
@@ -18,7 +18,7 @@ class Dashboard(abc.ABC):
     @abc.abstractmethod
     async def get_signed_url(
         self,
-        user: models.User,
+        user: typings.Principal,
         query: datastructures.QueryParams,
     ) -> str:
         """
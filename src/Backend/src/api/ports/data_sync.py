@@ -29,6 +29,39 @@ class DataSyncApi(abc.ABC):
         :returns: list of dictionary.
         """
 
+    @abc.abstractmethod
+    def iter_organization_pages(
+        self, start: int = 1
+    ) -> typing.AsyncIterator[tuple[int, list[dict[str, typing.Any]]]]:
+        """
+        Method to iterate over the organizations to be synced, one page at a time.
+
+        :param start: index of the first page.
+        :returns: async iterator of the page index and its list of dictionary.
+        """
+
+    @abc.abstractmethod
+    def iter_group_pages(
+        self, start: int = 1
+    ) -> typing.AsyncIterator[tuple[int, list[dict[str, typing.Any]]]]:
+        """
+        Method to iterate over the groups to be synced, one page at a time.
+
+        :param start: index of the first page.
+        :returns: async iterator of the page index and its list of dictionary.
+        """
+
+    @abc.abstractmethod
+    def iter_professor_pages(
+        self, start: int = 1
+    ) -> typing.AsyncIterator[tuple[int, list[dict[str, typing.Any]]]]:
+        """
+        Method to iterate over the professors to be synced, one page at a time.
+
+        :param start: index of the first page.
+        :returns: async iterator of the page index and its list of dictionary.
+        """
+
     @abc.abstractmethod
     async def list_student(self) -> list[dict[str, typing.Any]]:
         """
@@ -46,6 +79,17 @@ class DataSyncApi(abc.ABC):
         """
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def iter_student_pages(
+        self, start: int = 1
+    ) -> typing.AsyncIterator[tuple[int, typing.Any]]:
+        """
+        Method to iterate over the students to be synced, one page at a time.
+
+        :param start: index of the first page.
+        :returns: async iterator of the page index and its list of dictionary.
+        """
+
     @abc.abstractmethod
     async def list_professor(self) -> list[dict[str, typing.Any]]:
         """
@@ -53,3 +97,9 @@ class DataSyncApi(abc.ABC):
 
         :returns: list of dictionary.
         """
+
+    @abc.abstractmethod
+    async def close(self) -> None:
+        """
+        Method to release the connections of the api.
+        """
@@ -88,6 +88,7 @@ class ListExams(abc.ABC):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.Exam], typings.PaginationMetadata]:
         """
         Method to list all exams.
@@ -106,6 +107,7 @@ class ListPendingExams(abc.ABC):
         group_id: uuid.UUID,
         page_size: int = 10,
         page: int = 1,
+        cursor: str | None = None,
     ) -> tuple[
         list[tuple[models.Exam, models.ExamStatus | None]], typings.PaginationMetadata
     ]:
@@ -228,3 +230,32 @@ class GetExamUserStatus(abc.ABC):
         """
         Method to get a pending question.
         """
+
+
+class ActiveExamCatalog(abc.ABC):
+    """
+    Catalog of the exams running for each grade.
+    """
+
+    @abc.abstractmethod
+    async def running(self, group_id: uuid.UUID) -> list[typings.ActiveExam]:
+        """
+        Exams running now for the grade of the group.
+
+        :param group_id: the group identifier.
+        """
+
+    async def is_running(self, group_id: uuid.UUID, exam_id: uuid.UUID) -> bool:
+        """
+        Whether the exam is running now for the grade of the group.
+
+        :param group_id: the group identifier.
+        :param exam_id: the exam identifier.
+        """
+        return any(exam.id == exam_id for exam in await self.running(group_id))
+
+    @abc.abstractmethod
+    def invalidate(self) -> None:
+        """
+        Forget the cached exams and grades, after an exam or group changed.
+        """
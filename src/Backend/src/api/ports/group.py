@@ -46,13 +46,16 @@ class GroupRepository(abc.ABC):
         sync_group: typings.CreateOrUpdateGroup,
         org_customer_id: str,
         updated_orgs: dict[str, models.Organization],
-        cached_groups: list[models.Group],
+        cached_groups: dict[str, models.Group],
     ) -> models.Group | None:
         """
         Method to create or update a list of group filtering by customer id.
 
         :param sync_group: group to insert or update.
         :param org_customer_id: org customer id search.
+        :param updated_orgs: organizations indexed by customer id, the group is
+            skipped when its organization is not in it.
+        :param cached_groups: groups indexed by customer id, new groups are added.
         """
 
     @abc.abstractmethod
@@ -97,6 +100,7 @@ class ListGroups(abc.ABC):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.Group], typings.PaginationMetadata]:
         """
         Method to list all groups.
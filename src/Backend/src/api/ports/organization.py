@@ -46,12 +46,13 @@ class OrganizationRepository(abc.ABC):
     async def create_or_update(
         self,
         sync_org: typings.CreateOrUpdateOrganization,
-        cached_orgs: list[models.Organization],
+        cached_orgs: dict[str, models.Organization],
     ) -> models.Organization:
         """
         Method to create or update a list of organization filtering by customer id.
 
         :param sync_org: sync_org to insert or update.
+        :param cached_orgs: organizations indexed by customer id, new ones are added.
         """
 
     @abc.abstractmethod
@@ -95,6 +96,7 @@ class ListOrganizations(abc.ABC):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.Organization], typings.PaginationMetadata]:
         """
         Method to list all orgs.
@@ -5,7 +5,7 @@ Module related to the port of result repository.
 import abc
 import uuid
 
-from api import models
+from api import models, typings
 
 
 class ResultRepository(abc.ABC):
@@ -22,6 +22,19 @@ class ResultRepository(abc.ABC):
         Returns the model data.
         """
 
+    @abc.abstractmethod
+    async def get_scoring_context(
+        self,
+        result_id: uuid.UUID,
+    ) -> typings.ScoringContext:
+        """
+        Returns the answer with what scoring it needs.
+
+        :param result_id: result id on database.
+
+        :raises errors.NotFound: if the result doesn't exist.
+        """
+
     @abc.abstractmethod
     async def create(
         self,
@@ -7,7 +7,7 @@ from __future__ import annotations
 import abc
 import uuid
 
-from api import models
+from api import models, typings
 
 
 class SessionRepository(abc.ABC):
@@ -60,3 +60,19 @@ class GetSession(abc.ABC):
 
         :returns: session model.
         """
+
+
+class GetPrincipal(abc.ABC):
+    """
+    Get the authorization data of a session in a single query.
+    """
+
+    @abc.abstractmethod
+    async def __call__(self, session_id: uuid.UUID) -> typings.Principal | None:
+        """
+        Method to get the principal of the session.
+
+        :param session_id: the id for the session.
+
+        :returns: the principal, None when there's no such session.
+        """
@@ -17,7 +17,9 @@ class Storage(abc.ABC):
         """
 
     @abc.abstractmethod
-    async def upload_by_text(self, path: str, text: bytes) -> str:
+    async def upload_by_text(
+        self, path: str, text: bytes, content_type: str = "text/plain"
+    ) -> str:
         """
         Method that uploads a file by bytes.
         """
@@ -28,6 +30,12 @@ class Storage(abc.ABC):
         Method that downloads a file.
         """
 
+    @abc.abstractmethod
+    async def download_bytes(self, uri: str) -> bytes:
+        """
+        Method that downloads a file to memory.
+        """
+
     @abc.abstractmethod
     async def generate_signed_url(
         self, path: str, mimetype: str, method: str = "PUT"
@@ -0,0 +1,53 @@
+"""
+Module related to the port of the sync state repository.
+"""
+
+import abc
+import datetime
+
+from api import models
+
+
+class SyncRepository(abc.ABC):
+    """
+    Repository of the content hashes and checkpoints of the SERE sync.
+    """
+
+    @abc.abstractmethod
+    async def list_hashes(
+        self, entity: models.SyncEntity, customer_ids: list[str]
+    ) -> dict[str, str]:
+        """
+        Method to get the content hashes last synced.
+
+        :param entity: the synced entity.
+        :param customer_ids: customer ids to filter.
+        :returns: the content hashes indexed by customer id.
+        """
+
+    @abc.abstractmethod
+    async def save_hashes(
+        self, entity: models.SyncEntity, hashes: dict[str, str]
+    ) -> None:
+        """
+        Method to create or update the content hashes.
+
+        :param entity: the synced entity.
+        :param hashes: the content hashes indexed by customer id.
+        """
+
+    @abc.abstractmethod
+    async def get_unfinished_run(
+        self, since: datetime.datetime
+    ) -> models.SyncRun | None:
+        """
+        Method to get the last unfinished run, to resume it.
+
+        :param since: ignore the runs started before it.
+        """
+
+    @abc.abstractmethod
+    async def create_run(self) -> models.SyncRun:
+        """
+        Method to start a run from its first phase.
+        """
@@ -13,7 +13,7 @@ from sqlalchemy.ext import asyncio as sqlalchemy_aio
 
 from api import db
 
-from . import exam, group, organization, result, role, session_query, user
+from . import exam, group, organization, result, role, session_query, sync, user
 
 
 # pylint: disable=too-few-public-methods
@@ -49,6 +49,7 @@ class UnitOfWork(abc.ABC):
     role_repository: role.RoleRepository
     question_repository: exam.QuestionRepository
     result_repository: result.ResultRepository
+    sync_repository: sync.SyncRepository
     closed: bool
     _session: sqlalchemy_aio.AsyncSession
     committed: bool
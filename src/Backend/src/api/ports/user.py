@@ -46,18 +46,19 @@ class UserRepository(abc.ABC):
         """
 
     @abc.abstractmethod
-    async def create_or_update_student(
+    async def bulk_create_or_update_students(
         self,
-        student: typings.CreateOrUpdateUser,
-        group_customer_id: str,
+        students: list[tuple[typings.CreateOrUpdateUser, str]],
         updated_groups: dict[str, models.Group],
-        cached_users: list[models.User],
-    ) -> models.User | None:
+    ) -> int:
         """
-        Method to create or update a list of student filtering by customer id.
+        Method to create or update students in bulk, by customer id.
+        The groups and organizations of each student are replaced.
 
-        :param student: student to insert or update.
-        :param group_customer_id: group customer id to filter.
+        :param students: students to insert or update and their group customer id.
+        :param updated_groups: groups indexed by customer id.
+
+        :returns: amount of students written.
         """
 
     @abc.abstractmethod
@@ -68,7 +69,7 @@ class UserRepository(abc.ABC):
         organizations_customer_id: list[str],
         updated_organizations: dict[str, models.Organization],
         updated_groups: dict[str, models.Group],
-        cached_profs: list[models.User],
+        cached_profs: dict[str, models.User],
     ) -> models.User | None:
         """
         Method to create or update a list of professor
@@ -76,6 +77,9 @@ class UserRepository(abc.ABC):
 
         :param professor: professor to insert or update.
         :param group_customer_id: group customer id to filter.
+        :param updated_organizations: organizations indexed by customer id.
+        :param updated_groups: groups indexed by customer id.
+        :param cached_profs: professors indexed by customer id, new ones are added.
         """
 
     @abc.abstractmethod
@@ -105,6 +109,7 @@ class ListUsers(abc.ABC):
         page_size: int = 10,
         page: int = 1,
         query: str | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[models.User], typings.PaginationMetadata]:
         """
         Method to list all users.
@@ -126,7 +131,8 @@ class ListUsersWithExams(abc.ABC):
         show_finished: bool = True,
         page_size: int = 10,
         page: int = 1,
-    ) -> tuple[list[dict], typings.PaginationMetadata]:  # type:ignore[type-arg]
+        cursor: str | None = None,
+    ) -> tuple[list[typings.UserWithExams], typings.PaginationMetadata]:
         """
         Method to list all users with exams.
         """
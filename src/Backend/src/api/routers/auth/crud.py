@@ -8,10 +8,8 @@ import logging
 import secrets
 import uuid
 
-from passlib import context
-
 from api import errors, models, ports
-from api.helpers import auth, time_now
+from api.helpers import auth, key_material, passwords, time_now
 from api.helpers import schemas as helper_schema
 from api.typings import Settings
 
@@ -25,7 +23,7 @@ REFRESH_DURATION = datetime.timedelta(days=1)
 
 
 async def create_session(
-    secret_manager: ports.SecretManager,
+    keys: key_material.KeyMaterial,
     db: ports.UnitOfWork,
     settings: Settings,
     user_id: uuid.UUID,
@@ -36,7 +34,7 @@ async def create_session(
     """
     Return a new user session.
     """
-    certificate = await auth.get_private_key(secret_manager)
+    kid, certificate = await keys.signing_key()
 
     session_duration = SESSION_DURATION
     token_duration = TOKEN_DURATION
@@ -63,6 +61,7 @@ async def create_session(
         auth.create_token,
         issued_at=now,
         certificate=certificate,
+        key_id=kid,
         subject=str(session_id),
         audience=settings.get("project_id"),
     )
@@ -80,10 +79,10 @@ async def create_session(
 
 async def login(
     external_login: ports.ExternalAuth,
-    secret_manager: ports.SecretManager,
+    keys: key_material.KeyMaterial,
     settings: Settings,
     db: ports.UnitOfWork,
-    hash_ctx: context.CryptContext,
+    hasher: passwords.PasswordHasher,
     credentials: schemas.FirebaseLogin | schemas.EmailPasswordLogin,
 ) -> schemas.Session:
     """
@@ -108,12 +107,12 @@ async def login(
                 raise errors.InvalidCredentials() from err
             if not (
                 user.type == models.UserType.PASSWORD
-                and user.check_password(credentials.password, hash_ctx)
+                and await hasher.check(user, credentials.password)
             ):
                 raise errors.InvalidCredentials()
     user.last_login = time_now()
     return await create_session(
-        secret_manager=secret_manager,
+        keys=keys,
         db=db,
         settings=settings,
         user_id=user.id,
@@ -123,7 +122,7 @@ async def login(
 
 
 async def refresh(
-    secret_manager: ports.SecretManager,
+    keys: key_material.KeyMaterial,
     settings: Settings,
     db: ports.UnitOfWork,
     token_data: helper_schema.TokenData,
@@ -135,7 +134,7 @@ async def refresh(
     user_session = await db.session_repository.get(uuid.UUID(session_id))
     user_session.generation += 1
     return await create_session(
-        secret_manager=secret_manager,
+        keys=keys,
         db=db,
         settings=settings,
         user_id=user_session.user_id,
@@ -155,7 +154,7 @@ async def forgot_password(email: str, uow: ports.UnitOfWork) -> str:
 
 
 async def reset_password(
-    token: str, password: str, uow: ports.UnitOfWork, hash_ctx: context.CryptContext
+    token: str, password: str, uow: ports.UnitOfWork, hasher: passwords.PasswordHasher
 ) -> bool:
     """
     Sends a forgot password email
@@ -165,5 +164,5 @@ async def reset_password(
     except errors.NotFound as err:
         raise errors.InvalidResetUrl() from err
     user.reset_token = None
-    user.set_password(password, hash_ctx)
+    user.set_password_hash(await hasher.hash(password))
     return True
@@ -6,13 +6,13 @@ from __future__ import annotations
 
 import base64
 import logging
+import uuid
 
 import fastapi
 import fastapi_injector
-from passlib import context
 
 from api import dependencies, errors, ports, typings
-from api.helpers import auth
+from api.helpers import auth, key_material, passwords, session_cache
 from api.helpers import schemas as helper_schema
 from api.helpers import session_manager as sess_mg
 from api.routers.schemas import PubsubRequest
@@ -28,11 +28,13 @@ logger = logging.getLogger(__name__)
 @router.post("/token")
 async def login(
     external_login: ports.ExternalAuth = fastapi_injector.Injected(ports.ExternalAuth),
-    secret_manager: ports.SecretManager = fastapi_injector.Injected(
-        ports.SecretManager
+    keys: key_material.KeyMaterial = fastapi_injector.Injected(
+        key_material.KeyMaterial
     ),
     settings: Settings = fastapi_injector.Injected(Settings),
-    hash_ctx: context.CryptContext = fastapi_injector.Injected(context.CryptContext),
+    hasher: passwords.PasswordHasher = fastapi_injector.Injected(
+        passwords.PasswordHasher
+    ),
     uow_builder: ports.UnitOfWorkBuilder = fastapi_injector.Injected(
         ports.UnitOfWorkBuilder
     ),
@@ -44,15 +46,13 @@ async def login(
     Handles requests related to users logging in.
 
     :param external_login: external auth implementation.
-    :param secret_manager: secret manager implementation.
+    :param keys: signing keys of the tokens.
     :param uow_builder: session builder implementation.
     :param settings: settings implementation.
     :param body: parsed HTTP request body.
     """
     async with uow_builder() as db:
-        resp = await crud.login(
-            external_login, secret_manager, settings, db, hash_ctx, body
-        )
+        resp = await crud.login(external_login, keys, settings, db, hasher, body)
         await db.commit()
     return resp
 
@@ -61,8 +61,8 @@ async def login(
     "/refresh", dependencies=[fastapi.Security(auth.get_token, scopes=["refresh"])]
 )
 async def refresh_token(
-    secret_manager: ports.SecretManager = fastapi_injector.Injected(
-        ports.SecretManager
+    keys: key_material.KeyMaterial = fastapi_injector.Injected(
+        key_material.KeyMaterial
     ),
     settings: Settings = fastapi_injector.Injected(Settings),
     uow_builder: ports.UnitOfWorkBuilder = fastapi_injector.Injected(
@@ -71,25 +71,30 @@ async def refresh_token(
     token_data: helper_schema.TokenData = fastapi.Security(
         auth.get_token, scopes=["refresh"]
     ),
+    cache: session_cache.SessionCache = fastapi_injector.Injected(
+        session_cache.SessionCache
+    ),
 ) -> schemas.Session | None:
     """
     Refresh token.
 
     Handles the refresh of an expired (or not) token.
 
-    :param secret_manager: secret manager implementation.
+    :param keys: signing keys of the tokens.
     :param settings: settings implementation.
     :param uow_builder: uow_builder implementation.
     :param token_data: token parsed.
+    :param cache: process cache of the sessions, the refreshed one is dropped.
     """
     async with uow_builder() as db:
         response = await crud.refresh(
-            secret_manager=secret_manager,
+            keys=keys,
             settings=settings,
             db=db,
             token_data=token_data,
         )
         await db.commit()
+    cache.invalidate(uuid.UUID(token_data.sub.split(":")[0]))
     return response
 
 
@@ -104,9 +109,9 @@ async def dashboard_signed_url(
     """
     Creates a signed url to access the dashboard.
     """
-    session = await session_manager.get_current_session()
+    principal = await session_manager.get_principal()
     response = await dashboard.get_signed_url(
-        user=session.user, query=request.query_params
+        user=principal, query=request.query_params
     )
     return {"url": response}
 
@@ -144,13 +149,15 @@ async def reset_password(
         ports.UnitOfWorkBuilder
     ),
     body: schemas.ResetPassword = fastapi.Body(...),
-    hash_ctx: context.CryptContext = fastapi_injector.Injected(context.CryptContext),
+    hasher: passwords.PasswordHasher = fastapi_injector.Injected(
+        passwords.PasswordHasher
+    ),
 ) -> fastapi.Response:
     """
     Sends a forgot password email
     """
     async with uow_builder() as uow:
-        await crud.reset_password(body.token, body.password, uow, hash_ctx)
+        await crud.reset_password(body.token, body.password, uow, hasher)
         await uow.commit()
     return fastapi.Response(status_code=fastapi.status.HTTP_200_OK)
 
@@ -13,7 +13,8 @@ import fastapi
 import fastapi_injector
 
 from api import dependencies, errors, models, ports, typings
-from api.helpers import auth, util
+from api.adapters import google
+from api.helpers import audio, auth, util
 from api.helpers import schemas as util_schemas
 from api.helpers import session_manager as sess_mg
 
@@ -41,15 +42,16 @@ async def list_resources(
 
     :param list_exams: implementation of orgs list.
     """
-    session = await session_manager.get_current_session()
-    scopes = session.user.role.scopes
+    principal = await session_manager.get_principal()
+    scopes = principal.scopes
     groups = None
     if "exam.list" in scopes:
-        groups = [group.id for group in session.user.groups]
+        groups = principal.group_ids
     result, pagination_metadata = await list_exams(
         groups=groups,
         page_size=list_data.page_size,
         page=list_data.page,
+        cursor=list_data.cursor,
         query=list_data.q,
     )
 
@@ -58,6 +60,7 @@ async def list_resources(
         current_page=pagination_metadata.current_page,
         total=pagination_metadata.total_items,
         pages=pagination_metadata.total_pages,
+        next_cursor=pagination_metadata.next_cursor,
     )
 
 
@@ -80,10 +83,10 @@ async def get(
     :param get_exam: implementation exam get query.
     :param exam_id: query param with exam identifier.
     """
-    session = await session_manager.get_current_session()
+    principal = await session_manager.get_principal()
     groups = None
-    if "admin" not in session.user.role.scopes:
-        groups = [group.id for group in session.user.groups]
+    if "admin" not in principal.scopes:
+        groups = principal.group_ids
     exam = await get_exam(exam_id=exam_id, groups=groups)
     return schemas.ExamGet.from_orm(exam)
 
@@ -140,6 +143,15 @@ async def create(
     settings: typings.Settings = fastapi_injector.Injected(typings.Settings),
     storage: ports.Storage = fastapi_injector.Injected(ports.Storage),
     body: schemas.ExamCreate = fastapi.Body(...),
+    audio_processor: audio.AudioProcessor = fastapi_injector.Injected(
+        audio.AudioProcessor
+    ),
+    speech_registry: google.SpeechRegistry = fastapi_injector.Injected(
+        google.SpeechRegistry
+    ),
+    catalog: ports.ActiveExamCatalog = fastapi_injector.Injected(
+        ports.ActiveExamCatalog
+    ),
 ) -> schemas.ExamGet:
     """
     Create exams.
@@ -150,11 +162,14 @@ async def create(
     :param settings: Settings port.
     :param storage: Storage port.
     :param body: exam creation body.
+    :param catalog: active exams catalog, refreshed with the new exam.
     """
     async with uow_builder() as uow:
         question_list = []
         for question in body.questions:
-            speech = dependencies.get_speech_to_text("v1", settings, storage)
+            speech = dependencies.get_speech_to_text(
+                "v1", settings, storage, audio_processor, speech_registry
+            )
             phrase_id = await crud.build_question_phrase(question, speech)
             question_list.append(
                 models.Question(
@@ -175,6 +190,7 @@ async def create(
         )
         exam_model = await uow.exam_repository.create(exam)
         await uow.commit()
+    catalog.invalidate()
     return schemas.ExamGet.from_orm(exam_model)
 
 
@@ -190,6 +206,15 @@ async def update_exam(
     uow_builder: ports.UnitOfWorkBuilder = fastapi_injector.Injected(
         ports.UnitOfWorkBuilder
     ),
+    audio_processor: audio.AudioProcessor = fastapi_injector.Injected(
+        audio.AudioProcessor
+    ),
+    speech_registry: google.SpeechRegistry = fastapi_injector.Injected(
+        google.SpeechRegistry
+    ),
+    catalog: ports.ActiveExamCatalog = fastapi_injector.Injected(
+        ports.ActiveExamCatalog
+    ),
 ) -> schemas.ExamGet:
     """
     Patch exams.
@@ -201,8 +226,11 @@ async def update_exam(
     :param settings: Settings port.
     :param storage: Storage port.
     :param body: exam creation body.
+    :param catalog: active exams catalog, refreshed with the new dates.
     """
-    speech = dependencies.get_speech_to_text("v1", settings, storage)
+    speech = dependencies.get_speech_to_text(
+        "v1", settings, storage, audio_processor, speech_registry
+    )
     async with uow_builder() as uow:
         exam = await uow.exam_repository.get(exam_id=exam_id)
         if util.time_now() >= exam.start_date:
@@ -227,5 +255,6 @@ async def update_exam(
         for k, v in body_data.items():
             setattr(exam, k, v)
         await uow.commit()
+    catalog.invalidate()
 
     return schemas.ExamGet.from_orm(exam)
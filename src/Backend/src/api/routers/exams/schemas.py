@@ -72,9 +72,10 @@ class ExamList(pydantic.BaseModel):
     """
 
     items: list[Exam]
-    pages: int
-    current_page: int
-    total: int
+    pages: int | None
+    current_page: int | None
+    total: int | None
+    next_cursor: str | None = None
 
 
 class ExamGet(Exam):
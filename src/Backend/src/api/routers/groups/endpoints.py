@@ -47,21 +47,17 @@ async def list_resources(
     :param list_groups: implementation of groups list.
     :param session_manager: implementation of session to get current user.
     """
-    current_session = await session_manager.get_current_session()
+    principal = await session_manager.get_principal()
     group_ids = None
-    if "admin" not in current_session.user.role.scopes:
-        group_ids = (
-            [gp.id for gp in current_session.user.groups]
-            if current_session.user.groups
-            else None
-        )
+    if "admin" not in principal.scopes:
+        group_ids = principal.group_ids if principal.groups else None
         organizations = (
             [
-                org.id
-                for org in current_session.user.organizations
-                if not organizations or org.id in organizations
+                org_id
+                for org_id in principal.organization_ids
+                if not organizations or org_id in organizations
             ]
-            if current_session.user.organizations
+            if principal.organization_ids
             else None
         )
     result, pagination_metadata = await list_groups(
@@ -71,6 +67,7 @@ async def list_resources(
         organizations=organizations,
         page_size=list_data.page_size,
         page=list_data.page,
+        cursor=list_data.cursor,
         query=list_data.q,
     )
 
@@ -79,6 +76,7 @@ async def list_resources(
         current_page=pagination_metadata.current_page,
         total=pagination_metadata.total_items,
         pages=pagination_metadata.total_pages,
+        next_cursor=pagination_metadata.next_cursor,
     )
 
 
@@ -102,7 +100,7 @@ async def export_groups(
     :param list_groups: implementation of groups list.
     :param storage: implementation of storage.
     """
-    current_session = await session_manager.get_current_session()
+    principal = await session_manager.get_principal()
     groups, _ = await list_groups(organizations=organizations, page_size=page_size)
     url = await data.handle_export(
         objs=groups,
@@ -114,7 +112,7 @@ async def export_groups(
             "grade",
             "shift",
         ],
-        user_id=current_session.user.id,
+        user_id=principal.user_id,
         exp_type="groups",
         storage=storage,
     )
@@ -202,6 +200,9 @@ async def update(
     ),
     body: schemas.GroupPatch = fastapi.Body(...),
     group_id: uuid.UUID = fastapi.Path(...),
+    catalog: ports.ActiveExamCatalog = fastapi_injector.Injected(
+        ports.ActiveExamCatalog
+    ),
 ) -> schemas.GroupGet:
     """
     Update a group.
@@ -211,6 +212,7 @@ async def update(
     :param uow_builder: implementation group get query.
     :param group_id: query param with group identifier.
     :param body: parsed data for group patch.
+    :param catalog: active exams catalog, forgets the grade of the group.
     """
     body_dict = body.dict(exclude_unset=True)
 
@@ -219,6 +221,7 @@ async def update(
         for key, value in body_dict.items():
             setattr(group, key, value)
         await uow.commit()
+    catalog.invalidate()
 
     return schemas.GroupGet.from_orm(group)
 
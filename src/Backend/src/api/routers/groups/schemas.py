@@ -67,9 +67,10 @@ class GroupsList(pydantic.BaseModel):
     """
 
     items: list[GroupGet]
-    pages: int
-    current_page: int
-    total: int
+    pages: int | None
+    current_page: int | None
+    total: int | None
+    next_cursor: str | None = None
 
 
 class GroupPatch(pydantic.BaseModel):
@@ -38,13 +38,18 @@ async def list_resources(
     :param list_orgs: implementation of orgs list.
     """
     result, pagination_metadata = await list_orgs(
-        city=city, page_size=list_data.page_size, page=list_data.page, query=list_data.q
+        city=city,
+        page_size=list_data.page_size,
+        page=list_data.page,
+        query=list_data.q,
+        cursor=list_data.cursor,
     )
     return schemas.OrganizationList(
         items=result,
         current_page=pagination_metadata.current_page,
         total=pagination_metadata.total_items,
         pages=pagination_metadata.total_pages,
+        next_cursor=pagination_metadata.next_cursor,
     )
 
 
@@ -69,7 +74,7 @@ async def export_organizations(
     :param list_organizations: implementation of organizations list.
     :param storage: implementation of storage.
     """
-    current_session = await session_manager.get_current_session()
+    principal = await session_manager.get_principal()
     organizations, _ = await list_organizations(page_size=page_size)
     url = await data.handle_export(
         objs=organizations,
@@ -82,7 +87,7 @@ async def export_organizations(
             "state",
             "county",
         ],
-        user_id=current_session.user.id,
+        user_id=principal.user_id,
         exp_type="organizations",
         storage=storage,
     )
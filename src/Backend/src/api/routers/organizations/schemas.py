@@ -34,9 +34,10 @@ class OrganizationList(pydantic.BaseModel):
     """
 
     items: list[Organization]
-    pages: int
-    current_page: int
-    total: int
+    pages: int | None
+    current_page: int | None
+    total: int | None
+    next_cursor: str | None = None
 
 
 class OrganizationGet(Organization):
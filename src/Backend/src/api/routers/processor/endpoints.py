@@ -3,9 +3,12 @@ Endpoints related to processing speech to text.
 """
 
 import base64
+import dataclasses
 import datetime
+import hashlib
+import json
 import logging
-import os
+import typing
 import urllib.parse
 import uuid
 
@@ -14,9 +17,9 @@ import fastapi_injector
 from opentelemetry import trace
 
 from api import dependencies, errors, helpers, models, ports, typings
-from api.adapters import sere
-from api.domain.service import process_result
-from api.helpers import auth, util
+from api.adapters import google, sere
+from api.domain.service import distance, process_result
+from api.helpers import audio, auth, util
 from api.helpers import session_manager as sess_mg
 from api.helpers.schemas import AnalyticalResult as UserResult
 from api.routers.schemas import PubsubRequest
@@ -28,6 +31,8 @@ router = fastapi.APIRouter(include_in_schema=False)
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
+PRE_READER_MIN_SIMILARITY = 0.05
+
 
 def calculate_user_rating(
     question_data: models.ExamUserQuestion,
@@ -78,8 +83,13 @@ def calculate_pre_reader_rating(
 ) -> models.UserRating:
     joined_sentence = "".join(sentence).lower()
     joined_expected = "".join(expected).lower()
-    levenshtein_rating = levenshtein_distance(joined_sentence, joined_expected)
     max_len = max(len(joined_sentence), len(joined_expected))
+    # Distances that can't reach the lowest similarity are not computed exactly
+    levenshtein_rating = distance.levenshtein(
+        joined_sentence,
+        joined_expected,
+        max_distance=int(max_len * (1 - PRE_READER_MIN_SIMILARITY)) + 1,
+    )
     percentage = 100.0
     if max_len != 0:
         percentage = 1 - levenshtein_rating / max_len  # similarity [0,1]
@@ -87,63 +97,11 @@ def calculate_pre_reader_rating(
     match util.check_spelling_or_syllables(sentence):
         case 1 if percentage >= 0.1:  # Silabou
             return models.UserRating.PRE_READER_THREE
-        case -1 if percentage >= 0.05:  # Soletrou
+        case -1 if percentage >= PRE_READER_MIN_SIMILARITY:  # Soletrou
             return models.UserRating.PRE_READER_TWO
     return models.UserRating.PRE_READER_ONE
 
 
-def levenshtein_distance(string_one: str, string_two: str) -> int:
-    """
-    Checks the levenshtein distance between two strings
-    For every insertion, deletion or substitution it adds 1 point
-    0 points means string_one and string_two are the same string
-    """
-    if len(string_one) < len(string_two):
-        return levenshtein_distance(string_two, string_one)
-
-    if len(string_two) == 0:
-        return len(string_one)
-
-    previous_row = list(range(len(string_two) + 1))
-    for i, char_one in enumerate(string_one):
-        current_row = [i + 1]
-        for j, char_two in enumerate(string_two):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (char_one != char_two)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-
-    return previous_row[-1]
-
-
-def levenshtein_distance_words(list_one: list[str], list_two: list[str]) -> int:
-    """
-    Checks the levenshtein distance between two lists of strings
-    eg.: ["hello", "wonderful", "world"]  and ["hello", "darling"]
-    returns 2 points (1 substitution and 1 deletion)
-    """
-    distances = [
-        [0 for _ in range(len(list_two) + 1)] for _ in range(len(list_one) + 1)
-    ]
-
-    for i in range(len(list_one) + 1):
-        distances[i][0] = i
-    for j in range(len(list_two) + 1):
-        distances[0][j] = j
-
-    for i in range(1, len(list_one) + 1):
-        for j in range(1, len(list_two) + 1):
-            cost = 0 if list_one[i - 1] == list_two[j - 1] else 1
-            distances[i][j] = min(
-                distances[i - 1][j] + 1,
-                distances[i][j - 1] + 1,
-                distances[i - 1][j - 1] + cost,
-            )
-
-    return distances[-1][-1]
-
-
 @router.post("/_handle", response_model=None)
 async def process(
     request: fastapi.Request,
@@ -153,15 +111,18 @@ async def process(
     ),
     settings: typings.Settings = fastapi_injector.Injected(typings.Settings),
     storage: ports.Storage = fastapi_injector.Injected(ports.Storage),
-    list_pending: ports.ListPendingQuestions = fastapi_injector.Injected(
-        ports.ListPendingQuestions
-    ),
-    get_exam_user: ports.GetExamUserStatus = fastapi_injector.Injected(
-        ports.GetExamUserStatus
-    ),
     analytical: ports.AnalyticalResult = fastapi_injector.Injected(
         ports.AnalyticalResult
     ),
+    speech_registry: google.SpeechRegistry = fastapi_injector.Injected(
+        google.SpeechRegistry
+    ),
+    audio_processor: audio.AudioProcessor = fastapi_injector.Injected(
+        audio.AudioProcessor
+    ),
+    match_mode: process_result.MatchMode = fastapi_injector.Injected(
+        process_result.MatchMode
+    ),
 ) -> fastapi.Response:
     """
     Receive pubsub message.
@@ -189,7 +150,9 @@ async def process(
     }:
         model_type = "chirp"
         version = "v2chirp"
-    speech = dependencies.get_speech_to_text(version, settings, storage)
+    speech = dependencies.get_speech_to_text(
+        version, settings, storage, audio_processor, speech_registry
+    )
     tts_words = await speech.process(
         phrases_id=data.phrase_set_id,
         path=f"gs://{file_data}",
@@ -202,14 +165,18 @@ async def process(
     )
 
     right_count, user_result = process_result.get_right_count_user_result(
-        data.words, tts_words, data.question_type
+        data.words,
+        tts_words,
+        data.question_type,
+        match_mode,
     )
 
     async with uow_builder() as uow:
         try:
-            user_question = await uow.result_repository.get(data.result_id)
+            context = await uow.result_repository.get_scoring_context(data.result_id)
         except errors.NotFound:
             return fastapi.Response(status_code=200)
+        user_question = context.answer
         user_question.result = user_result
         user_question.right_count = right_count
         user_question.status = models.ExamStatus.FINISHED
@@ -221,47 +188,35 @@ async def process(
         user_question.total_accuracy = (
             user_question.right_count / len(data.words) if data.words else 0.0
         )
-        question_list = await list_pending(
-            user_question.user_id, user_question.group_id, user_question.exam_id
-        )
 
-        user_rating = models.UserRating.NO_RATING
-
-        exam_user = await get_exam_user(
-            user_id=user_question.user_id,
-            exam_id=user_question.exam_id,
-            group_id=user_question.group_id,
-        )
-        exam_user_merged: models.ExamUser = await uow.merge(exam_user)
-        if len(question_list) == 1:
-            if not exam_user:
-                logger.warning(
-                    "Exam user not found", extra={"result_id": str(data.result_id)}
-                )
-                return fastapi.Response(status_code=200)
+        if not (exam_user := context.exam_user):
+            logger.warning(
+                "Exam user not found", extra={"result_id": str(data.result_id)}
+            )
+            return fastapi.Response(status_code=200)
+        if context.is_last_answer(helpers.time_now()):
             if exam_user.status == models.ExamStatus.FINISHED:
                 logger.warning(
                     "Exam is already done and it's running again.",
                     extra={"result_id": str(data.result_id)},
                 )
                 return fastapi.Response(status_code=200)
-            exam_user_merged.status = models.ExamStatus.FINISHED
+            exam_user.status = models.ExamStatus.FINISHED
 
-        question = await uow.question_repository.get(user_question.question_id)
         user_rating = calculate_user_rating(
-            user_question, question.type, exam_user_merged.user_rating, data.words
+            user_question, context.question_type, exam_user.user_rating, data.words
         )
-        exam_user_merged.user_rating = user_rating
+        exam_user.user_rating = user_rating
 
         result_data = UserResult(
             school_uuid=user_question.organization_id,
-            class_grade=user_question.group.grade.value,
-            class_name=user_question.group.name,
+            class_grade=context.group_grade.value,
+            class_name=context.group_name,
             class_uuid=user_question.group_id,
-            exam_end_date=user_question.exam.end_date,
-            exam_start_date=user_question.exam.start_date,
-            exam_grade=user_question.group.grade.value,
-            exam_name=user_question.exam.name,
+            exam_end_date=context.exam_end_date,
+            exam_start_date=context.exam_start_date,
+            exam_grade=context.group_grade.value,
+            exam_name=context.exam_name,
             exam_uuid=user_question.exam_id,
             question_amount_words=len(data.words),
             question_uuid=user_question.question_id,
@@ -269,21 +224,17 @@ async def process(
             response_amount_hits=user_question.right_count,
             response_timestamp=helpers.time_now(),
             response_words=user_question.result,
-            school_city=user_question.organization.city,
-            school_name=user_question.organization.name,
-            school_region=user_question.organization.region,
-            school_state=user_question.organization.state,
-            school_county=user_question.organization.county,
-            student_name=user_question.user.name,
+            school_city=context.organization_city,
+            school_name=context.organization_name,
+            school_region=context.organization_region,
+            school_state=context.organization_state,
+            school_county=context.organization_county,
+            student_name=context.user_name,
             student_uuid=user_question.user_id,
-            student_customer_id=user_question.user.customer_id,
+            student_customer_id=context.user_customer_id,
             user_rating=user_rating,
         )
-        if err := await analytical.save(result_data):
-            logger.warning(
-                "Could not save to bigquery.",
-                extra={"result_id": str(data.result_id), "errors": err},
-            )
+        await analytical.save(result_data)
         await uow.commit()
     return fastapi.Response(status_code=200)
 
@@ -297,6 +248,9 @@ async def convert_audio_type(
     ),
     storage: ports.Storage = fastapi_injector.Injected(ports.Storage),
     settings: typings.Settings = fastapi_injector.Injected(typings.Settings),
+    audio_processor: audio.AudioProcessor = fastapi_injector.Injected(
+        audio.AudioProcessor
+    ),
 ) -> fastapi.Response:
     """
     Receive pubsub message.
@@ -326,29 +280,31 @@ async def convert_audio_type(
         return fastapi.Response(status_code=200)
     content_type = await storage.get_blob_content_type(file_path)
     sample_rate = channels = None
-    _, file_name = file_path.rsplit("/", 1)
 
-    download_path = await storage.download(f"gs://{file_stripped}", file_name)
-    metadata = helpers.util.get_file_metadata(download_path)
+    audio_data = await storage.download_bytes(f"gs://{file_stripped}")
     if content_type not in {"audio/wav", "audio/x-wav"}:
         logger.debug(
             "Audio needs to be converted.", extra={"result_id": str(data.result_id)}
         )
-        new_name = download_path.rsplit(".")[0] + ".wav"
-        helpers.util.convert_audio(
-            download_path, new_name, settings.get("env") == "prod"
-        )
-        metadata = helpers.util.get_file_metadata(new_name)
-        file_stripped = await storage.upload_by_file(
-            file_path.rsplit(".")[0] + ".wav", new_name
+        try:
+            audio_data = await audio_processor.convert(
+                audio_data, settings.get("env") == "prod"
+            )
+        except errors.EmptyAudio:
+            logger.error(
+                "Could not decode the audio.", extra={"result_id": str(data.result_id)}
+            )
+            return fastapi.Response(status_code=200)
+        file_stripped = await storage.upload_by_text(
+            file_path.rsplit(".")[0] + ".wav", audio_data, content_type="audio/wav"
         )
+    metadata = helpers.util.get_file_metadata(audio_data)
     sample_str: str | None = metadata.get("sample_rate")
     sample_rate = int(sample_str) if sample_str else None
 
     channels_str: str | None = metadata.get("channels")
     channels = int(channels_str) if channels_str else None
     duration = int(metadata.get("duration", 61))
-    os.remove(download_path)
     await publisher.publish(
         schemas.ReprocessedMessage(
             result_id=data.result_id,
@@ -364,27 +320,113 @@ async def convert_audio_type(
     return fastapi.Response(status_code=200)
 
 
-@router.get(
-    "/sync",
-    dependencies=[fastapi.Security(auth.validate_scheduler_token)],
-)
-async def sync_database(  # noqa: PLR0915
-    uow_builder: ports.UnitOfWorkBuilder = fastapi_injector.Injected(
-        ports.UnitOfWorkBuilder
-    ),
-    sere_api: sere.SereApi = fastapi_injector.Injected(sere.SereApi),
-) -> fastapi.Response:
-    logger.info("Starting sync database.")
-    async with uow_builder() as uow:
-        student_role = await uow.role_repository.get(name="user")
-        professor_role = await uow.role_repository.get(name="professor")
-        # Organization logic
-        updated_organizations: dict[str, models.Organization] = {}
-        logger.info("Start org endpoint call.")
-        organizations = await sere_api.list_organization()
-        logger.info("Finished org endpoint call.")
-        org_cid_list = [str(org.get("codMec")) for org in organizations]
-        cached_orgs = await uow.organization_repository.list(customer_ids=org_cid_list)
+_Synced = typing.TypeVar("_Synced", models.Organization, models.Group, models.User)
+
+# A failed sync started within this window is resumed from its last checkpoint.
+RESUME_WINDOW = datetime.timedelta(hours=24)
+PROFESSOR_CHUNK_SIZE = 500
+# Nossa referencia de código de seriação, que garante que são turmas
+# do segundo ano são esses: 1211, 988, 356, 1441, 1430, 351, 993
+SECOND_GRADE_CODES = {1211, 988, 356, 1441, 1430, 351, 993}
+SHIFT_MAPPING = {
+    "Manhã": models.Shifts.MORNING,
+    "Tarde": models.Shifts.AFTERNOON,
+    "Noite": models.Shifts.EVENING,
+    "Integral": models.Shifts.ALLDAY,
+}
+
+
+def _index_by_customer_id(items: list[_Synced]) -> dict[str, _Synced]:
+    """
+    Index the synced entities by customer id, the first one wins.
+    """
+    index: dict[str, _Synced] = {}
+    for item in items:
+        if item.customer_id:
+            index.setdefault(item.customer_id, item)
+    return index
+
+
+async def _index_missing(
+    index: dict[str, _Synced],
+    customer_ids: typing.Iterable[str],
+    list_by_customer_ids: typing.Callable[[list[str]], typing.Awaitable[list[_Synced]]],
+) -> None:
+    """
+    Add the entities missing from the index, loaded with a single query.
+    """
+    missing = list(set(customer_ids) - index.keys())
+    if not missing:
+        return
+    for customer_id, item in _index_by_customer_id(
+        await list_by_customer_ids(missing)
+    ).items():
+        index.setdefault(customer_id, item)
+
+
+def _content_hash(*values: typing.Any) -> str:
+    """
+    Hash of the synced content of an entity.
+    """
+    return hashlib.sha256(json.dumps(values, default=str).encode()).hexdigest()
+
+
+async def _changed(
+    uow: ports.UnitOfWork,
+    entity: models.SyncEntity,
+    hashes: dict[str, str],
+    full: bool,
+) -> dict[str, str]:
+    """
+    Keep the hashes that differ from the last synced ones, all of them when full.
+    """
+    if full:
+        return hashes
+    synced = await uow.sync_repository.list_hashes(entity, list(hashes))
+    return {
+        customer_id: content_hash
+        for customer_id, content_hash in hashes.items()
+        if synced.get(customer_id) != content_hash
+    }
+
+
+def _first_page(run: models.SyncRun, phase: models.SyncEntity) -> int | None:
+    """
+    First page of the phase still to be synced by the run, None when it is done.
+    """
+    phases = list(models.SyncEntity)
+    if phases.index(phase) < phases.index(run.phase):
+        return None
+    return run.page + 1 if phase == run.phase else 1
+
+
+async def _checkpoint(
+    uow: ports.UnitOfWork, run: models.SyncRun, phase: models.SyncEntity, page: int
+) -> None:
+    """
+    Commit the synced page, a failed run resumes after it.
+    """
+    run.phase = phase
+    run.page = page
+    await uow.commit()
+
+
+async def _sync_organizations(
+    uow: ports.UnitOfWork,
+    sere_api: sere.SereApi,
+    run: models.SyncRun,
+    full: bool,
+    updated_organizations: dict[str, models.Organization],
+) -> None:
+    """
+    Sync the organizations, indexing the written ones by customer id.
+    """
+    entity = models.SyncEntity.ORGANIZATION
+    if (start := _first_page(run, entity)) is None:
+        return
+    cached_orgs: dict[str, models.Organization] = {}
+    async for nre, organizations in sere_api.iter_organization_pages(start):
+        sync_orgs: dict[str, typings.CreateOrUpdateOrganization] = {}
         for organization in organizations:
             sync_org = typings.CreateOrUpdateOrganization(
                 customer_id=str(organization.get("codMec")),
@@ -394,36 +436,54 @@ async def sync_database(  # noqa: PLR0915
                 state="PR",
                 county=str(organization.get("descMun")),
             )
-            updated_org = await uow.organization_repository.create_or_update(
-                sync_org, cached_orgs
+            sync_orgs[str(sync_org.customer_id)] = sync_org
+        changed = await _changed(
+            uow,
+            entity,
+            {
+                customer_id: _content_hash(*dataclasses.astuple(sync_org))
+                for customer_id, sync_org in sync_orgs.items()
+            },
+            full,
+        )
+        await _index_missing(
+            cached_orgs,
+            changed,
+            lambda ids: uow.organization_repository.list(customer_ids=ids),
+        )
+        for customer_id in changed:
+            updated_organizations[
+                customer_id
+            ] = await uow.organization_repository.create_or_update(
+                sync_orgs[customer_id], cached_orgs
             )
-            if updated_org:
-                updated_organizations[str(updated_org.customer_id)] = updated_org
-
-        del organizations, organization, org_cid_list, cached_orgs
-        logger.info("Finished org import.")
-        # Group logic
-        # Nossa referencia de código de seriação, que garante que são turmas
-        # do segundo ano são esses: 1211, 988, 356, 1441, 1430, 351, 993
-        second_grade_codes = {1211, 988, 356, 1441, 1430, 351, 993}
-        updated_groups: dict[str, models.Group] = {}
-        logger.info("Start group endpoint call.")
-        groups = await sere_api.list_group()
-        logger.info("Finished group endpoint call.")
-        group_cid_list = [str(group.get("codTurma")) for group in groups]
-        cached_groups = await uow.group_repository.list(customer_ids=group_cid_list)
-        shift_mapping = {
-            "Manhã": models.Shifts.MORNING,
-            "Tarde": models.Shifts.AFTERNOON,
-            "Noite": models.Shifts.EVENING,
-            "Integral": models.Shifts.ALLDAY,
-        }
+        await uow.sync_repository.save_hashes(entity, changed)
+        await _checkpoint(uow, run, entity, nre)
+
+
+async def _sync_groups(  # noqa: PLR0913
+    uow: ports.UnitOfWork,
+    sere_api: sere.SereApi,
+    run: models.SyncRun,
+    full: bool,
+    updated_organizations: dict[str, models.Organization],
+    updated_groups: dict[str, models.Group],
+) -> None:
+    """
+    Sync the second grade groups, indexing the written ones by customer id.
+    """
+    entity = models.SyncEntity.GROUP
+    if (start := _first_page(run, entity)) is None:
+        return
+    cached_groups: dict[str, models.Group] = {}
+    async for nre, groups in sere_api.iter_group_pages(start):
+        sync_groups: dict[str, tuple[typings.CreateOrUpdateGroup, str]] = {}
         for group in groups:
-            if group.get("codSeriacao") not in second_grade_codes:
+            if group.get("codSeriacao") not in SECOND_GRADE_CODES:
                 continue
             desc_seriacao = str(group.get("descSeriacao")).strip()
             desc_turma = str(group.get("descTurma")).strip()
-            desc_turno = shift_mapping[str(group.get("descTurno")).strip()]
+            desc_turno = SHIFT_MAPPING[str(group.get("descTurno")).strip()]
             group_name = f"{desc_seriacao} - {desc_turma} - {desc_turno}"
             sync_group = typings.CreateOrUpdateGroup(
                 name=group_name,
@@ -431,57 +491,126 @@ async def sync_database(  # noqa: PLR0915
                 grade=models.Grades.SECOND_FUND,
                 shift=desc_turno,
             )
-            updated_group = await uow.group_repository.create_or_update(
+            sync_groups[str(sync_group.customer_id)] = (
                 sync_group,
                 str(group.get("codMec")),
-                updated_organizations,
-                cached_groups,
+            )
+        changed = await _changed(
+            uow,
+            entity,
+            {
+                customer_id: _content_hash(*dataclasses.astuple(sync_group), org)
+                for customer_id, (sync_group, org) in sync_groups.items()
+            },
+            full,
+        )
+        await _index_missing(
+            cached_groups,
+            changed,
+            lambda ids: uow.group_repository.list(customer_ids=ids),
+        )
+        await _index_missing(
+            updated_organizations,
+            (sync_groups[customer_id][1] for customer_id in changed),
+            lambda ids: uow.organization_repository.list(customer_ids=ids),
+        )
+        synced: dict[str, str] = {}
+        for customer_id, content_hash in changed.items():
+            sync_group, org_customer_id = sync_groups[customer_id]
+            updated_group = await uow.group_repository.create_or_update(
+                sync_group, org_customer_id, updated_organizations, cached_groups
             )
             if updated_group:
-                updated_groups[str(updated_group.customer_id)] = updated_group
-
-        del groups, group, cached_groups, group_cid_list
-        logger.info("Finished group import.")
-        # Student logic
-        logger.info("Starting student endpoint paginated call.")
-        uow._session.autoflush = False
-        processed_users = []
-        for nre in range(1, 33):
-            logger.info(f"Page {nre}/33")
-            students = await sere_api.list_student_paginated(nre)
-            student_cid_list = [str(student.get("cgm")) for student in students]
-            cached_users = await uow.user_repository.list(customer_ids=student_cid_list)
-            for student in students:
-                student_user = typings.CreateOrUpdateUser(
-                    external_id=None,
-                    name=student.get("nome"),
-                    email_address=f"{student.get('cgm')}@example.com",
-                    customer_id=student.get("cgm"),
-                    type=models.UserType.PASSWORD,
-                    role_id=student_role.id,
-                    county=None,
-                    region=None,
-                    state=None,
-                    orgs_customer_id=None,
-                    groups_customer_id=None,
-                )
-                if student.get("cgm") in processed_users:
-                    continue
-                processed_users.append(student.get("cgm"))
-                await uow.user_repository.create_or_update_student(
-                    student_user,
-                    str(student.get("codTurma")),
-                    updated_groups,
-                    cached_users,
-                )
-            del students, student, cached_users, student_cid_list
-        del processed_users
-        logger.info("Finished student import.")
-        # Professor logic
-        logger.info("Start professor endpoint call.")
-        professors = await sere_api.list_professor()
-        logger.info("Finished professor endpoint call.")
-        to_be_processed: dict[str, typings.CreateOrUpdateUser] = {}
+                updated_groups[customer_id] = updated_group
+                synced[customer_id] = content_hash
+        await uow.sync_repository.save_hashes(entity, synced)
+        await _checkpoint(uow, run, entity, nre)
+
+
+async def _sync_students(  # noqa: PLR0913
+    uow: ports.UnitOfWork,
+    sere_api: sere.SereApi,
+    run: models.SyncRun,
+    full: bool,
+    role_id: uuid.UUID,
+    updated_groups: dict[str, models.Group],
+) -> None:
+    """
+    Sync the students, the first page a student is in wins.
+    """
+    entity = models.SyncEntity.STUDENT
+    if (start := _first_page(run, entity)) is None:
+        return
+    uow._session.autoflush = False
+    processed_users: set[str] = set()
+    async for nre, students in sere_api.iter_student_pages(start):
+        logger.info(f"Page {nre}/33")
+        page_students: dict[str, tuple[typings.CreateOrUpdateUser, str]] = {}
+        for student in students:
+            if student.get("cgm") in processed_users:
+                continue
+            processed_users.add(student.get("cgm"))
+            student_user = typings.CreateOrUpdateUser(
+                external_id=None,
+                name=student.get("nome"),
+                email_address=f"{student.get('cgm')}@example.com",
+                customer_id=student.get("cgm"),
+                type=models.UserType.PASSWORD,
+                role_id=role_id,
+                county=None,
+                region=None,
+                state=None,
+                orgs_customer_id=None,
+                groups_customer_id=None,
+            )
+            page_students[str(student_user.customer_id)] = (
+                student_user,
+                str(student.get("codTurma")),
+            )
+        changed = await _changed(
+            uow,
+            entity,
+            {
+                customer_id: _content_hash(user.name, user.role_id, group)
+                for customer_id, (user, group) in page_students.items()
+            },
+            full,
+        )
+        await _index_missing(
+            updated_groups,
+            (page_students[customer_id][1] for customer_id in changed),
+            lambda ids: uow.group_repository.list(customer_ids=ids),
+        )
+        synced = {
+            customer_id: content_hash
+            for customer_id, content_hash in changed.items()
+            if page_students[customer_id][1] in updated_groups
+        }
+        await uow.user_repository.bulk_create_or_update_students(
+            [page_students[customer_id] for customer_id in synced], updated_groups
+        )
+        await uow.sync_repository.save_hashes(entity, synced)
+        await _checkpoint(uow, run, entity, nre)
+        del students, page_students
+
+
+async def _sync_professors(  # noqa: PLR0913
+    uow: ports.UnitOfWork,
+    sere_api: sere.SereApi,
+    run: models.SyncRun,
+    full: bool,
+    role_id: uuid.UUID,
+    updated_organizations: dict[str, models.Organization],
+    updated_groups: dict[str, models.Group],
+) -> None:
+    """
+    Sync the professors, merging their groups and organizations of every page.
+    """
+    entity = models.SyncEntity.PROFESSOR
+    if _first_page(run, entity) is None:
+        return
+    to_be_processed: dict[str, typings.CreateOrUpdateUser] = {}
+    async for _, professors in sere_api.iter_professor_pages():
         for professor in professors:
             if not professor.get("nomeProfessor") or not professor.get(
                 "emailProfessor"
@@ -496,7 +625,7 @@ async def sync_database(  # noqa: PLR0915
                     ),
                     customer_id=professor.get("cpfProfessor"),
                     type=models.UserType.PASSWORD,
-                    role_id=professor_role.id,
+                    role_id=role_id,
                     county=None,
                     region=None,
                     state=None,
@@ -521,27 +650,125 @@ async def sync_database(  # noqa: PLR0915
                     and str(professor["codMec"]) not in cur_prof_schema.orgs_customer_id
                 ):
                     cur_prof_schema.orgs_customer_id.append(str(professor["codMec"]))
-        del professors, professor
-        cached_profs = await uow.user_repository.list(
-            customer_ids=list(to_be_processed.keys())
+        del professors
+    by_customer_id = {str(prof.customer_id): prof for prof in to_be_processed.values()}
+    del to_be_processed
+    changed = list(
+        (
+            await _changed(
+                uow,
+                entity,
+                {
+                    customer_id: _content_hash(
+                        prof.name,
+                        prof.email_address,
+                        prof.role_id,
+                        sorted(prof.groups_customer_id or []),
+                        sorted(prof.orgs_customer_id or []),
+                    )
+                    for customer_id, prof in by_customer_id.items()
+                },
+                full,
+            )
+        ).items()
+    )
+    for chunk_start in range(0, len(changed), PROFESSOR_CHUNK_SIZE):
+        chunk = dict(changed[chunk_start : chunk_start + PROFESSOR_CHUNK_SIZE])
+        profs = [by_customer_id[customer_id] for customer_id in chunk]
+        cached_profs: dict[str, models.User] = {}
+        await _index_missing(
+            cached_profs,
+            chunk,
+            lambda ids: uow.user_repository.list(customer_ids=ids),
+        )
+        await _index_missing(
+            updated_groups,
+            (
+                customer_id
+                for prof in profs
+                for customer_id in prof.groups_customer_id or []
+            ),
+            lambda ids: uow.group_repository.list(customer_ids=ids),
+        )
+        await _index_missing(
+            updated_organizations,
+            (
+                customer_id
+                for prof in profs
+                for customer_id in prof.orgs_customer_id or []
+            ),
+            lambda ids: uow.organization_repository.list(customer_ids=ids),
         )
-        for prof in to_be_processed.values():
-            await uow.user_repository.create_or_update_professor(
+        synced: dict[str, str] = {}
+        for customer_id, content_hash in chunk.items():
+            prof = by_customer_id[customer_id]
+            if await uow.user_repository.create_or_update_professor(
                 prof,
                 prof.groups_customer_id or [],
                 prof.orgs_customer_id or [],
                 updated_organizations,
                 updated_groups,
                 cached_profs,
+            ):
+                synced[customer_id] = content_hash
+        await uow.sync_repository.save_hashes(entity, synced)
+        await _checkpoint(uow, run, entity, 0)
+
+
+@router.get(
+    "/sync",
+    dependencies=[fastapi.Security(auth.validate_scheduler_token)],
+)
+async def sync_database(
+    uow_builder: ports.UnitOfWorkBuilder = fastapi_injector.Injected(
+        ports.UnitOfWorkBuilder
+    ),
+    sere_api: sere.SereApi = fastapi_injector.Injected(sere.SereApi),
+    full: bool = False,
+) -> fastapi.Response:
+    """
+    Sync the organizations, groups, students and professors from SERE.
+
+    Only the entities whose content changed since the last sync are written, and
+    each page is committed so a failed run resumes from its last checkpoint.
+    With `full`, every entity is written and a new run is always started.
+    """
+    logger.info("Starting sync database.")
+    async with uow_builder() as uow:
+        run = None
+        if not full:
+            run = await uow.sync_repository.get_unfinished_run(
+                helpers.time_now() - RESUME_WINDOW
             )
-        del (
-            prof,
-            to_be_processed,
+        if run:
+            logger.info("Resuming sync.", extra={"phase": run.phase, "page": run.page})
+        else:
+            run = await uow.sync_repository.create_run()
+            await uow.commit()
+        student_role = await uow.role_repository.get(name="user")
+        professor_role = await uow.role_repository.get(name="professor")
+        updated_organizations: dict[str, models.Organization] = {}
+        updated_groups: dict[str, models.Group] = {}
+        logger.info("Start org import.")
+        await _sync_organizations(uow, sere_api, run, full, updated_organizations)
+        logger.info("Finished org import.")
+        await _sync_groups(
+            uow, sere_api, run, full, updated_organizations, updated_groups
+        )
+        logger.info("Finished group import.")
+        await _sync_students(uow, sere_api, run, full, student_role.id, updated_groups)
+        logger.info("Finished student import.")
+        await _sync_professors(
+            uow,
+            sere_api,
+            run,
+            full,
+            professor_role.id,
             updated_organizations,
             updated_groups,
-            cached_profs,
         )
         logger.info("Finished professor import.")
+        run.finished = True
         await uow.commit()
     logger.info("Sync finished.")
     return fastapi.Response(status_code=200)
@@ -576,17 +803,14 @@ async def create_signed_url(
 
     :return: signed_url.
     """
-    session = await session_manager.get_current_session()
-    user = session.user
+    principal = await session_manager.get_principal()
     match body:
         case schemas.CreateUserSignedRequest() if (
-            "user" in user.role.scopes or "user.impersonate" in user.role.scopes
+            "user" in principal.scopes or "user.impersonate" in principal.scopes
         ):
             user_id = body.user_id
-            if "user.impersonate" in user.role.scopes:
-                impersonate_list = await list_personifiable(
-                    groups=[group.id for group in session.user.groups]
-                )
+            if "user.impersonate" in principal.scopes:
+                impersonate_list = await list_personifiable(groups=principal.group_ids)
                 if not (
                     user_tb_imp := next(
                         user_imp
@@ -595,18 +819,18 @@ async def create_signed_url(
                     )
                 ):
                     raise errors.Forbidden()
-                group = user_tb_imp.groups[0]
+                group_id = user_tb_imp.groups[0].id
+                organization_id = user_tb_imp.groups[0].organization_id
             else:
-                if session.user_id != user_id:
+                if principal.user_id != user_id:
                     raise errors.Forbidden()
-                group = user.groups[0]
-            group_id = group.id
-            organization_id = group.organization_id
+                group_id = principal.groups[0].id
+                organization_id = principal.groups[0].organization_id
             file_path = (
                 f"{organization_id}/{group_id}/{body.exam_id}"
                 f"|{body.question_id}|{user_id}.{body.file_type}"
             )
-        case schemas.CreateImportSignedRequest() if "admin" in user.role.scopes:
+        case schemas.CreateImportSignedRequest() if "admin" in principal.scopes:
             current_date = datetime.datetime.now().strftime("%Y%m%d")
             file_path = (
                 f"import/{body.type.value}"
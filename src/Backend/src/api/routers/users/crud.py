@@ -4,23 +4,25 @@ Module containing crud actions for users
 
 import typing
 
-from passlib import context
-
 from api import errors, models
+from api.helpers import passwords
 
 
 async def create_user(
     body_dict: dict[str, typing.Any],
     role: models.Role,
-    hash_ctx: context.CryptContext,
+    hasher: passwords.PasswordHasher,
     groups: list[models.Group],
     organizations: list[models.Organization],
 ) -> models.User:
     """
     Create user checking group_id logic.
+
+    A `password_hash` computed ahead, by a bulk import, is used as is.
     """
     _id = body_dict.pop("id", None)
     password = body_dict.pop("password", None)
+    password_hash = body_dict.pop("password_hash", None)
     user = models.User(**body_dict)
     user.id = _id if _id else user.id
 
@@ -28,8 +30,10 @@ async def create_user(
     user.organizations = organizations
 
     match body_dict.get("type"):
+        case models.UserType.PASSWORD | "password" if password_hash:
+            user.set_password_hash(password_hash)
         case models.UserType.PASSWORD | "password" if password:
-            user.set_password(password, hash_ctx)
+            user.set_password_hash(await hasher.hash(password))
         case models.UserType.PASSWORD | "password" if not password:
             raise errors.FieldNotNullable("password")
         case models.UserType.FIREBASE | "firebase" if password:
@@ -12,10 +12,9 @@ from datetime import datetime
 
 import fastapi
 import fastapi_injector
-from passlib import context
 
 from api import dependencies, errors, models, ports, typings
-from api.helpers import auth, data
+from api.helpers import auth, data, passwords, session_cache
 from api.helpers import session_manager as sess_mg
 from api.helpers.schemas import AnalyticalResult as UserResult
 from api.helpers.schemas import ImportData, ListSchema
@@ -40,7 +39,7 @@ async def get_profile(
     :param get_user: implementation for get user port.
     :param session_manager: session manager to get current user.
     """
-    current_user = await session_manager.get_current_session()
+    current_user = await session_manager.get_principal()
     user = await get_user(user_id=current_user.user_id)
     return schemas.UserGet.from_orm(user)
 
@@ -70,7 +69,7 @@ async def export_users(
     :param list_users: implementation of users list.
     :param storage: implementation of storage.
     """
-    current_session = await session_manager.get_current_session()
+    principal = await session_manager.get_principal()
     users, _ = await list_users(
         roles=roles, groups=groups, organizations=organizations, page_size=page_size
     )
@@ -88,7 +87,7 @@ async def export_users(
             "groups",
             "organizations",
         ],
-        user_id=current_session.user.id,
+        user_id=principal.user_id,
         exp_type="users",
         storage=storage,
     )
@@ -118,24 +117,20 @@ async def list_resources(
     :param list_users: implementation of orgs list.
     :param session_manager: implementation of session to get current user.
     """
-    current_session = await session_manager.get_current_session()
-    if "admin" not in current_session.user.role.scopes:
+    principal = await session_manager.get_principal()
+    if "admin" not in principal.scopes:
         groups = (
-            [
-                gp.id
-                for gp in current_session.user.groups
-                if not groups or gp.id in groups
-            ]
-            if current_session.user.groups
+            [gp.id for gp in principal.groups if not groups or gp.id in groups]
+            if principal.groups
             else None
         )
         organizations = (
             [
-                org.id
-                for org in current_session.user.organizations
-                if not organizations or org.id in organizations
+                org_id
+                for org_id in principal.organization_ids
+                if not organizations or org_id in organizations
             ]
-            if current_session.user.organizations
+            if principal.organization_ids
             else None
         )
     result, pagination_metadata = await list_users(
@@ -144,6 +139,7 @@ async def list_resources(
         organizations=organizations,
         page_size=list_data.page_size,
         page=list_data.page,
+        cursor=list_data.cursor,
         query=list_data.q,
     )
 
@@ -152,6 +148,7 @@ async def list_resources(
         current_page=pagination_metadata.current_page,
         total=pagination_metadata.total_items,
         pages=pagination_metadata.total_pages,
+        next_cursor=pagination_metadata.next_cursor,
     )
 
 
@@ -182,13 +179,13 @@ async def list_resources_with_exams(
     :param list_users: implementation of orgs list.
     :param session_manager: implementation of session to get current user.
     """
-    current_session = await session_manager.get_current_session()
+    principal = await session_manager.get_principal()
     groups = (
-        [gp.id for gp in current_session.user.groups if not groups or gp.id in groups]
-        if current_session.user.groups
+        [gp.id for gp in principal.groups if not groups or gp.id in groups]
+        if principal.groups
         else []
     )
-    organizations = [org.id for org in current_session.user.organizations]
+    organizations = list(principal.organization_ids)
 
     roles = await list_roles(scope="user")
     role_ids = [role.id for role in roles[0]]
@@ -199,15 +196,17 @@ async def list_resources_with_exams(
         role_ids=role_ids,
         page_size=list_data.page_size,
         page=list_data.page,
+        cursor=list_data.cursor,
         query=list_data.q,
         show_finished=show_finished,
     )
 
     return schemas.UserWithExamsList(
-        items=result,
+        items=[schemas.UserWithExams.from_orm(item) for item in result],
         current_page=pagination_metadata.current_page,
         total=pagination_metadata.total_items,
         pages=pagination_metadata.total_pages,
+        next_cursor=pagination_metadata.next_cursor,
     )
 
 
@@ -233,24 +232,20 @@ async def list_dashboard(
     exam_start_date: datetime | None = fastapi.Query(default=None),
     exam_end_date: datetime | None = fastapi.Query(default=None),
 ) -> list[UserResult]:
-    current_session = await session_manager.get_current_session()
-    if "admin" not in current_session.user.role.scopes:
+    principal = await session_manager.get_principal()
+    if "admin" not in principal.scopes:
         groups = (
-            [
-                str(gp.id)
-                for gp in current_session.user.groups
-                if not groups or gp.id in groups
-            ]
-            if current_session.user.groups
+            [str(gp.id) for gp in principal.groups if not groups or gp.id in groups]
+            if principal.groups
             else None
         )
         organizations = (
             [
-                str(org.id)
-                for org in current_session.user.organizations
-                if not organizations or org.id in organizations
+                str(org_id)
+                for org_id in principal.organization_ids
+                if not organizations or org_id in organizations
             ]
-            if current_session.user.organizations
+            if principal.organization_ids
             else None
         )
     return [
@@ -301,7 +296,9 @@ async def create(
     list_organizations: ports.ListOrganizations = fastapi_injector.Injected(
         ports.ListOrganizations
     ),
-    hash_ctx: context.CryptContext = fastapi_injector.Injected(context.CryptContext),
+    hasher: passwords.PasswordHasher = fastapi_injector.Injected(
+        passwords.PasswordHasher
+    ),
 ) -> schemas.UserGet:
     """
     Create user.
@@ -328,7 +325,7 @@ async def create(
         user_model = await crud.create_user(
             body_dict=body_dict,
             role=role,
-            hash_ctx=hash_ctx,
+            hasher=hasher,
             groups=groups if body.groups is not None else None,
             organizations=orgs if body.organizations is not None else None,
         )
@@ -350,6 +347,9 @@ async def delete(
     session_manager: sess_mg.SessionManager = fastapi.Depends(
         dependencies.get_session_manager
     ),
+    cache: session_cache.SessionCache = fastapi_injector.Injected(
+        session_cache.SessionCache
+    ),
 ) -> fastapi.Response:
     """
     Delete user.
@@ -359,13 +359,14 @@ async def delete(
     :param uow_builder: implementation user get query.
     :param body: parsed data for user deletion.
     """
-    current_user = await session_manager.get_current_session()
+    current_user = await session_manager.get_principal()
     if current_user.user_id == user_id:
         raise errors.CantDeleteYourself()
     async with uow_builder() as uow:
         user = await uow.user_repository.get(user_id)
         await uow.user_repository.delete(user)
         await uow.commit()
+    cache.invalidate_user(user_id)
 
     return fastapi.Response(status_code=fastapi.status.HTTP_204_NO_CONTENT)
 
@@ -430,7 +431,9 @@ async def import_users_batch(
         ports.UnitOfWorkBuilder
     ),
     storage: ports.Storage = fastapi_injector.Injected(ports.Storage),
-    hash_ctx: context.CryptContext = fastapi_injector.Injected(context.CryptContext),
+    hasher: passwords.PasswordHasher = fastapi_injector.Injected(
+        passwords.PasswordHasher
+    ),
     body: ImportData = fastapi.Body(...),
 ) -> fastapi.Response:
     """
@@ -480,6 +483,15 @@ async def import_users_batch(
             await crud.update_user(
                 user_tmp, schemas.UserPatch.parse_obj(user_data).dict(), groups, orgs
             )
+        with_password = [
+            user
+            for user_result in result.values()
+            for user in user_result
+            if user.get("password") and user.get("type", "password") == "password"
+        ]
+        hashes = await hasher.hash_many([user["password"] for user in with_password])
+        for user, password_hash in zip(with_password, hashes, strict=True):
+            user["password_hash"] = password_hash
         new_users = []
         for user_result in result.values():
             for user in user_result:
@@ -497,7 +509,7 @@ async def import_users_batch(
                     role = await uow.role_repository.get(role_id)
                     cached_role[role_id] = role
                 new_users.append(
-                    await crud.create_user(user, role, hash_ctx, user_groups, user_orgs)
+                    await crud.create_user(user, role, hasher, user_groups, user_orgs)
                 )
         await uow.add_all(new_users)
         await uow.commit()
@@ -537,16 +549,14 @@ async def list_exams_to_process(
 
     :param list_exams: implementation of orgs list.
     """
-    session = await session_manager.get_current_session()
-    scopes = session.user.role.scopes
-    if "user" in scopes and user_id == session.user_id:
-        if not session.user.groups:
+    principal = await session_manager.get_principal()
+    scopes = principal.scopes
+    if "user" in scopes and user_id == principal.user_id:
+        if not principal.groups:
             raise errors.NotFound("group")
-        group_id = session.user.groups[0].id
+        group_id = principal.groups[0].id
     elif "user.impersonate" in scopes or "user.list" in scopes:
-        impersonate_list = await list_personifiable(
-            groups=[group.id for group in session.user.groups]
-        )
+        impersonate_list = await list_personifiable(groups=principal.group_ids)
         if not (
             user_tb_imp := next(
                 user_imp for user_imp in impersonate_list if user_imp.id == user_id
@@ -562,6 +572,7 @@ async def list_exams_to_process(
         group_id=group_id,
         page_size=list_data.page_size,
         page=list_data.page,
+        cursor=list_data.cursor,
     )
 
     return schemas.ExamWithStatusList(
@@ -578,6 +589,7 @@ async def list_exams_to_process(
         current_page=pagination_metadata.current_page,
         total=pagination_metadata.total_items,
         pages=pagination_metadata.total_pages,
+        next_cursor=pagination_metadata.next_cursor,
     )
 
 
@@ -606,16 +618,14 @@ async def list_exams_with_results(
 
     :param list_exams: implementation of orgs list.
     """
-    session = await session_manager.get_current_session()
-    scopes = session.user.role.scopes
-    if "user" in scopes and user_id == session.user_id:
-        if not session.user.groups:
+    principal = await session_manager.get_principal()
+    scopes = principal.scopes
+    if "user" in scopes and user_id == principal.user_id:
+        if not principal.groups:
             raise errors.NotFound("group")
-        group_id = session.user.groups[0].id
+        group_id = principal.groups[0].id
     elif "user.impersonate" in scopes or "user.list" in scopes:
-        impersonate_list = await list_personifiable(
-            groups=[group.id for group in session.user.groups]
-        )
+        impersonate_list = await list_personifiable(groups=principal.group_ids)
         if not (
             user_tb_imp := next(
                 user_imp for user_imp in impersonate_list if user_imp.id == user_id
@@ -660,16 +670,14 @@ async def get_questions(
 
     :param list_questions: implementation of questions list.
     """
-    session = await session_manager.get_current_session()
-    scopes = session.user.role.scopes
-    if "user" in scopes and user_id == session.user_id:
-        if not session.user.groups:
+    principal = await session_manager.get_principal()
+    scopes = principal.scopes
+    if "user" in scopes and user_id == principal.user_id:
+        if not principal.groups:
             raise errors.NotFound("group")
-        group_id = session.user.groups[0].id
+        group_id = principal.groups[0].id
     elif "user.impersonate" in scopes:
-        impersonate_list = await list_personifiable(
-            groups=[group.id for group in session.user.groups]
-        )
+        impersonate_list = await list_personifiable(groups=principal.group_ids)
         if not (
             user_tb_imp := next(
                 user_imp for user_imp in impersonate_list if user_imp.id == user_id
@@ -736,17 +744,15 @@ async def send_question_data(
 
     :param list_pending_questions: implementation of questions list.
     """
-    user_session = await session_manager.get_current_session()
-    scopes = user_session.user.role.scopes
-    if "user" in scopes and user_id == user_session.user_id:
-        if not user_session.user.groups:
+    principal = await session_manager.get_principal()
+    scopes = principal.scopes
+    if "user" in scopes and user_id == principal.user_id:
+        if not principal.groups:
             raise errors.NotFound("group")
-        group_id = user_session.user.groups[0].id
-        organization_id = user_session.user.organizations[0].id
+        group_id = principal.groups[0].id
+        organization_id = principal.organization_ids[0]
     elif "user.impersonate" in scopes:
-        impersonate_list = await list_personifiable(
-            groups=[group.id for group in user_session.user.groups]
-        )
+        impersonate_list = await list_personifiable(groups=principal.group_ids)
         if not (
             user_tb_imp := next(
                 user_imp for user_imp in impersonate_list if user_imp.id == user_id
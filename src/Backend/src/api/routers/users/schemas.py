@@ -59,9 +59,10 @@ class ExamWithStatusList(pydantic.BaseModel):
     """
 
     items: list[ExamWithStatus]
-    pages: int
-    current_page: int
-    total: int
+    pages: int | None
+    current_page: int | None
+    total: int | None
+    next_cursor: str | None = None
 
 
 class UserWithExams(pydantic.BaseModel):
@@ -89,9 +90,10 @@ class UserList(pydantic.BaseModel):
     """
 
     items: list[User]
-    pages: int
-    current_page: int
-    total: int
+    pages: int | None
+    current_page: int | None
+    total: int | None
+    next_cursor: str | None = None
 
 
 class UserWithExamsList(pydantic.BaseModel):
@@ -100,9 +102,10 @@ class UserWithExamsList(pydantic.BaseModel):
     """
 
     items: list[UserWithExams]
-    pages: int
-    current_page: int
-    total: int
+    pages: int | None
+    current_page: int | None
+    total: int | None
+    next_cursor: str | None = None
 
 
 class UserGet(User):
@@ -4,6 +4,7 @@ Module containing custom typings
 
 from __future__ import annotations
 
+import datetime
 import typing
 import uuid
 
@@ -36,12 +37,15 @@ class Paginated:
 class PaginationMetadata:
     """
     Dataclass for the pagination metadata.
+
+    Cursor pages don't count the items, so they only have the `next_cursor`.
     """
 
-    current_page: int
-    total_pages: int
-    total_items: int
+    current_page: int | None
+    total_pages: int | None
+    total_items: int | None
     page_size: int
+    next_cursor: str | None = None
 
 
 class Message:
@@ -89,3 +93,140 @@ class CreateOrUpdateUser:
     county: str | None
     orgs_customer_id: list[str] | None
     groups_customer_id: list[str] | None
+
+
+@dataclasses.dataclass(frozen=True)
+class ActiveExam:
+    """
+    Exam of the active exam catalog.
+    """
+
+    id: uuid.UUID
+    grade: models.Grades
+    start_date: datetime.datetime
+    end_date: datetime.datetime
+
+    def is_running(self, now: datetime.datetime) -> bool:
+        """
+        Whether the exam has started and not ended at `now`.
+        """
+        return self.start_date <= now < self.end_date
+
+
+@dataclasses.dataclass(frozen=True)
+class ExamWithStatus:
+    """
+    Started exam of a user, with the status of its answers.
+    """
+
+    id: uuid.UUID
+    name: str
+    start_date: datetime.datetime
+    end_date: datetime.datetime
+    status: models.ExamStatus | None
+
+
+@dataclasses.dataclass(frozen=True)
+class UserWithExams:
+    """
+    User listed with the exams of its groups.
+    """
+
+    id: uuid.UUID
+    name: str
+    email_address: str
+    role_id: uuid.UUID
+    exams: tuple[ExamWithStatus, ...]
+
+
+class ScoringContext(typing.NamedTuple):
+    """
+    What scoring an answer needs, read in one query.
+
+    The answer and the exam user are bound to the session that read them, so
+    changing them updates their rows on commit.
+    """
+
+    answer: models.ExamUserQuestion
+    exam_user: models.ExamUser | None
+    question_type: models.QuestionType
+    pending_count: int
+    group_name: str
+    group_grade: models.Grades
+    exam_name: str
+    exam_start_date: datetime.datetime
+    exam_end_date: datetime.datetime
+    organization_name: str
+    organization_city: str
+    organization_state: str
+    organization_region: str | None
+    organization_county: str
+    user_name: str
+    user_customer_id: str | None
+
+    def is_last_answer(self, now: datetime.datetime) -> bool:
+        """
+        Whether the answer is the only pending one of an exam running at `now`.
+        """
+        return self.pending_count == 1 and self.exam_start_date <= now < (
+            self.exam_end_date
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class PrincipalGroup:
+    """
+    Group of the authenticated user.
+    """
+
+    id: uuid.UUID
+    organization_id: uuid.UUID
+
+
+@dataclasses.dataclass(frozen=True)
+class Principal:
+    """
+    What the endpoints need to authorize the user of a session.
+    """
+
+    session_id: uuid.UUID
+    user_id: uuid.UUID
+    name: str
+    scopes: tuple[str, ...]
+    groups: tuple[PrincipalGroup, ...]
+    organization_ids: tuple[uuid.UUID, ...]
+    state: str | None
+    region: str | None
+    county: str | None
+    expires_at: datetime.datetime
+    generation: int
+
+    @property
+    def group_ids(self) -> list[uuid.UUID]:
+        """
+        Ids of the groups of the user.
+        """
+        return [group.id for group in self.groups]
+
+    @classmethod
+    def from_session(cls, session_model: models.Session) -> Principal:
+        """
+        Build the principal from a session with its user loaded.
+        """
+        user = session_model.user
+        return cls(
+            session_id=session_model.id,
+            user_id=session_model.user_id,
+            name=user.name,
+            scopes=tuple(user.role.scopes),
+            groups=tuple(
+                PrincipalGroup(id=group.id, organization_id=group.organization_id)
+                for group in user.groups
+            ),
+            organization_ids=tuple(org.id for org in user.organizations),
+            state=user.state,
+            region=user.region,
+            county=user.county,
+            expires_at=session_model.expires_at,
+            generation=session_model.generation,
+        )
@@ -20,7 +20,7 @@ import sqlalchemy as sa
 from alembic import config
 from api import models
 from api.adapters.google import BigQuery, CloudStorage, SpeechToText
-from api.helpers import time_now, util
+from api.helpers import passwords, time_now, util
 from google.cloud.speech_v1p1beta1.types import (
     SpeechRecognitionAlternative,
     SpeechRecognitionResult,
@@ -54,6 +54,14 @@ def hash_ctx() -> context.CryptContext:
     return ctx
 
 
+@pytest.fixture
+def hasher(hash_ctx: context.CryptContext) -> passwords.PasswordHasher:
+    """
+    Password hasher on a single thread.
+    """
+    return passwords.PasswordHasher(hash_ctx, max_workers=1, bulk_workers=1)
+
+
 @pytest.fixture
 def engine_factory_mock() -> typing.Any:
     """
@@ -188,7 +196,12 @@ def cloud_stt(
     """
     Instantiating cloud stt with patched client.
     """
-    return SpeechToText(project_id="", creds_path="...", storage=cloud_storage)
+    return SpeechToText(
+        project_id="",
+        creds_path="...",
+        storage=cloud_storage,
+        audio_processor=unittest.mock.AsyncMock(),
+    )
 
 
 @pytest.fixture
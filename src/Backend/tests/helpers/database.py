@@ -32,6 +32,7 @@ def create_test_container() -> injector.Injector:
         return _container
     modules = (
         dependencies.SettingsModule(),
+        dependencies.AudioModule(),
         dependencies.EngineTestSQLAlchemy(),
         dependencies.SQLAlchemyModule(),
         dependencies.MemoryModule(),
@@ -168,7 +169,11 @@ async def exam() -> typing.AsyncGenerator[models.Exam, None]:
         created_at=time_now(),
         updated_at=time_now(),
     )
-    select_stmt = sa.select(models.Exam).where(models.Exam.id == exam_id)
+    select_stmt = (
+        sa.select(models.Exam)
+        .options(orm.selectinload(models.Exam.questions))
+        .where(models.Exam.id == exam_id)
+    )
     async with session_factory() as session:
         await session.execute(stmt)
         await session.commit()
@@ -303,7 +308,9 @@ async def group(org: models.Organization) -> typing.AsyncGenerator[models.Group,
 
 
 @contextlib.asynccontextmanager
-async def role(scope: str = "test") -> typing.AsyncGenerator[models.Role, None]:
+async def role(
+    scope: str = "test", name: str = "test role"
+) -> typing.AsyncGenerator[models.Role, None]:
     """
     Generate session.
     """
@@ -312,7 +319,7 @@ async def role(scope: str = "test") -> typing.AsyncGenerator[models.Role, None]:
     role_id = uuid.uuid4()
     stmt = sa.insert(models.Role).values(
         id=role_id,
-        name="test role",
+        name=name,
         display_name={},
         description={},
         scopes=[scope],
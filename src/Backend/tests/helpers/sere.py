@@ -0,0 +1,52 @@
+"""
+Fake SERE api server for tests.
+"""
+
+import collections
+import contextlib
+import dataclasses
+import typing
+
+from aiohttp import test_utils, web
+
+
+@dataclasses.dataclass
+class FakeSere:
+    """
+    Records served by the fake server, by endpoint and NRE.
+
+    `failures` holds the statuses answered before the records, by endpoint and NRE.
+    """
+
+    records: dict[str, dict[int, list[dict[str, typing.Any]]]]
+    failures: dict[tuple[str, int], list[int]] = dataclasses.field(default_factory=dict)
+    requests: collections.Counter[tuple[str, int]] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+    base_url: str = ""
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """
+        Answer the NRE page of the endpoint.
+        """
+        key = (request.match_info["endpoint"], int(request.match_info["nre"]))
+        self.requests[key] += 1
+        if statuses := self.failures.get(key):
+            return web.Response(status=statuses.pop(0))
+        return web.json_response(self.records.get(key[0], {}).get(key[1], []))
+
+
+@contextlib.asynccontextmanager
+async def fake_sere(
+    records: dict[str, dict[int, list[dict[str, typing.Any]]]],
+    failures: dict[tuple[str, int], list[int]] | None = None,
+) -> typing.AsyncGenerator[FakeSere, None]:
+    """
+    Run a local server answering like the SERE api.
+    """
+    fake = FakeSere(records, failures or {})
+    app = web.Application()
+    app.router.add_get("/{endpoint}/{nre}", fake.handle)
+    async with test_utils.TestServer(app) as server:
+        fake.base_url = str(server.make_url("")).rstrip("/")
+        yield fake
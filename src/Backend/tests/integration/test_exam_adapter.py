@@ -107,7 +107,7 @@ async def test_list_exam_models_query(
 
         items, params = await list_exam_models(page_size=page_size)
         assert len(items) == len(expected_paginated)
-        assert items == expected_paginated
+        assert [item.id for item in items] == [item.id for item in expected_paginated]
         assert params == expected_metadata
 
 
@@ -191,12 +191,19 @@ async def test_list_pending_exams() -> None:
             database.user(role_model=user_role, group_model=group_model)
         )
         exam_model = await stack.enter_async_context(database.exam())
-        list_pending = exam.ListPendingExams(session_factory)
+        await stack.enter_async_context(database.question(exam_model))
+        await stack.enter_async_context(database.question(exam_model))
+        list_pending = exam.ListPendingExams(
+            session_factory, exam.ActiveExamCatalog(session_factory)
+        )
 
-        pending_result, _ = await list_pending(
+        pending_result, metadata = await list_pending(
             user_id=user_model.id, group_id=user_model.groups[0].id
         )
-        assert pending_result == [(exam_model, None)]
+        assert [(item.id, status) for item, status in pending_result] == [
+            (exam_model.id, None)
+        ]
+        assert metadata.total_items == 1
 
 
 @pytest.mark.asyncio
@@ -217,7 +224,9 @@ async def test_list_pending_questions() -> None:
         )
         exam_model = await stack.enter_async_context(database.exam())
         question_model = await stack.enter_async_context(database.question(exam_model))
-        list_pending = exam.ListPendingQuestions(session_factory)
+        list_pending = exam.ListPendingQuestions(
+            session_factory, exam.ActiveExamCatalog(session_factory)
+        )
 
         pending_result = await list_pending(
             user_id=user.id, group_id=user.groups[0].id, exam_id=exam_model.id
@@ -243,7 +252,9 @@ async def test_get_pending_question() -> None:
         )
         exam_model = await stack.enter_async_context(database.exam())
         question_model = await stack.enter_async_context(database.question(exam_model))
-        get_pending = exam.GetPendingQuestion(session_factory)
+        get_pending = exam.GetPendingQuestion(
+            session_factory, exam.ActiveExamCatalog(session_factory)
+        )
 
         pending_result = await get_pending(
             user_id=user.id,
@@ -291,8 +302,34 @@ async def test_get_question_result() -> None:
         exam_user_model = await stack.enter_async_context(
             database.exam_user_status(exam_model=exam_model, user_model=user_model)
         )
-        get_result = exam.GetExamUserStatus(session_factory)
+        get_result = exam.GetExamUserStatus(
+            session_factory, exam.ActiveExamCatalog(session_factory)
+        )
         result = await get_result(
             user_id=user_model.id, exam_id=exam_model.id, group_id=group.id
         )
         assert result == exam_user_model
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+async def test_should_cache_running_exams_until_invalidated() -> None:
+    """
+    tests it should serve the running exams from the catalog until invalidated.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        session_factory = await stack.enter_async_context(
+            database.session_factory_ctx()
+        )
+        org = await stack.enter_async_context(database.organization())
+        group = await stack.enter_async_context(database.group(org))
+        first_exam = await stack.enter_async_context(database.exam())
+        catalog = exam.ActiveExamCatalog(session_factory, ttl=3600)
+
+        assert [item.id for item in await catalog.running(group.id)] == [first_exam.id]
+        second_exam = await stack.enter_async_context(database.exam())
+        assert not await catalog.is_running(group.id, second_exam.id)
+
+        catalog.invalidate()
+        assert await catalog.is_running(group.id, second_exam.id)
+        assert await catalog.running(org.id) == []
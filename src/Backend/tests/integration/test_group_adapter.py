@@ -170,3 +170,42 @@ async def test_should_raise_already_exists() -> None:
         new_group_same_data.id = group_model.id
         with pytest.raises(errors.AlreadyExists):
             await uow.group_repository.create(new_group_same_data)
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+async def test_should_create_or_update_group_from_index() -> None:
+    """
+    tests it should find and keep the groups in the customer id index.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        org = await stack.enter_async_context(database.organization())
+        uow = await stack.enter_async_context(database.uow_ctx())
+        updated_orgs = {"org": org}
+        cached_groups: dict[str, models.Group] = {}
+        sync_group = typings.CreateOrUpdateGroup(
+            name="first",
+            customer_id="group",
+            grade=models.Grades.SECOND_FUND,
+            shift=models.Shifts.MORNING,
+        )
+
+        created = await uow.group_repository.create_or_update(
+            sync_group, "org", updated_orgs, cached_groups
+        )
+        assert created is not None
+        assert cached_groups == {"group": created}
+
+        sync_group.name = "renamed"
+        updated = await uow.group_repository.create_or_update(
+            sync_group, "org", updated_orgs, cached_groups
+        )
+        assert updated is created
+        assert created.name == "renamed"
+
+        assert (
+            await uow.group_repository.create_or_update(
+                sync_group, "missing", updated_orgs, cached_groups
+            )
+            is None
+        )
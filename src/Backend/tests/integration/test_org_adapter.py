@@ -157,3 +157,44 @@ async def test_should_raise_already_exists() -> None:
         new_org_same_data.id = org.id
         with pytest.raises(errors.AlreadyExists):
             await uow.organization_repository.create(new_org_same_data)
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+async def test_should_list_orgs_by_cursor() -> None:
+    """
+    tests it should page through the orgs by cursor without counting them.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        session_factory = await stack.enter_async_context(
+            database.session_factory_ctx()
+        )
+        await stack.enter_async_context(database.clear_between_tests())
+        list_orgs = organization.ListOrganizations(session_factory)
+        async with session_factory() as session:
+            schema_models = [
+                models.Organization(
+                    name=f"org {index}",
+                    city="city",
+                    state="SP",
+                    region=None,
+                    county="c",
+                    customer_id=None,
+                )
+                for index in range(7)
+            ]
+            session.add_all(schema_models)
+            await session.commit()
+        expected = sorted(
+            schema_models, key=lambda x: (x.updated_at, x.id), reverse=True
+        )
+
+        items: list[models.Organization] = []
+        cursor: str | None = ""
+        while cursor is not None:
+            page, params = await list_orgs(page_size=3, cursor=cursor)
+            assert params.total_items is None
+            assert params.total_pages is None
+            items.extend(page)
+            cursor = params.next_cursor
+        assert items == expected
@@ -0,0 +1,107 @@
+"""
+Module for testing that the frequent lookups are served by an index.
+"""
+
+import contextlib
+import typing
+import uuid
+
+import pytest
+import sqlalchemy as sa
+from api import models
+
+from tests.helpers import database
+
+USER_ID = uuid.uuid4()
+EXAM_ID = uuid.uuid4()
+GROUP_ID = uuid.uuid4()
+
+euq = models.ExamUserQuestion
+
+LOOKUPS: dict[str, tuple[str, sa.Select[typing.Any]]] = {
+    "pending answers of a user": (
+        "exams_users_questions",
+        sa.select(sa.func.count())
+        .select_from(euq)
+        .where(euq.user_id == USER_ID)
+        .where(euq.exam_id == EXAM_ID)
+        .where(euq.status != models.ExamStatus.FINISHED),
+    ),
+    "answer statuses of an exam": (
+        "exams_users_questions",
+        sa.select(euq.user_id, euq.status).where(euq.exam_id == EXAM_ID),
+    ),
+    "answers of a user in an exam": (
+        "exams_users_questions",
+        sa.select(euq.id)
+        .where(euq.exam_id == EXAM_ID)
+        .where(euq.user_id == USER_ID)
+        .where(euq.status == models.ExamStatus.FINISHED),
+    ),
+    "answers of a group": (
+        "exams_users_questions",
+        sa.select(euq.id).where(euq.group_id == GROUP_ID).where(euq.exam_id == EXAM_ID),
+    ),
+    "groups by customer id": (
+        "groups",
+        sa.select(models.Group.id).where(models.Group.customer_id.in_(["1", "2"])),
+    ),
+    "organizations by customer id": (
+        "organizations",
+        sa.select(models.Organization.id).where(
+            models.Organization.customer_id.in_(["1", "2"])
+        ),
+    ),
+    "users by customer id": (
+        "users",
+        sa.select(models.User.id).where(models.User.customer_id.in_(["1", "2"])),
+    ),
+    "users page": (
+        "users",
+        sa.select(models.User.id)
+        .order_by(models.User.updated_at.desc(), models.User.id.desc())
+        .limit(10),
+    ),
+    "running exams": (
+        "exams",
+        sa.select(models.Exam.id)
+        .order_by(models.Exam.start_date.desc(), models.Exam.id.desc())
+        .limit(10),
+    ),
+}
+
+
+def _scanned_tables(plan: dict[str, typing.Any]) -> typing.Iterator[str]:
+    """
+    Tables read with a sequential scan in the plan and its children.
+    """
+    if plan["Node Type"] == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _scanned_tables(child)
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+@pytest.mark.parametrize("lookup", LOOKUPS)
+async def test_should_use_an_index(lookup: str) -> None:
+    """
+    tests it should plan the lookup with an index instead of a table scan.
+
+    Sequential scans are disabled so the tiny test tables don't make them the
+    cheapest plan, the planner only falls back to one when no index applies.
+    """
+    table, stmt = LOOKUPS[lookup]
+    async with contextlib.AsyncExitStack() as stack:
+        session_factory = await stack.enter_async_context(
+            database.session_factory_ctx()
+        )
+        session = await stack.enter_async_context(session_factory())
+        sql = stmt.compile(
+            dialect=session.get_bind().dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        await session.execute(sa.text("SET LOCAL enable_seqscan = off"))
+        plan = await session.scalar(sa.text(f"EXPLAIN (FORMAT JSON) {sql}"))
+
+    assert table not in set(_scanned_tables(plan[0]["Plan"])), plan
@@ -0,0 +1,68 @@
+"""
+Module for testing the result repository.
+"""
+
+import contextlib
+
+import pytest
+from api import models
+
+from tests.helpers import database
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+async def test_should_get_scoring_context() -> None:
+    """
+    tests it should read the answer with what scoring it needs and update it.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        await stack.enter_async_context(database.clear_between_tests())
+        user_role = await stack.enter_async_context(database.role("user"))
+        org = await stack.enter_async_context(database.organization())
+        group = await stack.enter_async_context(database.group(org))
+        user = await stack.enter_async_context(
+            database.user(role_model=user_role, group_model=group)
+        )
+        exam_model = await stack.enter_async_context(database.exam())
+        question_model = await stack.enter_async_context(database.question(exam_model))
+        await stack.enter_async_context(
+            database.exam_user_status(exam_model=exam_model, user_model=user)
+        )
+        uow_builder = await stack.enter_async_context(database.uow_builder_ctx())
+        async with uow_builder() as uow:
+            answer = await uow.result_repository.create(
+                models.ExamUserQuestion(
+                    user_id=user.id,
+                    exam_id=exam_model.id,
+                    question_id=question_model.id,
+                    group_id=group.id,
+                    organization_id=org.id,
+                    result=[],
+                    right_count=0,
+                    audio_url="",
+                    user_accuracy=0.0,
+                    total_accuracy=0.0,
+                )
+            )
+            await uow.commit()
+
+        async with uow_builder() as uow:
+            context = await uow.result_repository.get_scoring_context(answer.id)
+            assert context.answer.id == answer.id
+            assert context.question_type == question_model.type
+            assert context.pending_count == 1
+            assert context.group_name == group.name
+            assert context.exam_end_date == exam_model.end_date
+            assert context.organization_county == org.county
+            assert context.user_customer_id == user.customer_id
+            assert context.exam_user
+            context.answer.status = models.ExamStatus.FINISHED
+            context.exam_user.status = models.ExamStatus.FINISHED
+            await uow.commit()
+
+        async with uow_builder() as uow:
+            context = await uow.result_repository.get_scoring_context(answer.id)
+            assert context.pending_count == 0
+            assert context.exam_user
+            assert context.exam_user.status == models.ExamStatus.FINISHED
@@ -7,7 +7,7 @@ import datetime
 import uuid
 
 import pytest
-from api import errors, models
+from api import errors, models, typings
 from api.adapters.sqlalchemy import session_query
 from api.helpers import time_now
 
@@ -46,6 +46,38 @@ async def test_get_session_model_query() -> None:
         assert response == session_model
 
 
+@pytest.mark.asyncio
+@pytest.mark.database
+async def test_should_get_principal_in_one_query() -> None:
+    """
+    tests it should load the principal with its groups and organizations.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        await stack.enter_async_context(database.clear_between_tests())
+        session_factory = await stack.enter_async_context(
+            database.session_factory_ctx()
+        )
+        role_model = await stack.enter_async_context(database.role())
+        org = await stack.enter_async_context(database.organization())
+        group_model = await stack.enter_async_context(database.group(org))
+        user_model = await stack.enter_async_context(
+            database.user(role_model, group_model)
+        )
+        session_model = await stack.enter_async_context(
+            database.session_model(user_model)
+        )
+        get_principal = session_query.GetPrincipal(session_factory)
+        principal = await get_principal(session_model.id)
+        assert principal is not None
+        assert principal.user_id == user_model.id
+        assert principal.scopes == tuple(role_model.scopes)
+        assert principal.groups == (
+            typings.PrincipalGroup(id=group_model.id, organization_id=org.id),
+        )
+        assert principal.organization_ids == ()
+        assert await get_principal(uuid.uuid4()) is None
+
+
 @pytest.mark.asyncio
 @pytest.mark.database
 async def test_get_session_model_repo_query() -> None:
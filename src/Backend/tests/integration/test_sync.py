@@ -0,0 +1,176 @@
+"""
+Module for testing the sync with the SERE api.
+"""
+
+import contextlib
+import copy
+
+import aiohttp
+import pytest
+import sqlalchemy as sa
+from api import models, ports, typings
+from api.adapters import sere
+from api.routers.processor import endpoints
+
+from tests.helpers import database
+from tests.helpers import sere as fake
+
+RECORDS = {
+    "escola": {
+        1: [{"codMec": 10, "descEscola": "Escola", "descNre": "NRE", "descMun": "X"}],
+        2: [{"codMec": 10, "descEscola": "Escola", "descNre": "NRE", "descMun": "X"}],
+    },
+    "turma": {
+        1: [
+            {
+                "codTurma": 20,
+                "codMec": 10,
+                "codSeriacao": 1211,
+                "descSeriacao": "2 ano",
+                "descTurma": "A",
+                "descTurno": "Manhã",
+            },
+            {
+                "codTurma": 21,
+                "codMec": 10,
+                "codSeriacao": 1,
+                "descSeriacao": "1 ano",
+                "descTurma": "A",
+                "descTurno": "Manhã",
+            },
+        ]
+    },
+    "matricula": {
+        1: [{"cgm": "30", "nome": "Aluno", "codTurma": 20}],
+        3: [{"cgm": "31", "nome": "Outro", "codTurma": 20}],
+    },
+    "professor": {
+        1: [
+            {
+                "cpfProfessor": "40",
+                "nomeProfessor": "Professor",
+                "emailProfessor": "professor@example.com",
+                "codTurma": 20,
+                "codMec": 10,
+            }
+        ],
+        2: [
+            {
+                "cpfProfessor": "40",
+                "nomeProfessor": "Professor",
+                "emailProfessor": "professor@example.com",
+                "codTurma": 21,
+                "codMec": 10,
+            }
+        ],
+    },
+}
+
+
+async def _ensure_role(stack: contextlib.AsyncExitStack, name: str) -> None:
+    """
+    Create the role used by the sync when the migrations' one was removed.
+    """
+    session_factory = database.create_test_container().get(typings.SessionFactory)
+    async with session_factory() as session:
+        result = await session.execute(
+            sa.select(models.Role.id).where(models.Role.name == name)
+        )
+        if result.first():
+            return
+    await stack.enter_async_context(database.role(name=name))
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+async def test_should_sync_from_sere() -> None:
+    """
+    tests it should import the SERE records streamed page by page.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        for name in ("user", "professor"):
+            await _ensure_role(stack, name)
+        await stack.enter_async_context(database.clear_between_tests())
+        server = await stack.enter_async_context(fake.fake_sere(RECORDS))
+        sere_api = sere.SereApi("key", base_url=server.base_url, backoff=0)
+        stack.push_async_callback(sere_api.close)
+        uow_builder = database.create_test_container().get(ports.UnitOfWorkBuilder)
+
+        response = await endpoints.sync_database(uow_builder, sere_api)
+        assert response.status_code == 200
+
+        async with uow_builder() as uow:
+            organizations = await uow.organization_repository.list(customer_ids=["10"])
+            groups = await uow.group_repository.list(customer_ids=["20", "21"])
+            users = await uow.user_repository.list(customer_ids=["30", "31", "40"])
+    assert [org.name for org in organizations] == ["Escola"]
+    assert [group.customer_id for group in groups] == ["20"]
+    assert sorted(str(user.customer_id) for user in users) == ["30", "31", "40"]
+    for user in users:
+        assert [group.customer_id for group in user.groups] == ["20"]
+        assert [org.customer_id for org in user.organizations] == ["10"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+async def test_should_write_only_changed_entities() -> None:
+    """
+    tests it should not touch the entities whose content did not change.
+    """
+    records = copy.deepcopy(RECORDS)
+    async with contextlib.AsyncExitStack() as stack:
+        for name in ("user", "professor"):
+            await _ensure_role(stack, name)
+        await stack.enter_async_context(database.clear_between_tests())
+        server = await stack.enter_async_context(fake.fake_sere(records))
+        sere_api = sere.SereApi("key", base_url=server.base_url, backoff=0)
+        stack.push_async_callback(sere_api.close)
+        uow_builder = database.create_test_container().get(ports.UnitOfWorkBuilder)
+
+        await endpoints.sync_database(uow_builder, sere_api)
+        async with uow_builder() as uow:
+            before = {
+                user.customer_id: user.updated_at
+                for user in await uow.user_repository.list(customer_ids=["30", "31"])
+            }
+        records["matricula"][3][0]["nome"] = "Renomeado"
+        await endpoints.sync_database(uow_builder, sere_api)
+
+        async with uow_builder() as uow:
+            users = await uow.user_repository.list(customer_ids=["30", "31"])
+    after = {user.customer_id: user for user in users}
+    assert after["30"].updated_at == before["30"]
+    assert after["31"].updated_at > before["31"]
+    assert after["31"].name == "Renomeado"
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+async def test_should_resume_from_checkpoint() -> None:
+    """
+    tests it should resume a failed sync after its last committed page.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        for name in ("user", "professor"):
+            await _ensure_role(stack, name)
+        await stack.enter_async_context(database.clear_between_tests())
+        server = await stack.enter_async_context(
+            fake.fake_sere(RECORDS, {("matricula", 3): [403]})
+        )
+        sere_api = sere.SereApi("key", base_url=server.base_url, backoff=0)
+        stack.push_async_callback(sere_api.close)
+        uow_builder = database.create_test_container().get(ports.UnitOfWorkBuilder)
+
+        with pytest.raises(aiohttp.ClientResponseError):
+            await endpoints.sync_database(uow_builder, sere_api)
+        async with uow_builder() as uow:
+            users = await uow.user_repository.list(customer_ids=["30", "31"])
+        assert [user.customer_id for user in users] == ["30"]
+
+        await endpoints.sync_database(uow_builder, sere_api)
+        async with uow_builder() as uow:
+            users = await uow.user_repository.list(customer_ids=["30", "31", "40"])
+    assert sorted(str(user.customer_id) for user in users) == ["30", "31", "40"]
+    assert server.requests[("escola", 1)] == 1
+    assert server.requests[("matricula", 1)] == 1
+    assert server.requests[("matricula", 3)] == 2
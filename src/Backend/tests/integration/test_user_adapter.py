@@ -3,10 +3,11 @@ Module for testing the user repository.
 """
 
 import contextlib
+import uuid
 
 import hypothesis
 import pytest
-from api import errors, models
+from api import errors, models, typings
 from api.adapters.sqlalchemy import user
 from api.routers.users import schemas
 from hypothesis import strategies as st
@@ -113,3 +114,176 @@ async def test_should_raise_already_exists() -> None:
         )[0]
         with pytest.raises(errors.AlreadyExists):
             await uow.user_repository.create(new_user_same_data)
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+async def test_should_bulk_create_or_update_students() -> None:
+    """
+    Test of adapter to upsert students and replace their groups.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        role_model = await stack.enter_async_context(database.role())
+        org_model = await stack.enter_async_context(database.organization())
+        group_model = await stack.enter_async_context(database.group(org_model))
+        uow = await stack.enter_async_context(database.uow_ctx())
+
+        def student(customer_id: str, name: str) -> typings.CreateOrUpdateUser:
+            return typings.CreateOrUpdateUser(
+                external_id=None,
+                name=name,
+                email_address=f"{customer_id}@example.com",
+                customer_id=customer_id,
+                type=models.UserType.PASSWORD,
+                role_id=role_model.id,
+                county=None,
+                region=None,
+                state=None,
+                orgs_customer_id=None,
+                groups_customer_id=None,
+            )
+
+        updated_groups = {"group": group_model}
+        written = await uow.user_repository.bulk_create_or_update_students(
+            [(student("1", "first"), "group"), (student("2", "second"), "missing")],
+            updated_groups,
+        )
+        assert written == 1
+        written = await uow.user_repository.bulk_create_or_update_students(
+            [(student("1", "renamed"), "group"), (student("3", "third"), "group")],
+            updated_groups,
+        )
+        assert written == 2
+        written = await uow.user_repository.bulk_create_or_update_students(
+            [(student("1", "renamed"), "group")], updated_groups
+        )
+        assert written == 0
+
+        users = await uow.user_repository.list(customer_ids=["1", "2", "3"])
+        assert sorted((u.customer_id, u.name) for u in users) == [
+            ("1", "renamed"),
+            ("3", "third"),
+        ]
+        for user_model in users:
+            assert [g.id for g in user_model.groups] == [group_model.id]
+            assert [o.id for o in user_model.organizations] == [org_model.id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+async def test_should_list_users_by_cursor() -> None:
+    """
+    tests it should page through the users by cursor, once each user.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        session_factory = await stack.enter_async_context(
+            database.session_factory_ctx()
+        )
+        await stack.enter_async_context(database.clear_between_tests())
+        role_model = await stack.enter_async_context(database.role())
+        org = await stack.enter_async_context(database.organization())
+        first_group = await stack.enter_async_context(database.group(org))
+        second_group = await stack.enter_async_context(database.group(org))
+        async with session_factory() as session:
+            groups = [
+                await session.merge(first_group),
+                await session.merge(second_group),
+            ]
+            users = [
+                models.User(
+                    name=f"user {index}",
+                    type=models.UserType.PASSWORD,
+                    email_address=f"user{index}@aira.com",
+                    external_id=None,
+                    customer_id=None,
+                    groups=groups,
+                    organizations=[],
+                    role_id=role_model.id,
+                    state=None,
+                    region=None,
+                    county=None,
+                )
+                for index in range(5)
+            ]
+            session.add_all(users)
+            await session.commit()
+        expected = [
+            item.id
+            for item in sorted(users, key=lambda x: (x.updated_at, x.id), reverse=True)
+        ]
+
+        list_users = user.ListUsers(session_factory)
+        ids: list[uuid.UUID] = []
+        cursor: str | None = ""
+        while cursor is not None:
+            page, params = await list_users(
+                groups=[first_group.id, second_group.id], page_size=2, cursor=cursor
+            )
+            ids.extend(item.id for item in page)
+            cursor = params.next_cursor
+        assert ids == expected
+
+        with pytest.raises(errors.InvalidField):
+            await list_users(page_size=2, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+async def test_should_list_users_with_exams() -> None:
+    """
+    tests it should list the users with the status of their started exams.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        session_factory = await stack.enter_async_context(
+            database.session_factory_ctx()
+        )
+        await stack.enter_async_context(database.clear_between_tests())
+        role_model = await stack.enter_async_context(database.role())
+        org = await stack.enter_async_context(database.organization())
+        group_model = await stack.enter_async_context(database.group(org))
+        exam_model = await stack.enter_async_context(database.exam())
+        async with session_factory() as session:
+            groups = [await session.merge(group_model)]
+            organizations = [await session.merge(org)]
+            finished, pending = (
+                models.User(
+                    name=name,
+                    type=models.UserType.PASSWORD,
+                    email_address=f"{name}@aira.com",
+                    external_id=None,
+                    customer_id=None,
+                    groups=groups,
+                    organizations=organizations,
+                    role_id=role_model.id,
+                    state=None,
+                    region=None,
+                    county=None,
+                )
+                for name in ("finished", "pending")
+            )
+            session.add_all([finished, pending])
+            await session.commit()
+        exam_user = await stack.enter_async_context(
+            database.exam_user_status(exam_model, finished)
+        )
+        async with session_factory() as session:
+            exam_user.status = models.ExamStatus.FINISHED
+            await session.merge(exam_user)
+            await session.commit()
+
+        list_users = user.ListUsersWithExams(session_factory)
+        items, params = await list_users(
+            groups=[group_model.id], organizations=[org.id], show_finished=True
+        )
+        assert params.total_items == 2  # noqa: PLR2004
+        statuses = {item.id: [exam.status for exam in item.exams] for item in items}
+        assert statuses == {
+            finished.id: [models.ExamStatus.FINISHED],
+            pending.id: [None],
+        }
+
+        items, params = await list_users(
+            groups=[group_model.id], organizations=[org.id], show_finished=False
+        )
+        assert [item.id for item in items] == [pending.id]
+        assert items[0].exams[0].id == exam_model.id
@@ -15,6 +15,7 @@ def test_setup_container() -> None:
     container = injector.Injector(
         (
             dependencies.SettingsModule(),
+            dependencies.AudioModule(),
             dependencies.TracingModule(),
         )
     )
@@ -32,6 +33,7 @@ def test_setup_injector_middleware() -> None:
     container = injector.Injector(
         (
             dependencies.SettingsModule(),
+            dependencies.AudioModule(),
             dependencies.TracingModule(),
         )
     )
@@ -51,6 +53,7 @@ def test_setup_logging_middleware() -> None:
     container = injector.Injector(
         (
             dependencies.SettingsModule(),
+            dependencies.AudioModule(),
             dependencies.TracingModule(),
         )
     )
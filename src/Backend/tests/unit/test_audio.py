@@ -0,0 +1,36 @@
+"""
+Module for tests for the audio processor.
+"""
+
+import asyncio
+import threading
+import unittest.mock
+
+import pytest
+from api.helpers import audio
+
+
+@pytest.mark.asyncio
+async def test_should_limit_concurrency() -> None:
+    """
+    tests it should queue the tasks above the concurrency limit.
+    """
+    release = threading.Event()
+    processor = audio.AudioProcessor(max_workers=4, max_concurrency=1)
+
+    def cut_audio(data: bytes, start_time: float, end_time: float) -> bytes:
+        release.wait(timeout=5)
+        return data[int(start_time) : int(end_time)]
+
+    with unittest.mock.patch("api.helpers.util.cut_audio", cut_audio):
+        tasks = [
+            asyncio.create_task(processor.cut(b"0123456789", start, start + 2))
+            for start in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        assert processor.queue_depth == 2
+        release.set()
+        results = await asyncio.gather(*tasks)
+    processor.shutdown()
+    assert results == [b"01", b"12", b"23"]
+    assert processor.queue_depth == 0
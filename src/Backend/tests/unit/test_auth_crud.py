@@ -19,10 +19,10 @@ from api.adapters.memory import (
     unit_of_work,
     user,
 )
+from api.helpers import key_material, passwords
 from api.helpers import schemas as helper_schema
 from api.routers.auth import crud, schemas
 from hypothesis import strategies as st
-from passlib import context
 
 from tests.helpers import strats
 
@@ -55,7 +55,7 @@ async def test_login(
     credentials: schemas.FirebaseLogin,
     expected: schemas.Session,
     fake_user: models.User,
-    hash_ctx: context.CryptContext,
+    hasher: passwords.PasswordHasher,
 ) -> None:
     """
     tests if auth endpoint calls correctly.
@@ -66,21 +66,21 @@ async def test_login(
     user_repo = user.UserRepository([fake_user])
     uow_builder = unit_of_work.UnitOfWorkBuilder(user_repository=user_repo)
     setts = typings.Settings({})
-    secret_mg = secret_manager.SecretManager()
+    keys = key_material.KeyMaterial(secret_manager.SecretManager())
     async with uow_builder() as db_session:
         with unittest.mock.patch(
             "api.routers.auth.crud.create_session", create_session_mock
         ):
             response = await crud.login(
                 external_login=external_auth.ExternalAuth(),
-                secret_manager=secret_mg,
+                keys=keys,
                 settings=setts,
                 db=db_session,
                 credentials=credentials,
-                hash_ctx=hash_ctx,
+                hasher=hasher,
             )
     create_session_mock.assert_called_once_with(
-        secret_manager=secret_mg,
+        keys=keys,
         db=db_session,
         settings=setts,
         user_id=fake_user.id,
@@ -122,7 +122,7 @@ async def test_create_session(
         "user_id": user_id,
     }
     create_token = functools.partial(side_eff_create_token, data=data)
-    secret_mg = secret_manager.SecretManager()
+    keys = key_material.KeyMaterial(secret_manager.SecretManager())
     setts = typings.Settings({})
     uuid_mock = unittest.mock.Mock()
     uuid_mock.return_value = session_id
@@ -135,7 +135,7 @@ async def test_create_session(
         ):
             token_mock.side_effect = create_token
             response = await crud.create_session(
-                secret_manager=secret_mg,
+                keys=keys,
                 db=db_session,
                 settings=setts,
                 user_id=user_id,
@@ -167,7 +167,7 @@ async def test_should_not_refresh(
     tests that it should not refresh
     """
 
-    secret_mg = secret_manager.SecretManager()
+    keys = key_material.KeyMaterial(secret_manager.SecretManager())
     setts = typings.Settings({})
 
     fake_session = models.Session(
@@ -183,7 +183,7 @@ async def test_should_not_refresh(
     async with uow_builder() as db_session:
         with pytest.raises(errors.SessionExpired):
             await crud.create_session(
-                secret_manager=secret_mg,
+                keys=keys,
                 db=db_session,
                 settings=setts,
                 user_id=user_id,
@@ -229,7 +229,7 @@ async def test_should_refresh_successfully(
         "user_id": user_id,
     }
 
-    secret_mg = secret_manager.SecretManager()
+    keys = key_material.KeyMaterial(secret_manager.SecretManager())
     setts = typings.Settings({})
     create_token = functools.partial(side_eff_create_token, data=data)
 
@@ -248,7 +248,7 @@ async def test_should_refresh_successfully(
         with unittest.mock.patch("api.helpers.auth.create_token") as token_mock:
             token_mock.side_effect = create_token
             response = await crud.create_session(
-                secret_manager=secret_mg,
+                keys=keys,
                 db=db_session,
                 settings=setts,
                 user_id=user_id,
@@ -296,7 +296,7 @@ async def test_refresh_function(
         "user_id": user_id,
     }
 
-    secret_mg = secret_manager.SecretManager()
+    keys = key_material.KeyMaterial(secret_manager.SecretManager())
     setts = typings.Settings({})
 
     fake_session = models.Session(
@@ -317,7 +317,7 @@ async def test_refresh_function(
         ) as create_session_mock:
             create_session_mock.return_value = schemas.Session(**data)
             response = await crud.refresh(
-                secret_manager=secret_mg,
+                keys=keys,
                 settings=setts,
                 db=db_session,
                 token_data=token_data,
@@ -328,7 +328,7 @@ async def test_refresh_function(
             ), current_session
             assert current_session.generation == 1
             create_session_mock.assert_called_with(
-                secret_manager=secret_mg,
+                keys=keys,
                 db=db_session,
                 settings=setts,
                 user_id=current_session.user_id,
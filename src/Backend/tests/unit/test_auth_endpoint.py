@@ -8,10 +8,10 @@ import hypothesis
 import pytest
 from api import typings
 from api.adapters.memory import external_auth, secret_manager, unit_of_work
+from api.helpers import key_material, passwords
 from api.routers.auth import endpoints as auth_endpoint
 from api.routers.auth import schemas
 from hypothesis import strategies as st
-from passlib import context
 
 
 @pytest.mark.asyncio
@@ -28,7 +28,7 @@ from passlib import context
 async def test_login_calls_properly(
     request: schemas.FirebaseLogin,
     response: schemas.Session,
-    hash_ctx: context.CryptContext,
+    hasher: passwords.PasswordHasher,
 ) -> None:
     """
     tests if auth endpoint calls correctly.
@@ -39,11 +39,11 @@ async def test_login_calls_properly(
     with unittest.mock.patch("api.routers.auth.crud.login", login_mock):
         response = await auth_endpoint.login(
             external_login=external_auth.ExternalAuth(),
-            secret_manager=secret_manager.SecretManager(),
+            keys=key_material.KeyMaterial(secret_manager.SecretManager()),
             settings=typings.Settings({}),
             uow_builder=uow_builder,
             body=request,
-            hash_ctx=hash_ctx,
+            hasher=hasher,
         )
     login_mock.assert_awaited_once()
     assert uow_builder.call_count == 1
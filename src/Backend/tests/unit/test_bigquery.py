@@ -0,0 +1,108 @@
+"""
+Module for tests for bigquery.
+"""
+
+import datetime
+import unittest.mock
+import uuid
+
+import pytest
+from api import models
+from api.adapters.google import BigQuery
+from api.helpers.schemas import AnalyticalResult
+
+
+def build_result() -> AnalyticalResult:
+    """
+    Build an analytical result with fake data.
+    """
+    now = datetime.datetime.now()
+    return AnalyticalResult(
+        school_uuid=uuid.uuid4(),
+        school_name="school",
+        school_city="city",
+        school_state="RJ",
+        school_region=None,
+        school_county="county",
+        class_uuid=uuid.uuid4(),
+        class_name="class",
+        class_grade="1",
+        student_uuid=uuid.uuid4(),
+        student_customer_id=None,
+        student_name="student",
+        exam_uuid=uuid.uuid4(),
+        exam_name="exam",
+        exam_grade="1",
+        exam_start_date=now,
+        exam_end_date=now,
+        question_uuid=uuid.uuid4(),
+        question_words=["casa"],
+        question_amount_words=1,
+        response_words=["casa"],
+        response_amount_hits=1,
+        response_timestamp=now,
+        user_rating=models.UserRating.NO_RATING,
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_insert_rows_in_batches(
+    bigquery: BigQuery, bigquery_client: unittest.mock.Mock
+) -> None:
+    """
+    tests it should insert the rows once the batch is full.
+    """
+    client = bigquery_client.return_value
+    bigquery.max_batch_size = 3
+    client.insert_rows_json.return_value = []
+    for _ in range(3):
+        await bigquery.save(build_result())
+    assert client.insert_rows_json.call_count == 1
+    assert len(client.insert_rows_json.call_args.args[1]) == 3
+    client.get_table.assert_not_called()
+    await bigquery.close()
+
+
+@pytest.mark.asyncio
+async def test_should_drop_invalid_rows_and_retry_the_others(
+    bigquery: BigQuery, bigquery_client: unittest.mock.Mock
+) -> None:
+    """
+    tests it should drop invalid rows and retry the stopped ones with their ids.
+    """
+    client = bigquery_client.return_value
+    client.insert_rows_json.side_effect = [
+        [
+            {"index": 0, "errors": [{"reason": "stopped"}]},
+            {"index": 1, "errors": [{"reason": "invalid"}]},
+        ],
+        [],
+    ]
+    await bigquery.save(build_result())
+    await bigquery.save(build_result())
+    await bigquery.flush()
+    await bigquery.flush()
+    first, second = client.insert_rows_json.call_args_list
+    assert second.args[1] == first.args[1][:1]
+    assert second.kwargs["row_ids"] == first.kwargs["row_ids"][:1]
+    await bigquery.close()
+
+
+@pytest.mark.asyncio
+async def test_should_keep_rows_on_failure(
+    bigquery: BigQuery, bigquery_client: unittest.mock.Mock
+) -> None:
+    """
+    tests it should keep the rows when the insert fails and drop them after
+    the retries.
+    """
+    client = bigquery_client.return_value
+    bigquery.max_retries = 1
+    client.insert_rows_json.side_effect = ConnectionError("unavailable")
+    await bigquery.save(build_result())
+    await bigquery.flush()
+    assert len(bigquery._buffer) == 1
+    await bigquery.flush()
+    assert not bigquery._buffer
+    assert client.insert_rows_json.call_count == 2
+    await bigquery.close()
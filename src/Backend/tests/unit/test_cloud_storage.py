@@ -2,6 +2,7 @@
 Module for tests for cloud storage.
 """
 
+import typing
 import unittest.mock
 
 import hypothesis
@@ -26,6 +27,20 @@ async def test_should_download(file_name: str, cloud_storage: CloudStorage) -> N
     assert f"{cloud_storage.audio_path}/{file_name}" == resp
 
 
+@pytest.mark.asyncio
+async def test_should_download_bytes(cloud_storage: CloudStorage) -> None:
+    """
+    tests it should download to memory.
+    """
+
+    def download(_: str, file: typing.BinaryIO) -> None:
+        file.write(b"audio")
+
+    cloud_storage.client.download_blob_to_file.side_effect = download
+    resp = await cloud_storage.download_bytes("gs://test/audio.wav")
+    assert resp == b"audio"
+
+
 @pytest.mark.asyncio
 async def test_should_upload_by_text(cloud_storage: CloudStorage) -> None:
     """
@@ -0,0 +1,102 @@
+"""
+Module for tests for the edit distance.
+"""
+
+import typing
+
+import hypothesis
+from api import models
+from api.domain.service import distance
+from api.helpers import util
+from api.routers.processor import endpoints
+from hypothesis import strategies as st
+
+
+def reference_distance(
+    first: typing.Sequence[typing.Hashable], second: typing.Sequence[typing.Hashable]
+) -> int:
+    """
+    Full table levenshtein distance, used as reference.
+    """
+    distances = [[0 for _ in range(len(second) + 1)] for _ in range(len(first) + 1)]
+    for i in range(len(first) + 1):
+        distances[i][0] = i
+    for j in range(len(second) + 1):
+        distances[0][j] = j
+    for i in range(1, len(first) + 1):
+        for j in range(1, len(second) + 1):
+            cost = 0 if first[i - 1] == second[j - 1] else 1
+            distances[i][j] = min(
+                distances[i - 1][j] + 1,
+                distances[i][j - 1] + 1,
+                distances[i - 1][j - 1] + cost,
+            )
+    return distances[-1][-1]
+
+
+def reference_pre_reader_rating(
+    sentence: list[str], expected: list[str]
+) -> models.UserRating:
+    """
+    Pre reader rating computed with the exact distance.
+    """
+    joined_sentence = "".join(sentence).lower()
+    joined_expected = "".join(expected).lower()
+    max_len = max(len(joined_sentence), len(joined_expected))
+    percentage = 100.0
+    if max_len != 0:
+        percentage = 1 - reference_distance(joined_sentence, joined_expected) / max_len
+    match util.check_spelling_or_syllables(sentence):
+        case 1 if percentage >= 0.1:
+            return models.UserRating.PRE_READER_THREE
+        case -1 if percentage >= 0.05:
+            return models.UserRating.PRE_READER_TWO
+    return models.UserRating.PRE_READER_ONE
+
+
+texts = st.text(alphabet="abcde", max_size=80)
+word_lists = st.lists(st.sampled_from(["casa", "bola", "gato", "pato"]), max_size=80)
+
+
+@hypothesis.given(first=texts, second=texts)
+def test_should_match_reference_for_strings(first: str, second: str) -> None:
+    """
+    tests it should compute the same distance as the full table.
+    """
+    assert distance.levenshtein(first, second) == reference_distance(first, second)
+
+
+@hypothesis.given(first=word_lists, second=word_lists)
+def test_should_match_reference_for_words(first: list[str], second: list[str]) -> None:
+    """
+    tests it should compute the distance between lists of words.
+    """
+    assert distance.levenshtein(first, second) == reference_distance(first, second)
+
+
+@hypothesis.given(first=texts, second=texts, max_distance=st.integers(0, 80))
+def test_should_stop_after_max_distance(
+    first: str, second: str, max_distance: int
+) -> None:
+    """
+    tests it should be exact up to max_distance and capped after it.
+    """
+    expected = reference_distance(first, second)
+    assert distance.levenshtein(first, second, max_distance) == min(
+        expected, max_distance + 1
+    )
+
+
+@hypothesis.given(
+    sentence=st.lists(st.text(alphabet="abcAB-", max_size=6), max_size=8),
+    expected=st.lists(st.text(alphabet="abc", max_size=6), max_size=8),
+)
+def test_should_keep_pre_reader_rating(
+    sentence: list[str], expected: list[str]
+) -> None:
+    """
+    tests the cutoff should not change the pre reader rating.
+    """
+    assert endpoints.calculate_pre_reader_rating(
+        sentence, expected
+    ) == reference_pre_reader_rating(sentence, expected)
@@ -69,7 +69,9 @@ async def test_get_exam(
     """
     get_exam = exam.GetExam([fake_exam])
     session_manager = unittest.mock.AsyncMock()
-    session_manager.get_current_session.return_value = fake_session
+    session_manager.get_principal.return_value = typings.Principal.from_session(
+        fake_session
+    )
 
     response = await exams_endpoint.get(
         get_exam=get_exam,
@@ -113,6 +115,7 @@ async def test_create_exam(
     speech.create_phrase_set.return_value = "id"
     uow_builder = unit_of_work.UnitOfWorkBuilder(exam_repository=exam_repo)
     settings = typing.cast(typings.Settings, {})
+    catalog = exam.ActiveExamCatalog()
     with unittest.mock.patch(
         "api.dependencies.get_speech_to_text", return_value=speech
     ):
@@ -121,6 +124,8 @@ async def test_create_exam(
             settings=settings,
             storage=cloud_storage,
             body=create_exam,
+            catalog=catalog,
         )
     assert uow_builder.call_count == 1
     assert await exam_repo.get(response.id)
+    assert catalog.invalidated == 1
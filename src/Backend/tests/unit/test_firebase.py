@@ -0,0 +1,37 @@
+"""
+Module for tests for the firebase auth adapter.
+"""
+
+import unittest.mock
+
+import pytest
+from api.adapters import google
+from firebase_admin import auth
+
+
+@pytest.mark.asyncio
+async def test_should_cache_the_revocation_checks(
+    firebase_auth_client: unittest.mock.Mock,
+) -> None:
+    """
+    tests it should fetch the user once per ttl and reject revoked tokens.
+    """
+    firebase = google.FirebaseAuth("proj", "", revocation_ttl=60)
+    claims = {"uid": "uid", "iat": 1000}
+    user = unittest.mock.Mock(disabled=False, tokens_valid_after_timestamp=500_000)
+    with (
+        unittest.mock.patch.object(auth, "verify_id_token", return_value=claims),
+        unittest.mock.patch.object(auth, "get_user", return_value=user) as get_user,
+    ):
+        assert await firebase.login_from_token("token") == claims
+        assert await firebase.login_from_token("token") == claims
+        get_user.assert_called_once_with("uid", app=firebase.client)
+
+        user.tokens_valid_after_timestamp = 2_000_000
+        firebase.revocation_ttl = 0
+        with pytest.raises(auth.RevokedIdTokenError):
+            await firebase.login_from_token("token")
+
+        user.disabled = True
+        with pytest.raises(auth.UserDisabledError):
+            await firebase.login_from_token("token")
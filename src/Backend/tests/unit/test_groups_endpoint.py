@@ -8,8 +8,8 @@ import uuid
 
 import hypothesis
 import pytest
-from api import errors, models
-from api.adapters.memory import group, unit_of_work, user
+from api import errors, models, typings
+from api.adapters.memory import exam, group, unit_of_work, user
 from api.helpers import schemas as util_schemas
 from api.routers.groups import endpoints as groups_endpoint
 from api.routers.groups import schemas
@@ -52,7 +52,7 @@ async def test_list_groups(
     list_groups = group.ListGroups(groups)
     session_mg = unittest.mock.AsyncMock()
     fake_session.user.role.scopes = ["admin"]
-    session_mg.get_current_session.return_value = fake_session
+    session_mg.get_principal.return_value = typings.Principal.from_session(fake_session)
     response = await groups_endpoint.list_resources(
         shift=shift,
         grade=grade,
@@ -168,8 +168,9 @@ async def test_patch_group(
     """
     group_repo = group.GroupRepository([fake_group])
     uow_builder = unit_of_work.UnitOfWorkBuilder(group_repository=group_repo)
+    catalog = exam.ActiveExamCatalog()
     response = await groups_endpoint.update(
-        uow_builder=uow_builder, group_id=fake_group.id, body=patch_org
+        uow_builder=uow_builder, group_id=fake_group.id, body=patch_org, catalog=catalog
     )
     expected = schemas.GroupGet.from_orm(fake_group)
     for key, value in patch_org.dict().items():
@@ -179,3 +180,4 @@ async def test_patch_group(
     assert uow_builder.call_count == 1
     assert response.id == fake_group.id
     assert expected == response
+    assert catalog.invalidated == 1
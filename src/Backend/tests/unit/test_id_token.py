@@ -0,0 +1,100 @@
+"""
+Module for tests for the Google ID token verifier.
+"""
+
+import contextlib
+import datetime
+import json
+import typing
+import unittest.mock
+
+import jwt
+import pytest
+from aiohttp import test_utils, web
+from api import errors
+from api.adapters import google
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _token(
+    subject: str = "scheduler",
+    audience: str = "proj",
+    issuer: str = "https://accounts.google.com",
+) -> str:
+    now = datetime.datetime.now(datetime.UTC)
+    return jwt.encode(
+        {
+            "sub": subject,
+            "aud": audience,
+            "iss": issuer,
+            "iat": now,
+            "exp": now + datetime.timedelta(minutes=5),
+        },
+        PRIVATE_KEY,
+        algorithm="RS256",
+        headers={"kid": "key-1"},
+    )
+
+
+@contextlib.asynccontextmanager
+async def fake_certs() -> typing.AsyncGenerator[tuple[str, list[int]], None]:
+    """
+    Run a local server answering the certs like Google, counting the requests.
+    """
+    requests: list[int] = []
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(PRIVATE_KEY.public_key()))
+
+    async def handle(_: web.Request) -> web.Response:
+        requests.append(1)
+        return web.json_response(
+            {"keys": [{**jwk, "kid": "key-1", "alg": "RS256", "use": "sig"}]},
+            headers={"Cache-Control": "public, max-age=120"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/certs", handle)
+    async with test_utils.TestServer(app) as server:
+        yield str(server.make_url("/certs")), requests
+
+
+@pytest.mark.asyncio
+async def test_should_cache_certs_and_verified_tokens() -> None:
+    """
+    tests it should fetch the certs once per max-age and memoize the tokens.
+    """
+    async with fake_certs() as (url, requests):
+        verifier = google.IdTokenVerifier(certs_url=url)
+        try:
+            with unittest.mock.patch("time.monotonic", return_value=100.0):
+                token = _token()
+                assert (await verifier.verify(token, "proj"))["aud"] == "proj"
+                assert (await verifier.verify(token, "proj"))["aud"] == "proj"
+                await verifier.verify(_token("other"), "proj")
+            assert len(requests) == 1
+            with unittest.mock.patch("time.monotonic", return_value=221.0):
+                await verifier.verify(_token("expired-certs"), "proj")
+            assert len(requests) == 2  # noqa: PLR2004
+        finally:
+            await verifier.close()
+
+
+@pytest.mark.asyncio
+async def test_should_reject_invalid_tokens() -> None:
+    """
+    tests it should reject tokens of another audience or issuer.
+    """
+    async with fake_certs() as (url, _):
+        verifier = google.IdTokenVerifier(certs_url=url)
+        try:
+            token = _token()
+            await verifier.verify(token, "proj")
+            with pytest.raises(errors.TokenExpired):
+                await verifier.verify(token, "other")
+            with pytest.raises(errors.TokenExpired):
+                await verifier.verify(_token(issuer="https://evil.com"), "proj")
+            with pytest.raises(errors.TokenExpired):
+                await verifier.verify("not-a-token", "proj")
+        finally:
+            await verifier.close()
@@ -0,0 +1,91 @@
+"""
+Module for tests for the parsed keys of the app tokens.
+"""
+
+import collections
+import datetime
+import unittest.mock
+
+import pytest
+from api import errors, ports
+from api.adapters import memory
+from api.helpers import auth, key_material, time_now
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+
+class CountingSecretManager(memory.SecretManager):
+    """
+    Memory secret manager that counts the reads and can rotate the keys.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads: collections.Counter[str] = collections.Counter()
+
+    async def read(self, secret_id: str) -> ports.Secrets | None:
+        self.reads[secret_id] += 1
+        return await super().read(secret_id)
+
+    def rotate(self) -> None:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._secret_data["private-key"] = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        self._secret_data["public-key"] = (
+            private_key.public_key()
+            .public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            .decode()
+        )
+
+
+async def _token(keys: key_material.KeyMaterial, with_kid: bool = True) -> str:
+    kid, certificate = await keys.signing_key()
+    return auth.create_token(
+        issued_at=time_now(),
+        certificate=certificate,
+        subject="session",
+        audience="proj",
+        scopes={"user"},
+        duration=datetime.timedelta(minutes=5),
+        key_id=kid if with_kid else None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_parse_the_keys_once() -> None:
+    """
+    tests it should read and parse the keys once for many tokens.
+    """
+    secrets = CountingSecretManager()
+    keys = key_material.KeyMaterial(secrets)
+    tokens = [await _token(keys), await _token(keys, with_kid=False)]
+    for token in tokens * 3:
+        claims = await keys.verify(token, "proj")
+        assert claims["sub"] == "session:0"
+    assert secrets.reads == {"public-key": 1, "private-key": 1}
+    with pytest.raises(errors.TokenExpired):
+        await keys.verify(tokens[0], "other")
+
+
+@pytest.mark.asyncio
+async def test_should_keep_verifying_after_rotation() -> None:
+    """
+    tests it should refresh the keys and keep the replaced ones to verify.
+    """
+    secrets = CountingSecretManager()
+    keys = key_material.KeyMaterial(secrets, refresh_interval=3600)
+    other = key_material.KeyMaterial(secrets)
+    with unittest.mock.patch("time.monotonic", return_value=100.0):
+        old_token = await _token(keys)
+    secrets.rotate()
+    with unittest.mock.patch("time.monotonic", return_value=200.0):
+        new_token = await _token(other)
+        assert (await keys.verify(new_token, "proj"))["sub"] == "session:0"
+        assert (await keys.verify(old_token, "proj"))["sub"] == "session:0"
+    assert secrets.reads["public-key"] == 3  # noqa: PLR2004
@@ -0,0 +1,53 @@
+"""
+Module for tests for the password hashing executors.
+"""
+
+import threading
+
+import pytest
+from api import models
+from api.helpers import passwords
+from passlib import context
+
+
+@pytest.mark.asyncio
+async def test_should_hash_and_check_off_the_loop(
+    fake_user: models.User, hasher: passwords.PasswordHasher
+) -> None:
+    """
+    tests it should hash and check the passwords in the pool threads.
+    """
+    fake_user.set_password_hash(await hasher.hash("secret"))
+    assert await hasher.check(fake_user, "secret")
+    assert not await hasher.check(fake_user, "wrong")
+    threads = {thread.name for thread in threading.enumerate() if thread.is_alive()}
+    assert any(name.startswith("password") for name in threads)
+
+
+@pytest.mark.asyncio
+async def test_should_upgrade_deprecated_hashes(fake_user: models.User) -> None:
+    """
+    tests it should replace a deprecated hash after a valid check.
+    """
+    hash_ctx = context.CryptContext(
+        schemes=["bcrypt", "md5_crypt"], deprecated=["md5_crypt"]
+    )
+    hasher = passwords.PasswordHasher(hash_ctx, max_workers=1)
+    fake_user.set_password_hash(context.CryptContext(["md5_crypt"]).hash("secret"))
+    assert await hasher.check(fake_user, "secret")
+    assert fake_user.password
+    assert fake_user.password.startswith("$2b$")
+
+
+@pytest.mark.asyncio
+async def test_should_hash_many_in_order() -> None:
+    """
+    tests it should hash the bulk passwords in processes, keeping the order.
+    """
+    hash_ctx = context.CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    hasher = passwords.PasswordHasher(hash_ctx, max_workers=1, bulk_workers=2)
+    plain = [f"password-{i}" for i in range(passwords.BULK_CHUNK_SIZE + 3)]
+    hashes = await hasher.hash_many(plain)
+    hasher.shutdown()
+    assert len(hashes) == len(plain)
+    assert all(map(hash_ctx.verify, plain, hashes))
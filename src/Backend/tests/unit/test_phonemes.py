@@ -0,0 +1,49 @@
+"""
+Module for tests for the phonemes cache.
+"""
+
+import typing
+import unittest.mock
+
+import pytest
+from api.domain.service import phonemes
+
+
+@pytest.fixture(name="backend")
+def fixture_backend() -> typing.Iterator[unittest.mock.Mock]:
+    """
+    Patching the espeak backend with an empty cache.
+    """
+    backend = unittest.mock.Mock()
+    backend.phonemize.side_effect = lambda words, **_: [f"/{w}/" for w in words]
+    phonemes.clear_cache()
+    with unittest.mock.patch.dict(phonemes._backends, {"pt-br": backend}):
+        yield backend
+    phonemes.clear_cache()
+
+
+def test_should_phonemize_only_missing_words(backend: unittest.mock.Mock) -> None:
+    """
+    tests it should send each word to espeak only once.
+    """
+    assert phonemes.phonemize_data_list(["casa", "bola", "casa"]) == [
+        "/casa/",
+        "/bola/",
+        "/casa/",
+    ]
+    assert phonemes.phonemize_data_list(["bola", "gato"]) == ["/bola/", "/gato/"]
+    assert [c.args[0] for c in backend.phonemize.call_args_list] == [
+        ["casa", "bola"],
+        ["gato"],
+    ]
+
+
+def test_should_evict_least_recently_used(backend: unittest.mock.Mock) -> None:
+    """
+    tests it should keep at most CACHE_SIZE words.
+    """
+    with unittest.mock.patch.object(phonemes, "CACHE_SIZE", 2):
+        phonemes.phonemize_data_list(["casa", "bola"])
+        phonemes.phonemize_data_list(["casa", "gato"])
+        phonemes.phonemize_data_list(["casa", "bola"])
+    assert backend.phonemize.call_args_list[-1].args[0] == ["bola"]
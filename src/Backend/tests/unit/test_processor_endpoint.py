@@ -14,7 +14,7 @@ import pytest
 import starlette
 from api import models, typings
 from api.adapters import google
-from api.adapters.memory import exam, result, unit_of_work
+from api.adapters.memory import result, unit_of_work
 from api.domain.service import process_result
 from api.helpers import UUIDEncoder
 from api.routers import processor
@@ -62,7 +62,6 @@ async def test_processor_process_succesfully(
     """
     speech = unittest.mock.AsyncMock()
     analytical = unittest.mock.AsyncMock()
-    analytical.save.return_value = True
     speech.process.return_value = ""
     data = schemas.PubsubDataReprocessed.parse_raw(
         base64.b64decode(request.message.data).decode("utf-8")
@@ -84,22 +83,19 @@ async def test_processor_process_succesfully(
     exam_user_question.organization = fake_group.organization
     exam_user_question.exam = fake_exam
     exam_user_question.id = data.result_id
-    result_repository = result.ResultRepository([exam_user_question])
-    question_repository = exam.QuestionRepository([fake_question])
-    get_exam_user = exam.GetExamUserStatus(
-        [
+    result_repository = result.ResultRepository(
+        [exam_user_question],
+        questions=[fake_question],
+        exam_users=[
             models.ExamUser(
                 exam_id=exam_user_question.exam_id,
                 user_id=exam_user_question.user_id,
                 status=models.ExamStatus.IN_PROGRESS,
             )
-        ]
+        ],
     )
     settings = typing.cast(typings.Settings, {})
-    uow_builder = unit_of_work.UnitOfWorkBuilder(
-        result_repository=result_repository,
-        question_repository=question_repository,
-    )
+    uow_builder = unit_of_work.UnitOfWorkBuilder(result_repository=result_repository)
     with unittest.mock.patch(
         "api.dependencies.get_speech_to_text", return_value=speech
     ):
@@ -120,9 +116,8 @@ async def test_processor_process_succesfully(
             uow_builder=uow_builder,
             settings=settings,
             storage=cloud_storage,
-            list_pending=exam.ListPendingQuestions(),
-            get_exam_user=get_exam_user,
             analytical=analytical,
+            match_mode=process_result.MatchMode.GREEDY,
         )
     speech.process.assert_called_with(
         phrases_id=data.phrase_set_id,
@@ -135,6 +130,7 @@ async def test_processor_process_succesfully(
         model_type="latest_long",
     )
     assert response.status_code == 200
+    analytical.save.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -156,7 +152,9 @@ async def test_successful_signed_url_user(
     tests if signed url is created successfully.
     """
     sess_manager = unittest.mock.AsyncMock()
-    sess_manager.get_current_session.return_value = fake_user_session
+    sess_manager.get_principal.return_value = typings.Principal.from_session(
+        fake_user_session
+    )
     cloud_storage = unittest.mock.AsyncMock()
     group = fake_user_session.user.groups[0]
     group_id = group.id
@@ -190,3 +188,57 @@ def test_get_right_count_homophones(
         )
     assert right_count == amount
     assert " ".join(actual_words) != tts_words
+
+
+def greedy_reference(
+    data_words: list[str],
+    data_transcripts: list[str],
+    words: list[str],
+    transcripts: list[str],
+) -> tuple[list[str], list[str]]:
+    """
+    Greedy matching as it was before the index, used as reference.
+    """
+    right_words = []
+    for i, data_word in enumerate(data_words):
+        for k, data_transcript in enumerate(data_transcripts):
+            if data_transcript.lower() == data_word.lower():
+                right_words.append(words[i])
+                transcripts[k] = words[i]
+                data_transcripts[k] = ""
+                break
+    return right_words, transcripts
+
+
+@hypothesis.given(
+    words=st.lists(st.sampled_from(["", "a", "A", "b", "c", "dd"]), max_size=20),
+    transcripts=st.lists(st.sampled_from(["", "a", "B", "c", "e"]), max_size=20),
+)
+def test_greedy_match_should_keep_results(
+    words: list[str], transcripts: list[str]
+) -> None:
+    """
+    tests it should match the same words as the reference.
+    """
+    expected = greedy_reference(words, transcripts.copy(), words, transcripts.copy())
+    response = process_result._compare_list_string(
+        words, transcripts.copy(), words, transcripts.copy()
+    )
+    assert response == expected
+
+
+def test_aligned_match_should_keep_order() -> None:
+    """
+    tests it should only match words in the same order.
+    """
+    words = ["o", "gato", "comeu", "o", "rato"]
+    transcripts = ["rato", "o", "gato", "o", "rato"]
+    right_words, clean_transcripts = process_result._compare_list_string(
+        words,
+        transcripts.copy(),
+        words,
+        transcripts,
+        process_result.MatchMode.ALIGNED,
+    )
+    assert right_words == ["o", "gato", "o", "rato"]
+    assert clean_transcripts == ["rato", "o", "gato", "o", "rato"]
@@ -0,0 +1,57 @@
+"""
+Module for tests for the SERE api client.
+"""
+
+import aiohttp
+import pytest
+from api.adapters import sere
+
+from tests.helpers import sere as fake
+
+
+@pytest.mark.asyncio
+async def test_should_list_every_nre_in_order() -> None:
+    """
+    tests it should fetch every NRE concurrently and keep the NRE order.
+    """
+    records = {"escola": {nre: [{"codMec": nre}] for nre in range(1, 33)}}
+    async with fake.fake_sere(records) as server:
+        api = sere.SereApi("key", base_url=server.base_url, concurrency=8)
+        try:
+            organizations = await api.list_organization()
+        finally:
+            await api.close()
+    assert [org["codMec"] for org in organizations] == list(range(1, 33))
+    assert set(server.requests.values()) == {1}
+
+
+@pytest.mark.asyncio
+async def test_should_retry_transient_errors() -> None:
+    """
+    tests it should retry a NRE answering a transient error.
+    """
+    records = {"matricula": {3: [{"cgm": "1"}]}}
+    async with fake.fake_sere(records, {("matricula", 3): [503, 429]}) as server:
+        api = sere.SereApi("key", base_url=server.base_url, backoff=0)
+        try:
+            pages = [page async for page in api.iter_student_pages()]
+        finally:
+            await api.close()
+    assert pages[2] == (3, [{"cgm": "1"}])
+    assert [nre for nre, _ in pages] == list(range(1, 33))
+    assert server.requests[("matricula", 3)] == 3
+
+
+@pytest.mark.asyncio
+async def test_should_not_retry_client_errors() -> None:
+    """
+    tests it should raise without retrying when the request is refused.
+    """
+    async with fake.fake_sere({}, {("turma", 1): [403]}) as server:
+        api = sere.SereApi("key", base_url=server.base_url, backoff=0)
+        try:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await api.list_group()
+        finally:
+            await api.close()
+    assert server.requests[("turma", 1)] == 1
@@ -0,0 +1,57 @@
+"""
+Module for tests for the incremental JSON parsing of the SERE api.
+"""
+
+import json
+import typing
+
+import hypothesis
+import pytest
+from api.adapters.sere import stream
+from hypothesis import strategies as st
+
+json_values = st.recursive(
+    st.none()
+    | st.booleans()
+    | st.integers()
+    | st.floats(allow_nan=False, allow_infinity=False)
+    | st.text(),
+    lambda children: st.lists(children, max_size=3)
+    | st.dictionaries(st.text(), children, max_size=3),
+    max_leaves=10,
+)
+
+
+async def _chunks(data: bytes, sizes: list[int]) -> typing.AsyncIterator[bytes]:
+    position = 0
+    for size in sizes:
+        yield data[position : position + size]
+        position += size
+    yield data[position:]
+
+
+@pytest.mark.asyncio
+@hypothesis.given(
+    items=st.lists(json_values, max_size=10),
+    sizes=st.lists(st.integers(min_value=1, max_value=7), max_size=50),
+    indent=st.sampled_from([None, 2]),
+)
+async def test_should_parse_array_split_anywhere(
+    items: list[typing.Any], sizes: list[int], indent: int | None
+) -> None:
+    """
+    tests it should yield the same items wherever the chunks are split.
+    """
+    data = json.dumps(items, ensure_ascii=False, indent=indent).encode()
+    parsed = [item async for item in stream.iter_array(_chunks(data, sizes))]
+    assert parsed == items
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", [b'[{"a": 1}', b'{"a": 1}', b"[1,]", b"[1] 2"])
+async def test_should_reject_invalid_array(data: bytes) -> None:
+    """
+    tests it should fail on truncated or invalid arrays.
+    """
+    with pytest.raises(ValueError):
+        [item async for item in stream.iter_array(_chunks(data, [1, 2]))]
@@ -0,0 +1,88 @@
+"""
+Module for tests for the session cache.
+"""
+
+import datetime
+import unittest.mock
+
+import fastapi
+import pytest
+from api import models, typings
+from api.adapters import memory
+from api.helpers import auth, key_material, session_cache, time_now
+from fastapi.security import http as http_sec
+
+
+def test_should_keep_session_until_ttl(fake_session: models.Session) -> None:
+    """
+    tests it should return the cached session until the ttl passes.
+    """
+    cache = session_cache.SessionCache(ttl=60)
+    with unittest.mock.patch("time.monotonic", return_value=100.0):
+        cache.set(typings.Principal.from_session(fake_session))
+    with unittest.mock.patch("time.monotonic", return_value=150.0):
+        cached = cache.get(fake_session.id, fake_session.generation)
+    assert cached is not None
+    assert cached.user_id == fake_session.user_id
+    assert cached.scopes == ("fake-role",)
+    with unittest.mock.patch("time.monotonic", return_value=161.0):
+        assert cache.get(fake_session.id, fake_session.generation) is None
+
+
+def test_should_drop_stale_sessions(fake_session: models.Session) -> None:
+    """
+    tests it should drop sessions of a newer generation, invalidated or expired.
+    """
+    cache = session_cache.SessionCache()
+    principal = typings.Principal.from_session(fake_session)
+    cache.set(principal)
+    assert cache.get(fake_session.id, fake_session.generation + 1) is None
+
+    cache.set(principal)
+    cache.invalidate(fake_session.id)
+    assert cache.get(fake_session.id) is None
+
+    cache.set(principal)
+    cache.invalidate_user(fake_session.user_id)
+    assert cache.get(fake_session.id) is None
+
+    fake_session.expires_at = time_now() - datetime.timedelta(seconds=1)
+    cache.set(typings.Principal.from_session(fake_session))
+    assert cache.get(fake_session.id) is None
+
+
+@pytest.mark.asyncio
+async def test_should_query_the_session_once(fake_session: models.Session) -> None:
+    """
+    tests get_token should load the principal once and keep it for the request.
+    """
+    keys = key_material.KeyMaterial(memory.SecretManager())
+    kid, certificate = await keys.signing_key()
+    token = auth.create_token(
+        issued_at=time_now(),
+        certificate=certificate,
+        key_id=kid,
+        subject=str(fake_session.id),
+        audience="proj",
+        scopes={"user"},
+        duration=datetime.timedelta(minutes=5),
+        generation=fake_session.generation,
+    )
+    principal = typings.Principal.from_session(fake_session)
+    get_principal = unittest.mock.AsyncMock(return_value=principal)
+    cache = session_cache.SessionCache()
+    requests = [fastapi.Request({"type": "http"}) for _ in range(2)]
+    for request in requests:
+        await auth.get_token(
+            request=request,
+            scopes=fastapi.security.SecurityScopes(["user"]),
+            token=http_sec.HTTPAuthorizationCredentials(
+                scheme="Bearer", credentials=token
+            ),
+            get_principal=get_principal,
+            session_cache=cache,
+            settings=typings.Settings({"project_id": "proj"}),
+            keys=keys,
+        )
+    get_principal.assert_awaited_once_with(fake_session.id)
+    assert all(request.state.principal == principal for request in requests)
@@ -2,12 +2,20 @@
 Module for tests for cloud storage.
 """
 
+import datetime
+import typing
 import unittest.mock
 import uuid
 
 import hypothesis
 import pytest
-from api.adapters.google import CloudStorage, SpeechToText
+from api.adapters.google import (
+    CloudStorage,
+    SpeechRegistry,
+    SpeechToText,
+    SpeechToTextV2,
+)
+from google.cloud import speech_v2
 from hypothesis import strategies as st
 
 
@@ -33,14 +41,9 @@ async def test_should_process(
     """
     tests it should download.
     """
-    cloud_stt = SpeechToText("", "..", cloud_storage)
+    cloud_stt = SpeechToText("", "..", cloud_storage, unittest.mock.AsyncMock())
     cloud_stt.client = stt_client
-    with (
-        unittest.mock.patch("builtins.open", unittest.mock.mock_open()),
-        unittest.mock.patch("os.remove", unittest.mock.Mock()),
-        unittest.mock.patch("ffmpeg.input", unittest.mock.Mock()),
-    ):
-        await cloud_stt.process(phrases_id, path, desired, words, 61)
+    await cloud_stt.process(phrases_id, path, desired, words, 61)
     assert stt_client.long_running_recognize.call_count >= 1
 
 
@@ -62,7 +65,7 @@ async def test_should_create_phrase_set(
     """
     tests it should create phrase_set.
     """
-    cloud_stt = SpeechToText("", "..", cloud_storage)
+    cloud_stt = SpeechToText("", "..", cloud_storage, unittest.mock.AsyncMock())
     cloud_stt.client = stt_client
     adaptation_client = unittest.mock.Mock()
     adaptation_client.return_value = unittest.mock.AsyncMock()
@@ -87,3 +90,84 @@ async def test_should_create_phrase_set(
             },
         }
     )
+
+
+@pytest.mark.asyncio
+async def test_registry_should_resolve_recognizer_once() -> None:
+    """
+    tests it should list recognizers only once per model, region and language.
+    """
+
+    async def recognizers() -> typing.AsyncGenerator[speech_v2.Recognizer, None]:
+        yield speech_v2.Recognizer(name="other", model="latest_short")
+        yield speech_v2.Recognizer(name="recognizer", model="latest_long")
+
+    client = unittest.mock.Mock()
+    client.return_value = unittest.mock.AsyncMock()
+    client.return_value.list_recognizers.side_effect = lambda **_: recognizers()
+    features = speech_v2.RecognitionFeatures()
+    with unittest.mock.patch("google.cloud.speech_v2.SpeechAsyncClient", client):
+        registry = SpeechRegistry("", "")
+        first = await registry.get_recognizer(
+            "latest_long", "global", "pt-BR", features
+        )
+        second = await registry.get_recognizer(
+            "latest_long", "global", "pt-BR", features
+        )
+    assert first == second == "recognizer"
+    assert client.call_count == 1
+    assert client.return_value.list_recognizers.call_count == 1
+    client.return_value.create_recognizer.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_v2_should_rerun_all_windows_from_one_download() -> None:
+    """
+    tests it should cut every window from a single download and keep the order.
+    """
+
+    def response(
+        uri: str, words: list[tuple[str, int, int]]
+    ) -> speech_v2.BatchRecognizeResponse:
+        word_infos = [
+            speech_v2.WordInfo(
+                word=word,
+                start_offset=datetime.timedelta(seconds=start),
+                end_offset=datetime.timedelta(seconds=end),
+            )
+            for word, start, end in words
+        ]
+        alternative = speech_v2.SpeechRecognitionAlternative(words=word_infos)
+        results = speech_v2.BatchRecognizeResults(
+            results=[speech_v2.SpeechRecognitionResult(alternatives=[alternative])]
+        )
+        return speech_v2.BatchRecognizeResponse(
+            results={uri: speech_v2.BatchRecognizeFileResult(transcript=results)}
+        )
+
+    responses = {
+        "gs://bucket/audio.wav": [("a", 0, 1), ("long", 1, 7), ("b", 7, 8)],
+        "gs://bucket/cutted/audio-1.wav": [("c", 15, 16)],
+        "gs://bucket/cutted/audio-2.wav": [("d", 15, 16)],
+    }
+
+    async def batch_recognize(
+        request: speech_v2.BatchRecognizeRequest,
+    ) -> unittest.mock.AsyncMock:
+        uri = request.files[0].uri
+        operation = unittest.mock.AsyncMock()
+        operation.result.return_value = response(uri, responses[uri])
+        return operation
+
+    registry = unittest.mock.Mock()
+    registry.get_recognizer = unittest.mock.AsyncMock(return_value="recognizer")
+    registry.get_client.return_value.batch_recognize.side_effect = batch_recognize
+    storage = unittest.mock.AsyncMock()
+    storage.download_bytes.return_value = b"audio"
+    storage.upload_by_text.side_effect = lambda path, *_, **__: f"bucket/{path}"
+    audio_processor = unittest.mock.AsyncMock()
+    stt = SpeechToTextV2(registry, storage, audio_processor)
+    transcript = await stt.process("", "gs://bucket/audio.wav", "audio.wav", [], 20)
+    assert transcript == "a c b d"
+    storage.download_bytes.assert_called_once_with("gs://bucket/audio.wav")
+    assert audio_processor.cut.call_count == storage.upload_by_text.call_count == 2
@@ -0,0 +1,77 @@
+"""
+Module for tests for util functions.
+"""
+
+import io
+import struct
+import unittest.mock
+import wave
+
+import pytest
+from api import errors
+from api.helpers import util
+
+
+def build_wav(seconds: float, sample_rate: int = 16000, channels: int = 1) -> bytes:
+    """
+    Build a silent wav with the given duration.
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"\x00\x00" * channels * int(sample_rate * seconds))
+    return buffer.getvalue()
+
+
+def test_should_get_wav_metadata() -> None:
+    """
+    tests it should read the metadata from the wav header.
+    """
+    metadata = util.get_file_metadata(build_wav(2.5, sample_rate=48000, channels=2))
+    assert metadata == {"channels": 2, "sample_rate": "48000", "duration": 3}
+
+
+def test_should_fix_piped_wav_header() -> None:
+    """
+    tests it should fill in the sizes of a wav written to a pipe.
+    """
+    audio = build_wav(1.0)
+    piped = bytearray(audio)
+    struct.pack_into("<I", piped, 4, 0xFFFFFFFF)
+    struct.pack_into("<I", piped, 40, 0xFFFFFFFF)
+    assert util.get_file_metadata(bytes(piped))["duration"] == 1
+    assert util.fix_wav_header(piped) == audio
+
+
+def test_should_ignore_non_wav() -> None:
+    """
+    tests it should not touch data that isn't a wav.
+    """
+    assert util.fix_wav_header(bytearray(b"not a wav")) == b"not a wav"
+    assert util.get_file_metadata(b"not a wav") == {}
+
+
+def test_should_estimate_duration_without_data_size() -> None:
+    """
+    tests it should use the file size when the header has no data size.
+    """
+    audio = bytearray(build_wav(2.0))
+    struct.pack_into("<I", audio, 40, 0)
+    assert util.get_file_metadata(bytes(audio))["duration"] == 2
+
+
+def test_should_raise_on_empty_conversion() -> None:
+    """
+    tests it should fail when ffmpeg outputs no audio.
+    """
+    with unittest.mock.patch("ffmpeg.input") as ffmpeg_input:
+        ffmpeg_input.return_value.output.return_value.run.return_value = (
+            build_wav(0.0),
+            b"",
+        )
+        with pytest.raises(errors.EmptyAudio):
+            util.convert_audio(b"\x00\x00\x00\x20ftypM4A ", is_prod=True)
+    ffmpeg_input.assert_called_once()
+    assert ffmpeg_input.call_args.args[0] != "pipe:"